@@ -1,9 +1,20 @@
+from stablex.ids import model_scope
 from stablex.node import Node
 from stablex.elements.unidimensional_elements.frame_element import FrameElement
 from stablex.elements.unidimensional_elements.truss_element import TrussElement
 from stablex.elements.spring_elements.rotational_spring_element import LinearRotationalSpringElement
 from stablex.section import Rectangle, UserDefinedSection
 from stablex.structure import Structure
-from stablex.visualization.visualizer import plot_structure, plot
+from stablex.loads.nodal_load import NodalLoad
+from stablex.loads.load_case import LoadCase
 from stablex.solver.first_order_solver import Solver
 from stablex.solver.eigen_solver import EigenSolver
+from stablex.solver.exact_buckling_solver import ExactBucklingSolver
+
+
+def __getattr__(name):
+    # Plotting pulls in matplotlib, so it is only imported on first use.
+    if name in ("plot_structure", "plot"):
+        from stablex.visualization import visualizer
+        return getattr(visualizer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,401 @@
+import numpy as np
+
+from stablex.solver.assembly import ScatterPlan
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Returns a contiguous copy of the array that cannot be written to."""
+    array = np.ascontiguousarray(array).copy()
+    array.flags.writeable = False
+    return array
+
+
+def _shallow_copy(instance):
+    """Copies an instance without calling its constructor or `__getstate__`, sharing its attribute values."""
+    copy = object.__new__(type(instance))
+    copy.__dict__.update(instance.__dict__)
+    return copy
+
+
+class CompiledElementGroup:
+    """
+    Array representation of the elements of a structure that share the same type.
+
+    Parameters
+    ----------
+    element_type : type
+        The element class, whose batch kernels evaluate the group. `Element` for elements evaluated
+        from their own matrices, see `Element.uses_element_matrices`.
+    positions : np.ndarray
+        Positions of the elements in the element list of the structure.
+    connectivity : np.ndarray
+        Start and end node indices of each element, of shape (n_elements, 2).
+    dof_indices : np.ndarray
+        Equation numbers of the elements' degrees of freedom, of shape (n_elements, n_dofs).
+    properties : dict of str to np.ndarray
+        Section and material properties of the elements, as returned by `batch_properties`.
+    geometric_nonlinearity : np.ndarray
+        Whether each element includes geometric nonlinearity.
+    """
+    def __init__(self, element_type: type, positions: np.ndarray, connectivity: np.ndarray, dof_indices: np.ndarray,
+                 properties: dict, geometric_nonlinearity: np.ndarray):
+        self.element_type = element_type
+        self.positions = _read_only(positions)
+        self.connectivity = _read_only(connectivity)
+        self.dof_indices = _read_only(dof_indices)
+        self.properties = {name: _read_only(values) for name, values in properties.items()}
+        self.geometric_nonlinearity = _read_only(geometric_nonlinearity)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def arrays(self, coordinates: np.ndarray) -> dict:
+        """
+        Gathers the keyword arguments of the batch kernels for the given nodal coordinates.
+
+        Parameters
+        ----------
+        coordinates : np.ndarray
+            Nodal coordinates of shape (n_nodes, 2).
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            Geometry and properties of the elements.
+        """
+        return {**self.element_type.batch_geometry(coordinates[self.connectivity[:, 0]],
+                                                   coordinates[self.connectivity[:, 1]]),
+                **self.properties}
+
+    def axial_forces(self, end_forces: np.ndarray) -> np.ndarray:
+        """
+        Extracts the axial forces that contribute to the geometric stiffness from local end forces.
+
+        Elements without geometric nonlinearity get a zero axial force.
+
+        Parameters
+        ----------
+        end_forces : np.ndarray
+            Local end forces of shape (n_elements, n_dofs).
+
+        Returns
+        -------
+        np.ndarray
+            Axial force of each element, tension positive.
+        """
+        return self.element_type.batch_axial_forces(end_forces) * self.geometric_nonlinearity
+
+
+class CompiledModel:
+    """
+    Compact, immutable array representation of a structure.
+
+    A compiled model holds everything an analysis needs in contiguous NumPy arrays, so solvers can
+    run on it without walking the node, degree of freedom and element objects. It holds no
+    references to those objects and is cheap to pickle to worker processes.
+
+    Compiled models are created with `Structure.compile`.
+
+    Parameters
+    ----------
+    coordinates : np.ndarray
+        Nodal coordinates of shape (n_nodes, 2).
+    node_dofs : np.ndarray
+        Equation numbers of the x, y and rz degrees of freedom of each node, of shape (n_nodes, 3).
+        Coupled degrees of freedom share an equation number; -1 marks a degree of freedom that no
+        element uses.
+    free_count : int
+        Number of unrestrained degrees of freedom. Free degrees of freedom are numbered first.
+    forces : np.ndarray
+        Nodal forces applied in the direction of each degree of freedom.
+    prescribed_displacements : np.ndarray
+        Displacements of the restrained degrees of freedom.
+    element_groups : list of CompiledElementGroup
+        Elements grouped by type.
+    node_ids : np.ndarray, optional
+        IDs of the nodes, for reference.
+    dof_ids : np.ndarray, optional
+        IDs of the degrees of freedom in equation order, for reference.
+    scatter_plan : ScatterPlan, optional
+        Plan to scatter the stacked element matrices. Built on first use if not given.
+
+    Attributes
+    ----------
+    coordinates : np.ndarray
+        Nodal coordinates of shape (n_nodes, 2).
+    node_dofs : np.ndarray
+        Equation numbers of the degrees of freedom of each node.
+    restrained : np.ndarray
+        Restraint mask in equation order.
+    forces : np.ndarray
+        Nodal forces in equation order.
+    prescribed_displacements : np.ndarray
+        Displacements of the restrained degrees of freedom.
+    element_groups : list of CompiledElementGroup
+        Elements grouped by type.
+    """
+    def __init__(self, coordinates: np.ndarray, node_dofs: np.ndarray, free_count: int, forces: np.ndarray,
+                 prescribed_displacements: np.ndarray, element_groups: list, node_ids: np.ndarray = None,
+                 dof_ids: np.ndarray = None, scatter_plan: ScatterPlan = None):
+        self.coordinates = _read_only(np.asarray(coordinates, dtype=float).reshape(-1, 2))
+        self.node_dofs = _read_only(np.asarray(node_dofs, dtype=np.intp).reshape(-1, 3))
+        self.free_count = int(free_count)
+        self.forces = _read_only(np.asarray(forces, dtype=float))
+        self.prescribed_displacements = _read_only(np.asarray(prescribed_displacements, dtype=float))
+        self.restrained = _read_only(np.arange(len(self.forces)) >= self.free_count)
+        self.element_groups = list(element_groups)
+        self.node_ids = None if node_ids is None else _read_only(node_ids)
+        self.dof_ids = None if dof_ids is None else _read_only(dof_ids)
+        self._scatter_plan = scatter_plan
+
+    @property
+    def dof_count(self) -> int:
+        """Total number of degrees of freedom."""
+        return len(self.forces)
+
+    @property
+    def node_count(self) -> int:
+        """Number of nodes."""
+        return len(self.coordinates)
+
+    @property
+    def element_count(self) -> int:
+        """Number of elements."""
+        return sum(len(group) for group in self.element_groups)
+
+    @property
+    def free_forces(self) -> np.ndarray:
+        """Nodal forces applied in the direction of the free degrees of freedom."""
+        return self.forces[:self.free_count]
+
+    @property
+    def scatter_plan(self) -> ScatterPlan:
+        """Plan to scatter the element matrices, stacked group by group, into the global matrix."""
+        if self._scatter_plan is None:
+            self._scatter_plan = ScatterPlan([indices for group in self.element_groups for indices in group.dof_indices],
+                                             self.dof_count)
+        return self._scatter_plan
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_scatter_plan"] = None
+        return state
+
+    def dof_index(self, dof) -> int:
+        """
+        Returns the equation number of a degree of freedom, found by its id in `dof_ids`.
+
+        Parameters
+        ----------
+        dof : DegreeOfFreedom or int
+            A degree of freedom of the compiled structure, or its equation number.
+
+        Returns
+        -------
+        int
+            The equation number.
+
+        Raises
+        ------
+        TypeError
+            If the model was compiled without degree of freedom ids.
+        IndexError
+            If the degree of freedom is not part of the model.
+        """
+        if isinstance(dof, (int, np.integer)):
+            return int(dof)
+        if self.dof_ids is None:
+            raise TypeError("The model has no degree of freedom ids; pass equation numbers instead.")
+        matches = np.flatnonzero(self.dof_ids == dof.id)
+        if not len(matches):
+            raise IndexError(f"Degree of freedom {dof.id} is not part of the model.")
+        return int(matches[0])
+
+    def element_locations(self, positions) -> tuple:
+        """
+        Finds the element group of elements and their rows within it.
+
+        Parameters
+        ----------
+        positions : array_like of int
+            Positions of the elements in the element list of the structure.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            The index of the group in `element_groups` and the row within the group of each element.
+        """
+        group_indices = np.empty(self.element_count, dtype=np.intp)
+        rows = np.empty(self.element_count, dtype=np.intp)
+        for index, group in enumerate(self.element_groups):
+            group_indices[group.positions] = index
+            rows[group.positions] = np.arange(len(group))
+        positions = np.asarray(positions, dtype=np.intp)
+        return group_indices[positions], rows[positions]
+
+    def variant(self, forces: np.ndarray = None, properties: dict = None) -> "CompiledModel":
+        """
+        Creates a model of the same topology with other nodal forces or element properties.
+
+        The arrays that do not change and the scatter plan are shared with this model, so a
+        variant costs little more than its changed arrays.
+
+        Parameters
+        ----------
+        forces : np.ndarray, optional
+            Nodal forces in equation order. Defaults to the forces of this model.
+        properties : dict of str to tuple, optional
+            Maps the name of a property of `batch_properties`, such as 'inertias' or
+            'rotational_stiffnesses', to the positions of the elements to change and their new
+            values (one per element, or one for all).
+
+        Returns
+        -------
+        CompiledModel
+            The model variant.
+
+        Raises
+        ------
+        ValueError
+            If the forces do not match the degrees of freedom or an element has no such property.
+        """
+        variant = _shallow_copy(self)
+        if forces is not None:
+            if np.shape(forces) != self.forces.shape:
+                raise ValueError(f"Expected {self.dof_count} nodal forces, got {np.shape(forces)}.")
+            variant.forces = _read_only(np.asarray(forces, dtype=float))
+        if properties:
+            groups = list(self.element_groups)
+            for name, (positions, values) in properties.items():
+                group_indices, rows = self.element_locations(positions)
+                values = np.broadcast_to(np.asarray(values, dtype=float), rows.shape)
+                for group_index in np.unique(group_indices).tolist():
+                    group = groups[group_index]
+                    if name not in group.properties:
+                        raise ValueError(f"Elements of type {group.element_type.__name__} have no property '{name}'.")
+                    selected = group_indices == group_index
+                    changed = np.array(group.properties[name])
+                    changed[rows[selected]] = values[selected]
+                    group = _shallow_copy(group)
+                    group.properties = {**group.properties, name: _read_only(changed)}
+                    groups[group_index] = group
+            variant.element_groups = groups
+        return variant
+
+    def global_stiffness_matrix(self, axial_forces: np.ndarray = None, include_elastic=True, coordinates=None,
+                                sparse=False):
+        """
+        Assembles the global stiffness matrix with one batch kernel call per element group.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray, optional
+            Axial force of each element, in the order of the structure's elements. If given, the
+            geometric stiffness of the elements that include geometric nonlinearity is added.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+        coordinates : np.ndarray, optional
+            Nodal coordinates to assemble in. Defaults to the compiled coordinates.
+        sparse : bool, optional
+            Whether to return a sparse matrix (default is False).
+
+        Returns
+        -------
+        np.ndarray or scipy.sparse.csr_matrix
+            The global stiffness matrix.
+        """
+        coordinates = self.coordinates if coordinates is None else coordinates
+        data = []
+        for group in self.element_groups:
+            group_axial_forces = None
+            if axial_forces is not None:
+                group_axial_forces = axial_forces[group.positions] * group.geometric_nonlinearity
+            matrices = group.element_type.batch_global_stiffness_matrices(axial_forces=group_axial_forces,
+                                                                          include_elastic=include_elastic,
+                                                                          **group.arrays(coordinates))
+            data.append(matrices.ravel())
+        data = np.concatenate(data) if data else np.zeros(0)
+        return self.scatter_plan.assemble(data, sparse)
+
+    def full_displacement_vector(self, free_displacements: np.ndarray) -> np.ndarray:
+        """
+        Combines free displacements with the prescribed displacements into a vector in equation order.
+
+        Parameters
+        ----------
+        free_displacements : np.ndarray
+            Displacements of the free degrees of freedom.
+
+        Returns
+        -------
+        np.ndarray
+            Displacements of all degrees of freedom.
+        """
+        return np.concatenate([free_displacements, self.prescribed_displacements])
+
+    def element_end_forces(self, displacements: np.ndarray, axial_forces: np.ndarray = None, coordinates=None) -> list:
+        """
+        Computes the local end forces of every element group in one batch kernel call per group.
+
+        Parameters
+        ----------
+        displacements : np.ndarray
+            Displacements of all degrees of freedom, in equation order.
+        axial_forces : np.ndarray, optional
+            Axial force of each element, in the order of the structure's elements. If given, the
+            geometric stiffness of the elements that include geometric nonlinearity is included.
+        coordinates : np.ndarray, optional
+            Nodal coordinates to evaluate in. Defaults to the compiled coordinates.
+
+        Returns
+        -------
+        list of np.ndarray
+            Local end forces of each group, of shape (n_elements, n_dofs).
+        """
+        coordinates = self.coordinates if coordinates is None else coordinates
+        end_forces = []
+        for group in self.element_groups:
+            group_axial_forces = None
+            if axial_forces is not None:
+                group_axial_forces = axial_forces[group.positions] * group.geometric_nonlinearity
+            end_forces.append(group.element_type.batch_local_end_forces(displacements[group.dof_indices],
+                                                                        axial_forces=group_axial_forces,
+                                                                        **group.arrays(coordinates)))
+        return end_forces
+
+    def element_axial_forces(self, group_end_forces: list) -> np.ndarray:
+        """
+        Gathers the axial forces that contribute to the geometric stiffness from per-group end forces.
+
+        Parameters
+        ----------
+        group_end_forces : list of np.ndarray
+            Local end forces of each group, as returned by `element_end_forces`.
+
+        Returns
+        -------
+        np.ndarray
+            Axial force of each element, in the order of the structure's elements. Elements without
+            geometric nonlinearity get a zero axial force.
+        """
+        axial_forces = np.zeros(self.element_count)
+        for group, end_forces in zip(self.element_groups, group_end_forces):
+            axial_forces[group.positions] = group.axial_forces(end_forces)
+        return axial_forces
+
+    def node_displacements(self, displacements: np.ndarray) -> np.ndarray:
+        """
+        Expands displacements in equation order to per-node x, y and rz displacements.
+
+        Parameters
+        ----------
+        displacements : np.ndarray
+            Displacements of all degrees of freedom, in equation order.
+
+        Returns
+        -------
+        np.ndarray
+            Nodal displacements of shape (n_nodes, 3). Unused degrees of freedom get zero.
+        """
+        padded = np.append(displacements, 0)
+        return padded[self.node_dofs]
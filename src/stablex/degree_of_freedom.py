@@ -1,3 +1,6 @@
+from stablex.ids import current_ids
+
+
 class DegreeOfFreedom:
     """
     Internal class representing a degree of freedom
@@ -8,10 +11,19 @@ class DegreeOfFreedom:
     Attributes
     ----------
     id : int
-        A unique identifier for the degree of freedom.
+        A unique identifier for the degree of freedom, allocated by the current `model_scope`
+        (see `stablex.ids`).
+    displacement : float
+        Displacement of the node in the direction of the degree of freedom, prescribed if it is
+        restrained. Initialized with value 0.0.
+    force : float
+        Force applied at the node in the direction of the degree of freedom. Initialized with value 0.0.
+
+    Notes
+    -----
+    Instances have no `__dict__`; their attributes live in slots to keep large models compact.
     """
-
-    id_counter = 1
+    __slots__ = ("id", "_topology", "_restrained", "displacement", "force")
 
     def __init__(self):
         """
@@ -22,23 +34,12 @@ class DegreeOfFreedom:
         - displacement: 0.0
         - force: 0.0
         """
-        self.id = DegreeOfFreedom.id_counter
+        ids = current_ids()
+        self.id = ids.dofs.allocate()
+        self._topology = ids.topology
         self._restrained = False
-        self._displacement = 0
-        DegreeOfFreedom.id_counter += 1
-        self._force = 0
-
-    @property
-    def displacement(self) -> float:
-        """
-        Gets and sets the displacement of the node in the direction of the degree of freedom.
-        Initialized with value 0.0.
-        """
-        return self._displacement
-
-    @displacement.setter
-    def displacement(self, value: float):
-        self._displacement = value
+        self.displacement = 0
+        self.force = 0
 
     @property
     def restrained(self) -> bool:
@@ -50,13 +51,6 @@ class DegreeOfFreedom:
 
     @restrained.setter
     def restrained(self, value: bool):
+        if value != self._restrained:
+            self._topology.bump()
         self._restrained = value
-
-    @property
-    def force(self) -> float:
-        """Gets and sets the force applied at the node in the direction of the degree of freedom."""
-        return self._force
-
-    @force.setter
-    def force(self, value: float):
-        self._force = value
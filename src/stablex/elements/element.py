@@ -3,6 +3,7 @@ from abc import abstractmethod, ABC
 import numpy as np
 
 from stablex import Node
+from stablex.ids import current_ids
 
 
 class Element(ABC):
@@ -21,7 +22,7 @@ class Element(ABC):
     Attributes
     ----------
     id : int
-        Unique identifier for the element instance, auto-incremented.
+        Unique identifier for the element instance, allocated by the current `model_scope` (see `stablex.ids`).
     geometric_nonlinearity : bool
         Whether geometric nonlinearity is included in the element.
 
@@ -45,13 +46,47 @@ class Element(ABC):
         Calculates the local end forces based on the stiffness matrix and displacements.
     global_end_forces() -> np.ndarray
         Computes the global end forces by transforming the local forces.
+    has_batch_kernels() -> bool
+        Whether the element type evaluates its elements with batch kernels of its own.
+    uses_element_matrices(elements: list) -> bool
+        Whether the elements are evaluated from the matrices of the element objects.
+    batch_element_matrices(elements: list) -> dict
+        Gathers the local stiffness and transformation matrices of the element objects.
+    batch_arrays(elements: list) -> dict
+        Gathers the stacked arrays consumed by the batch kernels of the element type.
+    batch_geometry(start_coordinates, end_coordinates) -> dict
+        Computes the geometric quantities consumed by the batch kernels.
+    batch_properties(elements: list) -> dict
+        Gathers the section and material properties consumed by the batch kernels.
+    batch_axial_forces(end_forces: np.ndarray) -> np.ndarray
+        Extracts the axial forces from stacked local end forces.
+    batch_global_stiffness_matrices(axial_forces, include_elastic, **arrays) -> np.ndarray
+        Computes the global stiffness matrices of many elements of the same type at once.
+    batch_local_end_forces(global_end_displacements, axial_forces, include_elastic, **arrays) -> np.ndarray
+        Computes the local end forces of many elements of the same type at once.
+    batch_stability_stiffness_matrices(axial_forces, **arrays) -> np.ndarray
+        Computes the exact global stiffness matrices of many elements under the given axial forces.
+    batch_fixed_end_eigenvalue_counts(axial_forces, **arrays) -> np.ndarray
+        Counts the fixed-end buckling loads of each element below the given axial forces.
+    batch_global_end_forces(local_end_forces, **arrays) -> np.ndarray
+        Transforms stacked local end forces to the global coordinate system.
 
     Notes
     -----
     This class serves as a base class for specific element types and requires the implementation
     of several abstract methods and properties to define the stiffness and transformation matrices.
+
+    Elements store their attributes in slots instead of a `__dict__`. Subclasses declare
+    `__slots__` for the attributes they add, or an empty tuple.
+
+    The solvers evaluate elements type by type with the class-level `batch_*` kernels. A subclass
+    that only implements the per-object methods, `first_order_elastic_stiffness_matrix` and
+    `transformation_matrix`, is evaluated by the default kernels of this class instead, which stack
+    the matrices of the element objects when the structure is compiled. So are elements with an
+    assigned `stiffness_matrix`. These elements are linear: their stiffness does not depend on the
+    axial force, so they add no geometric stiffness.
     """
-    id_counter = 1
+    __slots__ = ("_start_node", "_end_node", "geometric_nonlinearity", "id", "_topology", "_stiffness_matrix")
 
     def __init__(self, start_node: Node, end_node: Node, include_geom_nonlinearity=False):
         """
@@ -71,14 +106,15 @@ class Element(ABC):
         This class serves as a base class for specific element types and requires the implementation
         of several abstract methods and properties to define the stiffness and transformation matrices.
 
-        The id attribute is auto-incremented with each new instance created.
+        The id attribute is allocated by the current `model_scope`, see `stablex.ids`.
         """
         self._start_node = start_node
         self._end_node = end_node
         self.geometric_nonlinearity = include_geom_nonlinearity
-        self.id = Element.id_counter
-        self._stiffness_matrix = np.zeros((len(self.stiffness_matrix_dofs), len(self.stiffness_matrix_dofs)))
-        Element.id_counter += 1
+        ids = current_ids()
+        self.id = ids.elements.allocate()
+        self._topology = ids.topology
+        self._stiffness_matrix = None
 
     @property
     def nodes(self):
@@ -99,6 +135,7 @@ class Element(ABC):
     @start_node.setter
     def start_node(self, value: Node):
         self._start_node = value
+        self._topology.bump()
 
     @property
     def end_node(self) -> Node:
@@ -108,6 +145,7 @@ class Element(ABC):
     @end_node.setter
     def end_node(self, value: Node):
         self._end_node = value
+        self._topology.bump()
 
     @abstractmethod
     def first_order_elastic_stiffness_matrix(self):
@@ -123,8 +161,10 @@ class Element(ABC):
     def stiffness_matrix(self):
         """
         np.ndarray: The combined stiffness matrix of the element, representing the sum of the
-        elastic and geometric stiffness matrices.
+        elastic and geometric stiffness matrices. Defaults to the first-order elastic stiffness matrix.
         """
+        if self._stiffness_matrix is None:
+            return self.first_order_elastic_stiffness_matrix()
         return self._stiffness_matrix
 
     @stiffness_matrix.setter
@@ -142,7 +182,8 @@ class Element(ABC):
 
     def global_stiffness_matrix(self):
         """Computes the global stiffness matrix for the element."""
-        return self.transformation_matrix().T.dot(self.stiffness_matrix).dot(self.transformation_matrix())
+        transformation_matrix = self.transformation_matrix()
+        return transformation_matrix.T.dot(self.stiffness_matrix).dot(transformation_matrix)
 
     def global_end_displacements(self):
         """Returns the global end displacements based on degree of freedom displacements."""
@@ -160,3 +201,327 @@ class Element(ABC):
         """Computes the global end forces by transforming the local forces."""
         return self.transformation_matrix().T.dot(self.local_end_forces())
 
+    @classmethod
+    def has_batch_kernels(cls) -> bool:
+        """
+        Whether the element type evaluates its elements with batch kernels of its own.
+
+        Returns
+        -------
+        bool
+            True if the type overrides `batch_properties`, `batch_global_stiffness_matrices` and
+            `batch_local_end_forces`.
+        """
+        return all(getattr(cls, name).__func__ is not getattr(Element, name).__func__
+                   for name in ("batch_properties", "batch_global_stiffness_matrices", "batch_local_end_forces"))
+
+    @classmethod
+    def uses_element_matrices(cls, elements: list) -> bool:
+        """
+        Whether elements of this type are evaluated by the default kernels of `Element`, from the
+        matrices of the element objects.
+
+        Parameters
+        ----------
+        elements : list of Element
+            Elements of this type.
+
+        Returns
+        -------
+        bool
+            True if the type has no batch kernels of its own or an element has an assigned stiffness matrix.
+        """
+        return not cls.has_batch_kernels() or any(element._stiffness_matrix is not None for element in elements)
+
+    @classmethod
+    def batch_element_matrices(cls, elements: list) -> dict:
+        """
+        Gathers the local stiffness and transformation matrices of the element objects.
+
+        Parameters
+        ----------
+        elements : list of Element
+            Elements of the same type.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            The `stiffness_matrices`, the assigned or first-order elastic `stiffness_matrix` of each
+            element, and the `transformation_matrices` of the elements.
+        """
+        return {"stiffness_matrices": np.array([element.stiffness_matrix for element in elements], dtype=float),
+                "transformation_matrices": np.array([element.transformation_matrix() for element in elements],
+                                                    dtype=float)}
+
+    @classmethod
+    def batch_arrays(cls, elements: list) -> dict:
+        """
+        Gathers the stacked arrays consumed by the batch kernels of this element type.
+
+        Parameters
+        ----------
+        elements : list of Element
+            Elements of this type.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            Keyword arguments of `batch_global_stiffness_matrices`, one value per element.
+        """
+        start_coordinates = np.array([element.start_node.coordinates for element in elements], dtype=float)
+        end_coordinates = np.array([element.end_node.coordinates for element in elements], dtype=float)
+        return {**cls.batch_geometry(start_coordinates.reshape(-1, 2), end_coordinates.reshape(-1, 2)),
+                **cls.batch_properties(elements)}
+
+    @classmethod
+    def batch_geometry(cls, start_coordinates: np.ndarray, end_coordinates: np.ndarray) -> dict:
+        """
+        Computes the geometric quantities consumed by the batch kernels from the end node coordinates.
+
+        Parameters
+        ----------
+        start_coordinates : np.ndarray
+            Coordinates of the start node of each element, of shape (n_elements, 2).
+        end_coordinates : np.ndarray
+            Coordinates of the end node of each element, of shape (n_elements, 2).
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            Geometric keyword arguments of the batch kernels. Empty by default.
+        """
+        return {}
+
+    @classmethod
+    def batch_properties(cls, elements: list) -> dict:
+        """
+        Gathers the section and material properties consumed by the batch kernels of this element type.
+
+        Parameters
+        ----------
+        elements : list of Element
+            Elements of this type.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            Property keyword arguments of the batch kernels, one value per element. Defaults to the
+            matrices of the element objects, see `batch_element_matrices`.
+        """
+        return Element.batch_element_matrices(elements)
+
+    @classmethod
+    def batch_axial_forces(cls, end_forces: np.ndarray) -> np.ndarray:
+        """
+        Extracts the axial force of each element from stacked local end forces.
+
+        Parameters
+        ----------
+        end_forces : np.ndarray
+            Local end forces of shape (n_elements, n_dofs).
+
+        Returns
+        -------
+        np.ndarray
+            Axial force of each element, tension positive.
+        """
+        return np.zeros(len(end_forces))
+
+    @classmethod
+    def batch_stability_stiffness_matrices(cls, axial_forces: np.ndarray, **arrays) -> np.ndarray:
+        """
+        Computes the exact global stiffness matrices of many elements under the given axial forces.
+
+        The default implementation adds the geometric stiffness to the first-order elastic
+        stiffness, which is exact for elements without bending along their length.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Global stiffness matrices of shape (n_elements, n_dofs, n_dofs).
+        """
+        return cls.batch_global_stiffness_matrices(axial_forces=axial_forces, **arrays)
+
+    @classmethod
+    def batch_fixed_end_eigenvalue_counts(cls, axial_forces: np.ndarray, **arrays) -> np.ndarray:
+        """
+        Counts the buckling loads of each element with all its end degrees of freedom restrained
+        that lie below the given axial forces.
+
+        These counts are the member terms of the Wittrick-Williams algorithm. The default
+        implementation returns zeros, which holds for elements whose stiffness matrix is exact
+        without internal degrees of freedom.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Number of fixed-end buckling loads below the axial force of each element.
+        """
+        return np.zeros(len(axial_forces), dtype=int)
+
+    @classmethod
+    def batch_global_end_forces(cls, local_end_forces: np.ndarray, **arrays) -> np.ndarray:
+        """
+        Transforms stacked local end forces to the global coordinate system.
+
+        The default implementation applies the `transformation_matrices` of the element objects if
+        given, and an identity transformation otherwise.
+
+        Parameters
+        ----------
+        local_end_forces : np.ndarray
+            Local end forces of shape (n_elements, n_dofs).
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Global end forces of shape (n_elements, n_dofs).
+        """
+        transformation_matrices = arrays.get("transformation_matrices")
+        if transformation_matrices is None:
+            return local_end_forces
+        return np.einsum("nji,nj->ni", transformation_matrices, local_end_forces)
+
+    @classmethod
+    def batch_local_end_forces(cls, global_end_displacements: np.ndarray, axial_forces: np.ndarray = None,
+                               include_elastic=True, **arrays) -> np.ndarray:
+        """
+        Computes the local end forces of many elements of this type at once.
+
+        The default implementation multiplies the local end displacements by the
+        `stiffness_matrices` of the element objects, see `batch_element_matrices`. These do not
+        depend on the axial force, which is therefore ignored.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Global end displacements of shape (n_elements, n_dofs).
+        axial_forces : np.ndarray, optional
+            Axial force of each element. The geometric stiffness is included only if given.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Local end forces of shape (n_elements, n_dofs).
+        """
+        stiffness_matrices = arrays["stiffness_matrices"]
+        if not include_elastic:
+            return np.zeros(stiffness_matrices.shape[:2])
+        local_end_displacements = np.einsum("nij,nj->ni", arrays["transformation_matrices"], global_end_displacements)
+        return np.einsum("nij,nj->ni", stiffness_matrices, local_end_displacements)
+
+    @classmethod
+    def batch_second_order_end_forces(cls, global_end_displacements: np.ndarray,
+                                      geometric_nonlinearity: np.ndarray = None, **arrays) -> tuple:
+        """
+        Computes the end forces and tangent stiffness matrices of many elements from their total
+        end displacements.
+
+        This is the element kernel of `SecondOrderFormulation`. The default implementation is
+        linear elastic: the end forces are the first-order ones and the tangent is the elastic
+        stiffness.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Total global end displacements of shape (n_elements, n_dofs).
+        geometric_nonlinearity : np.ndarray, optional
+            Whether each element includes geometric nonlinearity. Ignored by linear elements.
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Local end forces of shape (n_elements, n_dofs) and global tangent stiffness matrices of
+            shape (n_elements, n_dofs, n_dofs).
+        """
+        return (cls.batch_local_end_forces(global_end_displacements, **arrays),
+                cls.batch_global_stiffness_matrices(**arrays))
+
+    @classmethod
+    def batch_corotational_end_forces(cls, global_end_displacements: np.ndarray, deformations: np.ndarray = None,
+                                      end_forces: np.ndarray = None, **arrays) -> tuple:
+        """
+        Computes the end forces and tangent stiffness matrices of many elements from their total end
+        displacements with a corotational description of their rigid body motion.
+
+        This is the element kernel of `CorotationalFormulation`. The default implementation is
+        linear elastic, for elements without a rigid body rotation such as springs.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Total global end displacements of shape (n_elements, n_dofs).
+        deformations : np.ndarray, optional
+            Buffer of shape (n_elements, n_dofs) that receives the end displacements in the corotated
+            frame. Not written by the default implementation.
+        end_forces : np.ndarray, optional
+            Buffer of shape (n_elements, n_dofs) that receives the local end forces.
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Local end forces in the corotated frame, global end forces, both of shape
+            (n_elements, n_dofs), and global tangent stiffness matrices of shape
+            (n_elements, n_dofs, n_dofs).
+        """
+        local_end_forces = cls.batch_local_end_forces(global_end_displacements, **arrays)
+        if end_forces is not None:
+            end_forces[...] = local_end_forces
+            local_end_forces = end_forces
+        return (local_end_forces, cls.batch_global_end_forces(local_end_forces, **arrays),
+                cls.batch_global_stiffness_matrices(**arrays))
+
+    @classmethod
+    def batch_global_stiffness_matrices(cls, axial_forces: np.ndarray = None, include_elastic=True,
+                                        **arrays) -> np.ndarray:
+        """
+        Computes the global stiffness matrices of many elements of this type at once.
+
+        The default implementation transforms the `stiffness_matrices` of the element objects to
+        global coordinates, see `batch_element_matrices`. These do not depend on the axial force,
+        which is therefore ignored.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray, optional
+            Axial force of each element. The geometric stiffness is added only if given.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+        **arrays : np.ndarray
+            Stacked element properties, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Global stiffness matrices of shape (n_elements, n_dofs, n_dofs).
+        """
+        transformation_matrices = arrays["transformation_matrices"]
+        if not include_elastic:
+            size = transformation_matrices.shape[2]
+            return np.zeros((len(transformation_matrices), size, size))
+        return np.swapaxes(transformation_matrices, 1, 2) @ arrays["stiffness_matrices"] @ transformation_matrices
+
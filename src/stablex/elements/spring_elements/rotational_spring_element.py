@@ -4,6 +4,9 @@ from stablex import Node
 from stablex.elements.spring_elements.spring_element import SpringElement
 from stablex.degree_of_freedom import DegreeOfFreedom
 
+_ROTATIONAL = np.array([[1, -1],
+                        [-1, 1]], dtype=float)
+
 
 class LinearRotationalSpringElement(SpringElement):
     """
@@ -28,6 +31,8 @@ class LinearRotationalSpringElement(SpringElement):
     stiffness_matrix_dofs : list
         The degrees of freedom associated with the stiffness matrix of the element.
     """
+    __slots__ = ("_rotational_stiffness",)
+
     def __init__(self, start_node: Node, end_node: Node, rotational_stiffness):
         super().__init__(start_node, end_node)
         self._rotational_stiffness = rotational_stiffness
@@ -118,3 +123,73 @@ class LinearRotationalSpringElement(SpringElement):
             A list of degrees of freedom for the spring element.
         """
         return [self.start_node.rz_dof, self.end_node.rz_dof]
+
+    @classmethod
+    def batch_properties(cls, elements: list) -> dict:
+        """
+        Gathers the rotational stiffness of the spring elements.
+
+        Parameters
+        ----------
+        elements : list of LinearRotationalSpringElement
+            Spring elements.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            The `rotational_stiffnesses` of the springs.
+        """
+        return {"rotational_stiffnesses": np.array([element.rotational_stiffness for element in elements],
+                                                   dtype=float)}
+
+    @classmethod
+    def batch_global_stiffness_matrices(cls, rotational_stiffnesses: np.ndarray, axial_forces: np.ndarray = None,
+                                        include_elastic=True) -> np.ndarray:
+        """
+        Computes the global stiffness matrices of many spring elements at once.
+
+        The spring is linear elastic and its transformation matrix is the identity, so the global
+        matrices equal the elastic ones and the axial forces are ignored.
+
+        Parameters
+        ----------
+        rotational_stiffnesses : np.ndarray
+            Rotational stiffness of each spring.
+        axial_forces : np.ndarray, optional
+            Ignored; springs have no geometric stiffness.
+        include_elastic : bool, optional
+            Whether to include the elastic stiffness (default is True).
+
+        Returns
+        -------
+        np.ndarray
+            Global stiffness matrices of shape (n_elements, 2, 2).
+        """
+        if not include_elastic:
+            rotational_stiffnesses = np.zeros_like(rotational_stiffnesses)
+        return rotational_stiffnesses[:, None, None] * _ROTATIONAL
+
+    @classmethod
+    def batch_local_end_forces(cls, global_end_displacements: np.ndarray, rotational_stiffnesses: np.ndarray,
+                               axial_forces: np.ndarray = None, include_elastic=True) -> np.ndarray:
+        """
+        Computes the end moments of many spring elements at once.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            End rotations of shape (n_elements, 2).
+        rotational_stiffnesses : np.ndarray
+            Rotational stiffness of each spring.
+        axial_forces : np.ndarray, optional
+            Ignored; springs have no geometric stiffness.
+        include_elastic : bool, optional
+            Whether to include the elastic stiffness (default is True).
+
+        Returns
+        -------
+        np.ndarray
+            End moments of shape (n_elements, 2).
+        """
+        matrices = cls.batch_global_stiffness_matrices(rotational_stiffnesses, include_elastic=include_elastic)
+        return np.einsum("nij,nj->ni", matrices, global_end_displacements)
@@ -22,6 +22,7 @@ class SpringElement(Element, ABC):
     transformation_matrix()
         Abstract method to define the transformation matrix for the spring element.
     """
+    __slots__ = ()
 
     def first_order_elastic_stiffness_matrix(self) -> np.ndarray:
         """
@@ -1,9 +1,67 @@
 import math
 import numpy as np
 from stablex.elements.unidimensional_elements.unidimensional_element import UniDimensionalElement
-from stablex.stability_functions import *
+from stablex.stability_functions import stiffness_coefficients
 from stablex.degree_of_freedom import DegreeOfFreedom
 
+# Coefficient patterns of the frame element matrices used by the batch kernels.
+_AXIAL = np.array([[1, 0, 0, -1, 0, 0],
+                   [0, 0, 0, 0, 0, 0],
+                   [0, 0, 0, 0, 0, 0],
+                   [-1, 0, 0, 1, 0, 0],
+                   [0, 0, 0, 0, 0, 0],
+                   [0, 0, 0, 0, 0, 0]], dtype=float)
+_SHEAR = np.array([[0, 0, 0, 0, 0, 0],
+                   [0, 1, 0, 0, -1, 0],
+                   [0, 0, 0, 0, 0, 0],
+                   [0, 0, 0, 0, 0, 0],
+                   [0, -1, 0, 0, 1, 0],
+                   [0, 0, 0, 0, 0, 0]], dtype=float)
+_SHEAR_MOMENT = np.array([[0, 0, 0, 0, 0, 0],
+                          [0, 0, 1, 0, 0, 1],
+                          [0, 1, 0, 0, -1, 0],
+                          [0, 0, 0, 0, 0, 0],
+                          [0, 0, -1, 0, 0, -1],
+                          [0, 1, 0, 0, -1, 0]], dtype=float)
+_NEAR_END_MOMENT = np.array([[0, 0, 0, 0, 0, 0],
+                             [0, 0, 0, 0, 0, 0],
+                             [0, 0, 1, 0, 0, 0],
+                             [0, 0, 0, 0, 0, 0],
+                             [0, 0, 0, 0, 0, 0],
+                             [0, 0, 0, 0, 0, 1]], dtype=float)
+_FAR_END_MOMENT = np.array([[0, 0, 0, 0, 0, 0],
+                            [0, 0, 0, 0, 0, 0],
+                            [0, 0, 0, 0, 0, 1],
+                            [0, 0, 0, 0, 0, 0],
+                            [0, 0, 0, 0, 0, 0],
+                            [0, 0, 1, 0, 0, 0]], dtype=float)
+_COSINE = np.diag([1., 1., 0., 1., 1., 0.])
+_SINE = np.array([[0, 1, 0, 0, 0, 0],
+                  [-1, 0, 0, 0, 0, 0],
+                  [0, 0, 0, 0, 0, 0],
+                  [0, 0, 0, 0, 1, 0],
+                  [0, 0, 0, -1, 0, 0],
+                  [0, 0, 0, 0, 0, 0]], dtype=float)
+_ROTATION = np.diag([0., 0., 1., 0., 0., 1.])
+
+
+def _antisymmetric_fixed_end_roots(i: np.ndarray) -> np.ndarray:
+    """
+    Solves tan(z) = z for the root in (i*pi, i*pi + pi/2), i >= 1, by Newton iterations.
+
+    Twice the root is the stability parameter of the i-th antisymmetric buckling mode of a member
+    with both ends clamped.
+    """
+    z = (i + 0.5) * math.pi - 1 / ((i + 0.5) * math.pi)
+    for _ in range(6):
+        z = z - (np.sin(z) - z * np.cos(z)) / (z * np.sin(z))
+    return z
+
+
+def _outer(a: np.ndarray, b: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Stacked outer products factors·a·bᵀ of the rows of a and b."""
+    return factors[:, None, None] * a[:, :, None] * b[:, None, :]
+
 
 class FrameElement(UniDimensionalElement):
     """
@@ -48,7 +106,24 @@ class FrameElement(UniDimensionalElement):
         Computes an alternate stiffness matrix using Gaussian quadrature for accuracy.
     transformation_matrix() -> np.ndarray
         Computes the transformation matrix to align the local and global coordinate systems.
+    batch_first_order_elastic_stiffness_matrices(lengths, areas, inertias, elasticity_moduli) -> np.ndarray
+        Computes the first-order elastic stiffness matrices of many frame elements at once.
+    batch_geometric_stiffness_matrices(lengths, axial_forces) -> np.ndarray
+        Computes the geometric stiffness matrices of many frame elements at once.
+    batch_transformation_matrices(cosines, sines) -> np.ndarray
+        Computes the transformation matrices of many frame elements at once.
+    batch_local_stability_stiffness_matrices(lengths, areas, inertias, elasticity_moduli, axial_forces) -> np.ndarray
+        Computes the exact local stiffness matrices of many frame elements under axial forces.
+    batch_stability_stiffness_matrices(axial_forces, **arrays) -> np.ndarray
+        Computes the exact global stiffness matrices of many frame elements under axial forces.
+    batch_fixed_end_eigenvalue_counts(axial_forces, **arrays) -> np.ndarray
+        Counts the clamped-clamped buckling loads of each element below its compression.
+    batch_corotational_end_forces(global_end_displacements, deformations, end_forces, **arrays) -> tuple
+        Computes the corotational end forces and tangent stiffness matrices of many frame elements at once.
     """
+    __slots__ = ()
+
+    _elongation = np.array([-1., 0., 0., 1., 0., 0.])
 
     @property
     def stiffness_matrix_dofs(self) -> list[DegreeOfFreedom]:
@@ -78,34 +153,24 @@ class FrameElement(UniDimensionalElement):
 
     def stability_stiffness_matrix(self, load):
         """
-        Calculates the stiffness matrix using stability functions, based on the internal axial force.
+        Calculates the local stiffness matrix using stability functions, based on the internal axial force.
 
-        Note
-        ----
-        This method is currently not utilized in the analysis process. It may be integrated as a feature in future releases.
+        The matrix follows the sign convention of `first_order_elastic_stiffness_matrix` and
+        reduces to it for a zero load.
 
         Parameters
         ----------
         load : float
-            The axial load applied to the element.
+            The axial load applied to the element, compression positive.
 
         Returns
         -------
         np.ndarray
             A 6x6 stability stiffness matrix.
         """
-        r = self.section.radius_of_gyration
-        l = self.length
-        e = self.elasticity_modulus
-        i = self.section.inertia
-        k = e * l / i
-        ul = math.pi * math.sqrt(load/self.euler_load)
-        return k * np.array([[1/(r**2),               0,            0,   -1/(r**2),             0,             0],
-                             [0,            ss(ul)/l**2,    -sb(ul)/l,           0,  -ss(ul)/l**2,     -sb(ul)/l],
-                             [0,              -sb(ul)/l,        s(ul),           0,      sb(ul)/l,   s(ul)*c(ul)],
-                             [-1/(r**2),              0,            0,    1/(r**2),             0,             0],
-                             [0,           -ss(ul)/l**2,     sb(ul)/l,           0,   ss(ul)/l**2,      sb(ul)/l],
-                             [0,              -sb(ul)/l,  s(ul)*c(ul),           0,      sb(ul)/l,        s(ul)]])
+        return FrameElement.batch_local_stability_stiffness_matrices(
+            np.array([self.length]), np.array([self.section.area]), np.array([self.section.inertia]),
+            np.array([self.elasticity_modulus]), np.array([-load], dtype=float))[0]
 
     def first_order_elastic_stiffness_matrix(self):
         """
@@ -188,8 +253,8 @@ class FrameElement(UniDimensionalElement):
         e = self.elasticity_modulus
         a = self.section.area
         i = self.section.inertia
-        return np.array([np.array([-1/l, 0, 0, 1/l, 0, 0])*sqrt(e*a),
-                        np.array([0, 12*x/l**3 - 6/l**2, 6*x/l**2 - 4/l, 0, 6/l**2 - 12*x/l**3, 6*x/l**2 - 2/l])*sqrt(e*i)])
+        return np.array([np.array([-1/l, 0, 0, 1/l, 0, 0])*math.sqrt(e*a),
+                        np.array([0, 12*x/l**3 - 6/l**2, 6*x/l**2 - 4/l, 0, 6/l**2 - 12*x/l**3, 6*x/l**2 - 2/l])*math.sqrt(e*i)])
 
     def get_x_from_normal_coord(self, xi):
         """
@@ -237,7 +302,7 @@ class FrameElement(UniDimensionalElement):
         np.ndarray
             A stiffness matrix computed using Gaussian quadrature for enhanced accuracy.
         """
-        xi = 1/sqrt(3)
+        xi = 1/math.sqrt(3)
         return self.length/2 * (np.dot(self.normal_b_matrix(xi).T, self.normal_b_matrix(xi)) +
                               np.dot(self.normal_b_matrix(-xi).T, self.normal_b_matrix(-xi)))
 
@@ -260,3 +325,277 @@ class FrameElement(UniDimensionalElement):
         transformation_matrix[:3, :3] = t
         transformation_matrix[3:, 3:] = t
         return transformation_matrix
+
+    @classmethod
+    def batch_properties(cls, elements: list) -> dict:
+        """
+        Gathers the section and material properties of the frame elements.
+
+        Parameters
+        ----------
+        elements : list of FrameElement
+            Frame elements.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            The `areas`, `inertias` and `elasticity_moduli` of the elements.
+        """
+        properties = super().batch_properties(elements)
+        properties["inertias"] = np.array([element.section.inertia for element in elements], dtype=float)
+        return properties
+
+    @classmethod
+    def batch_axial_forces(cls, end_forces: np.ndarray) -> np.ndarray:
+        """
+        Extracts the axial forces from stacked local end forces.
+
+        Parameters
+        ----------
+        end_forces : np.ndarray
+            Local end forces of shape (n_elements, 6).
+
+        Returns
+        -------
+        np.ndarray
+            The axial force at the end node of each element, tension positive.
+        """
+        return end_forces[:, 3]
+
+    @classmethod
+    def batch_first_order_elastic_stiffness_matrices(cls, lengths: np.ndarray, areas: np.ndarray,
+                                                     inertias: np.ndarray, elasticity_moduli: np.ndarray):
+        """
+        Calculates the local first-order elastic stiffness matrices of many frame elements at once.
+
+        Parameters
+        ----------
+        lengths : np.ndarray
+            Length of each element.
+        areas : np.ndarray
+            Cross-sectional area of each element.
+        inertias : np.ndarray
+            Moment of inertia of each element.
+        elasticity_moduli : np.ndarray
+            Elasticity modulus of each element.
+
+        Returns
+        -------
+        np.ndarray
+            Elastic stiffness matrices of shape (n_elements, 6, 6).
+        """
+        l = lengths[:, None, None]
+        ei = (elasticity_moduli * inertias)[:, None, None]
+        return ((elasticity_moduli * areas)[:, None, None] / l * _AXIAL + 12 * ei / l**3 * _SHEAR
+                + 6 * ei / l**2 * _SHEAR_MOMENT + 4 * ei / l * _NEAR_END_MOMENT + 2 * ei / l * _FAR_END_MOMENT)
+
+    @classmethod
+    def batch_geometric_stiffness_matrices(cls, lengths: np.ndarray, axial_forces: np.ndarray):
+        """
+        Computes the local geometric stiffness matrices of many frame elements at once.
+
+        Parameters
+        ----------
+        lengths : np.ndarray
+            Length of each element.
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+
+        Returns
+        -------
+        np.ndarray
+            Geometric stiffness matrices of shape (n_elements, 6, 6).
+        """
+        l = lengths[:, None, None]
+        p = axial_forces[:, None, None]
+        return p / l * (_AXIAL + 6 / 5 * _SHEAR + l / 10 * _SHEAR_MOMENT
+                        + 2 * l**2 / 15 * _NEAR_END_MOMENT - l**2 / 30 * _FAR_END_MOMENT)
+
+    @classmethod
+    def batch_transformation_matrices(cls, cosines: np.ndarray, sines: np.ndarray):
+        """
+        Computes the transformation matrices of many frame elements at once.
+
+        Parameters
+        ----------
+        cosines : np.ndarray
+            Cosine of the angle between each element and the global x-axis.
+        sines : np.ndarray
+            Sine of the angle between each element and the global x-axis.
+
+        Returns
+        -------
+        np.ndarray
+            Transformation matrices of shape (n_elements, 6, 6).
+        """
+        return cosines[:, None, None] * _COSINE + sines[:, None, None] * _SINE + _ROTATION
+
+    @classmethod
+    def batch_local_stability_stiffness_matrices(cls, lengths: np.ndarray, areas: np.ndarray, inertias: np.ndarray,
+                                                 elasticity_moduli: np.ndarray, axial_forces: np.ndarray):
+        """
+        Computes the exact local stiffness matrices of many frame elements under axial forces.
+
+        The bending terms are given by the stability functions of the load parameter
+        q = -P·L²/EI, which reduce to the first-order elastic stiffness for a zero axial force.
+
+        Parameters
+        ----------
+        lengths : np.ndarray
+            Length of each element.
+        areas : np.ndarray
+            Cross-sectional area of each element.
+        inertias : np.ndarray
+            Moment of inertia of each element.
+        elasticity_moduli : np.ndarray
+            Elasticity modulus of each element.
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+
+        Returns
+        -------
+        np.ndarray
+            Stiffness matrices of shape (n_elements, 6, 6).
+        """
+        l = lengths[:, None, None]
+        ei = (elasticity_moduli * inertias)[:, None, None]
+        q = -axial_forces * lengths**2 / (elasticity_moduli * inertias)
+        s_function, sc_function = stiffness_coefficients(q)
+        sb_function = (s_function + sc_function)[:, None, None]
+        lateral = 2 * sb_function - q[:, None, None]
+        return ((elasticity_moduli * areas + axial_forces)[:, None, None] / l * _AXIAL
+                + ei / l**3 * lateral * _SHEAR + ei / l**2 * sb_function * _SHEAR_MOMENT
+                + ei / l * s_function[:, None, None] * _NEAR_END_MOMENT
+                + ei / l * sc_function[:, None, None] * _FAR_END_MOMENT)
+
+    @classmethod
+    def batch_stability_stiffness_matrices(cls, axial_forces: np.ndarray, lengths: np.ndarray, cosines: np.ndarray,
+                                           sines: np.ndarray, areas: np.ndarray, inertias: np.ndarray,
+                                           elasticity_moduli: np.ndarray, **arrays) -> np.ndarray:
+        """
+        Computes the exact global stiffness matrices of many frame elements under axial forces.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+        lengths, cosines, sines, areas, inertias, elasticity_moduli : np.ndarray
+            Element arrays, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Global stiffness matrices of shape (n_elements, 6, 6).
+        """
+        transformation_matrices = cls.batch_transformation_matrices(cosines, sines)
+        matrices = cls.batch_local_stability_stiffness_matrices(lengths, areas, inertias, elasticity_moduli,
+                                                                axial_forces)
+        return np.swapaxes(transformation_matrices, 1, 2) @ matrices @ transformation_matrices
+
+    @classmethod
+    def batch_fixed_end_eigenvalue_counts(cls, axial_forces: np.ndarray, lengths: np.ndarray, inertias: np.ndarray,
+                                          elasticity_moduli: np.ndarray, **arrays) -> np.ndarray:
+        """
+        Counts the buckling loads of each element with both ends clamped below its compression.
+
+        A clamped-clamped member buckles symmetrically at ψ = 2iπ and antisymmetrically at ψ = 2z,
+        tan(z) = z, with ψ = L·sqrt(-P/EI). Both families interlace, so for i = floor(ψ/2π) ≥ 1
+        the count is 2i - 1 plus one if ψ is past the i-th antisymmetric root.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+        lengths, inertias, elasticity_moduli : np.ndarray
+            Element arrays, as returned by `batch_arrays`.
+
+        Returns
+        -------
+        np.ndarray
+            Number of fixed-end buckling loads below the axial force of each element.
+        """
+        psi = lengths * np.sqrt(np.maximum(-axial_forces, 0) / (elasticity_moduli * inertias))
+        i = np.floor(psi / (2 * math.pi)).astype(int)
+        counts = np.zeros(len(psi), dtype=int)
+        buckled = i >= 1
+        counts[buckled] = 2 * i[buckled] - 1 + (psi[buckled] > 2 * _antisymmetric_fixed_end_roots(i[buckled]))
+        return counts
+
+    @classmethod
+    def batch_corotational_end_forces(cls, global_end_displacements: np.ndarray, deformations: np.ndarray = None,
+                                      end_forces: np.ndarray = None, *, lengths: np.ndarray, cosines: np.ndarray,
+                                      sines: np.ndarray, areas: np.ndarray, inertias: np.ndarray,
+                                      elasticity_moduli: np.ndarray, **arrays) -> tuple:
+        """
+        Computes the corotational end forces and tangent stiffness matrices of many frame elements at once.
+
+        The rigid body motion of each element is removed by a frame that follows its chord. In
+        that frame the element is a linear elastic beam loaded by the elongation u and the end
+        rotations θ1 and θ2 relative to the chord, which stay small even when the element
+        rotates by large angles. With the axial force N = EA·u/L and the end moments
+        M1 = EI/L·(4θ1 + 2θ2) and M2 = EI/L·(2θ1 + 4θ2), the global end forces and their exact
+        derivative are (Crisfield, 1991)
+
+            f = Bᵀ·[N, M1, M2]
+            K_t = Bᵀ·K_l·B + N/l·z·zᵀ + (M1 + M2)/l²·(r·zᵀ + z·rᵀ)
+
+        where l is the current length, r and z are the unit vectors along and across the chord
+        expanded to the end degrees of freedom, B = [r, e3 - z/l, e6 - z/l] and K_l is the
+        stiffness of the beam in the corotated frame.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Total global end displacements of shape (n_elements, 6).
+        deformations : np.ndarray, optional
+            Buffer of shape (n_elements, 6) that receives the end displacements in the corotated
+            frame: u at the end node and θ1 and θ2 at the rotations.
+        end_forces : np.ndarray, optional
+            Buffer of shape (n_elements, 6) that receives the local end forces.
+        lengths, cosines, sines : np.ndarray
+            Initial geometry of the elements, as returned by `batch_geometry`.
+        areas, inertias, elasticity_moduli : np.ndarray
+            Element properties, as returned by `batch_properties`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Local end forces in the corotated frame and global end forces, of shape
+            (n_elements, 6), and global tangent stiffness matrices of shape (n_elements, 6, 6).
+        """
+        u = global_end_displacements
+        current_lengths, c, s, elongations, rotations = cls.batch_corotated_geometry(
+            u[:, 0:2], u[:, 3:5], lengths, cosines, sines)
+        start_rotations = np.arctan2(np.sin(u[:, 2] - rotations), np.cos(u[:, 2] - rotations))
+        end_rotations = np.arctan2(np.sin(u[:, 5] - rotations), np.cos(u[:, 5] - rotations))
+        axial_stiffnesses = elasticity_moduli * areas / lengths
+        flexural_stiffnesses = elasticity_moduli * inertias / lengths
+        axial_forces = axial_stiffnesses * elongations
+        start_moments = flexural_stiffnesses * (4 * start_rotations + 2 * end_rotations)
+        end_moments = flexural_stiffnesses * (2 * start_rotations + 4 * end_rotations)
+        shears = (start_moments + end_moments) / current_lengths
+
+        if deformations is None:
+            deformations = np.empty(u.shape)
+        deformations[...] = 0
+        deformations[:, 2], deformations[:, 3], deformations[:, 5] = start_rotations, elongations, end_rotations
+        if end_forces is None:
+            end_forces = np.empty(u.shape)
+        end_forces[:, 0], end_forces[:, 1], end_forces[:, 2] = -axial_forces, shears, start_moments
+        end_forces[:, 3], end_forces[:, 4], end_forces[:, 5] = axial_forces, -shears, end_moments
+
+        zero = np.zeros(len(c))
+        r = np.stack([-c, -s, zero, c, s, zero], axis=1)
+        z = np.stack([s, -c, zero, -s, c, zero], axis=1)
+        b_start = -z / current_lengths[:, None]
+        b_start[:, 2] += 1
+        b_end = -z / current_lengths[:, None]
+        b_end[:, 5] += 1
+        global_end_forces = (axial_forces[:, None] * r + start_moments[:, None] * b_start
+                             + end_moments[:, None] * b_end)
+        tangents = (_outer(r, r, axial_stiffnesses) + _outer(b_start, b_start, 4 * flexural_stiffnesses)
+                    + _outer(b_start, b_end, 2 * flexural_stiffnesses)
+                    + _outer(b_end, b_start, 2 * flexural_stiffnesses)
+                    + _outer(b_end, b_end, 4 * flexural_stiffnesses) + _outer(z, z, axial_forces / current_lengths)
+                    + _outer(r, z, shears / current_lengths) + _outer(z, r, shears / current_lengths))
+        return end_forces, global_end_forces, tangents
@@ -3,6 +3,21 @@ import numpy as np
 from stablex.elements.unidimensional_elements.unidimensional_element import UniDimensionalElement
 from stablex.degree_of_freedom import DegreeOfFreedom
 
+# Coefficient patterns of the truss element matrices used by the batch kernels.
+_AXIAL = np.array([[1, 0, -1, 0],
+                   [0, 0, 0, 0],
+                   [-1, 0, 1, 0],
+                   [0, 0, 0, 0]], dtype=float)
+_TRANSVERSE = np.array([[0, 0, 0, 0],
+                        [0, 1, 0, -1],
+                        [0, 0, 0, 0],
+                        [0, -1, 0, 1]], dtype=float)
+_COSINE = np.eye(4)
+_SINE = np.array([[0, 1, 0, 0],
+                  [-1, 0, 0, 0],
+                  [0, 0, 0, 1],
+                  [0, 0, -1, 0]], dtype=float)
+
 
 class TrussElement(UniDimensionalElement):
     """
@@ -34,7 +49,18 @@ class TrussElement(UniDimensionalElement):
             Computes the first-order elastic stiffness matrix for the truss element.
         geometric_stiffness_matrix(end_forces: np.ndarray) -> np.ndarray
             Calculates the geometric stiffness matrix for the element, based on axial forces.
+        batch_first_order_elastic_stiffness_matrices(lengths, areas, elasticity_moduli) -> np.ndarray
+            Computes the first-order elastic stiffness matrices of many truss elements at once.
+        batch_geometric_stiffness_matrices(lengths, axial_forces) -> np.ndarray
+            Computes the geometric stiffness matrices of many truss elements at once.
+        batch_transformation_matrices(cosines, sines) -> np.ndarray
+            Computes the transformation matrices of many truss elements at once.
+        batch_corotational_end_forces(global_end_displacements, deformations, end_forces, **arrays) -> tuple
+            Computes the corotational end forces and tangent stiffness matrices of many truss elements at once.
         """
+    __slots__ = ()
+
+    _elongation = np.array([-1., 0., 1., 0.])
 
     @property
     def stiffness_matrix_dofs(self) -> list[DegreeOfFreedom]:
@@ -156,3 +182,135 @@ class TrussElement(UniDimensionalElement):
                          [0, 1, 0, -1],
                          [-1, 0, 1, 0],
                          [0, -1, 0, 1]])
+
+    @classmethod
+    def batch_axial_forces(cls, end_forces: np.ndarray) -> np.ndarray:
+        """
+        Extracts the axial forces from stacked local end forces.
+
+        Parameters
+        ----------
+        end_forces : np.ndarray
+            Local end forces of shape (n_elements, 4).
+
+        Returns
+        -------
+        np.ndarray
+            The axial force at the end node of each element, tension positive.
+        """
+        return end_forces[:, 2]
+
+    @classmethod
+    def batch_first_order_elastic_stiffness_matrices(cls, lengths: np.ndarray, areas: np.ndarray,
+                                                     elasticity_moduli: np.ndarray):
+        """
+        Computes the local first-order elastic stiffness matrices of many truss elements at once.
+
+        Parameters
+        ----------
+        lengths : np.ndarray
+            Length of each element.
+        areas : np.ndarray
+            Cross-sectional area of each element.
+        elasticity_moduli : np.ndarray
+            Elasticity modulus of each element.
+
+        Returns
+        -------
+        np.ndarray
+            Elastic stiffness matrices of shape (n_elements, 4, 4).
+        """
+        return (elasticity_moduli * areas / lengths)[:, None, None] * _AXIAL
+
+    @classmethod
+    def batch_geometric_stiffness_matrices(cls, lengths: np.ndarray, axial_forces: np.ndarray):
+        """
+        Computes the local geometric stiffness matrices of many truss elements at once.
+
+        Parameters
+        ----------
+        lengths : np.ndarray
+            Length of each element.
+        axial_forces : np.ndarray
+            Axial force of each element, tension positive.
+
+        Returns
+        -------
+        np.ndarray
+            Geometric stiffness matrices of shape (n_elements, 4, 4).
+        """
+        return (axial_forces / lengths)[:, None, None] * (_AXIAL + _TRANSVERSE)
+
+    @classmethod
+    def batch_transformation_matrices(cls, cosines: np.ndarray, sines: np.ndarray):
+        """
+        Computes the transformation matrices of many truss elements at once.
+
+        Parameters
+        ----------
+        cosines : np.ndarray
+            Cosine of the angle between each element and the global x-axis.
+        sines : np.ndarray
+            Sine of the angle between each element and the global x-axis.
+
+        Returns
+        -------
+        np.ndarray
+            Transformation matrices of shape (n_elements, 4, 4).
+        """
+        return cosines[:, None, None] * _COSINE + sines[:, None, None] * _SINE
+
+    @classmethod
+    def batch_corotational_end_forces(cls, global_end_displacements: np.ndarray, deformations: np.ndarray = None,
+                                      end_forces: np.ndarray = None, *, lengths: np.ndarray, cosines: np.ndarray,
+                                      sines: np.ndarray, areas: np.ndarray, elasticity_moduli: np.ndarray,
+                                      **arrays) -> tuple:
+        """
+        Computes the corotational end forces and tangent stiffness matrices of many truss elements at once.
+
+        The axial force N = EA·u/L follows from the elongation u of the chord. The global end forces
+        and their exact derivative are
+
+            f = N·r
+            K_t = EA/L·r·rᵀ + N/l·z·zᵀ
+
+        where l is the current length and r and z are the unit vectors along and across the chord
+        expanded to the end degrees of freedom.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Total global end displacements of shape (n_elements, 4).
+        deformations : np.ndarray, optional
+            Buffer of shape (n_elements, 4) that receives the elongation at the end node.
+        end_forces : np.ndarray, optional
+            Buffer of shape (n_elements, 4) that receives the local end forces.
+        lengths, cosines, sines : np.ndarray
+            Initial geometry of the elements, as returned by `batch_geometry`.
+        areas, elasticity_moduli : np.ndarray
+            Element properties, as returned by `batch_properties`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Local end forces in the corotated frame and global end forces, of shape
+            (n_elements, 4), and global tangent stiffness matrices of shape (n_elements, 4, 4).
+        """
+        u = global_end_displacements
+        current_lengths, c, s, elongations, _ = cls.batch_corotated_geometry(u[:, 0:2], u[:, 2:4], lengths,
+                                                                              cosines, sines)
+        axial_stiffnesses = elasticity_moduli * areas / lengths
+        axial_forces = axial_stiffnesses * elongations
+        if deformations is None:
+            deformations = np.empty(u.shape)
+        deformations[...] = 0
+        deformations[:, 2] = elongations
+        if end_forces is None:
+            end_forces = np.empty(u.shape)
+        end_forces[...] = 0
+        end_forces[:, 0], end_forces[:, 2] = -axial_forces, axial_forces
+        r = np.stack([-c, -s, c, s], axis=1)
+        z = np.stack([s, -c, -s, c], axis=1)
+        tangents = (axial_stiffnesses[:, None, None] * r[:, :, None] * r[:, None, :]
+                    + (axial_forces / current_lengths)[:, None, None] * z[:, :, None] * z[:, None, :])
+        return end_forces, axial_forces[:, None] * r, tangents
@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+
+import numpy as np
+
 from stablex.elements.element import Element
 from stablex.node import Node
 from stablex.section import Section
@@ -41,6 +44,12 @@ class UniDimensionalElement(Element, ABC):
         Abstract method to define degrees of freedom for the element's stiffness matrix.
     get_local_displacement(x)
         Calculates the local displacement at a given x-coordinate based on the shape function.
+    batch_global_stiffness_matrices(lengths, cosines, sines, axial_forces, include_elastic, **properties)
+        Computes the global stiffness matrices of many elements of the same type at once.
+    batch_second_order_end_forces(global_end_displacements, geometric_nonlinearity, **arrays) -> tuple
+        Computes the end forces and tangent stiffness matrices of many elements from their total displacements.
+    batch_corotated_geometry(start_displacements, end_displacements, lengths, cosines, sines) -> tuple
+        Computes the current geometry, elongation and rigid body rotation of many elements.
 
     Notes
     -----
@@ -48,6 +57,10 @@ class UniDimensionalElement(Element, ABC):
     to unidimensional elements.
 
     """
+    __slots__ = ("_section", "elasticity_modulus")
+
+    # Local end displacements of a unit elongation, set by subclasses.
+    _elongation = None
 
     def __init__(self, start_node: Node, end_node: Node, section: Section, include_geom_nonlinearity=False, elasticity_modulus=200000):
         """
@@ -153,3 +166,254 @@ class UniDimensionalElement(Element, ABC):
     def get_local_displacement(self, x):
         """Defines the degrees of freedom for the element's stiffness matrix."""
         return self.shape_function(x).dot(self.local_end_displacements())
+
+    @classmethod
+    def batch_geometry(cls, start_coordinates: np.ndarray, end_coordinates: np.ndarray) -> dict:
+        """
+        Computes the lengths and direction cosines of many elements from their end node coordinates.
+
+        Parameters
+        ----------
+        start_coordinates : np.ndarray
+            Coordinates of the start node of each element, of shape (n_elements, 2).
+        end_coordinates : np.ndarray
+            Coordinates of the end node of each element, of shape (n_elements, 2).
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            The `lengths`, `cosines` and `sines` of the elements.
+        """
+        dx = end_coordinates[:, 0] - start_coordinates[:, 0]
+        dy = end_coordinates[:, 1] - start_coordinates[:, 1]
+        lengths = np.hypot(dx, dy)
+        return {"lengths": lengths, "cosines": dx / lengths, "sines": dy / lengths}
+
+    @classmethod
+    def batch_properties(cls, elements: list) -> dict:
+        """
+        Gathers the areas and elasticity moduli of the elements.
+
+        Parameters
+        ----------
+        elements : list of UniDimensionalElement
+            Elements of this type.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            The `areas` and `elasticity_moduli` of the elements.
+        """
+        return {"areas": np.array([element.section.area for element in elements], dtype=float),
+                "elasticity_moduli": np.array([element.elasticity_modulus for element in elements], dtype=float)}
+
+    @classmethod
+    def has_batch_kernels(cls) -> bool:
+        """
+        Whether the element type evaluates its elements with batch kernels of its own.
+
+        The kernels of this class are built on three local kernels that subclasses implement:
+        `batch_first_order_elastic_stiffness_matrices(lengths, **properties)`,
+        `batch_geometric_stiffness_matrices(lengths, axial_forces)` and
+        `batch_transformation_matrices(cosines, sines)`. Without them the elements are evaluated
+        from their own matrices, see `Element.batch_element_matrices`.
+
+        Returns
+        -------
+        bool
+            True if the type implements the three local kernels.
+        """
+        return all(hasattr(cls, name) for name in ("batch_first_order_elastic_stiffness_matrices",
+                                                   "batch_geometric_stiffness_matrices",
+                                                   "batch_transformation_matrices"))
+
+    @classmethod
+    def batch_global_stiffness_matrices(cls, lengths: np.ndarray, cosines: np.ndarray, sines: np.ndarray,
+                                        axial_forces: np.ndarray = None, include_elastic=True,
+                                        **properties) -> np.ndarray:
+        """
+        Computes the global stiffness matrices of many elements of this type at once.
+
+        Parameters
+        ----------
+        lengths : np.ndarray
+            Length of each element.
+        cosines : np.ndarray
+            Cosine of the angle between each element and the global x-axis.
+        sines : np.ndarray
+            Sine of the angle between each element and the global x-axis.
+        axial_forces : np.ndarray, optional
+            Axial force of each element, tension positive. The geometric stiffness is added only if given.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+        **properties : np.ndarray
+            Section and material properties consumed by `batch_first_order_elastic_stiffness_matrices`.
+
+        Returns
+        -------
+        np.ndarray
+            Global stiffness matrices of shape (n_elements, n_dofs, n_dofs).
+        """
+        transformation_matrices = cls.batch_transformation_matrices(cosines, sines)
+        if include_elastic:
+            stiffness_matrices = cls.batch_first_order_elastic_stiffness_matrices(lengths, **properties)
+        else:
+            stiffness_matrices = np.zeros_like(transformation_matrices)
+        if axial_forces is not None:
+            stiffness_matrices = stiffness_matrices + cls.batch_geometric_stiffness_matrices(lengths, axial_forces)
+        return np.swapaxes(transformation_matrices, 1, 2) @ stiffness_matrices @ transformation_matrices
+
+    @classmethod
+    def batch_global_end_forces(cls, local_end_forces: np.ndarray, cosines: np.ndarray, sines: np.ndarray,
+                                **arrays) -> np.ndarray:
+        """
+        Transforms stacked local end forces to the global coordinate system.
+
+        Parameters
+        ----------
+        local_end_forces : np.ndarray
+            Local end forces of shape (n_elements, n_dofs).
+        cosines : np.ndarray
+            Cosine of the angle between each element and the global x-axis.
+        sines : np.ndarray
+            Sine of the angle between each element and the global x-axis.
+        **arrays : np.ndarray
+            Remaining element arrays, ignored.
+
+        Returns
+        -------
+        np.ndarray
+            Global end forces of shape (n_elements, n_dofs).
+        """
+        return np.einsum("nji,nj->ni", cls.batch_transformation_matrices(cosines, sines), local_end_forces)
+
+    @classmethod
+    def batch_local_end_forces(cls, global_end_displacements: np.ndarray, lengths: np.ndarray, cosines: np.ndarray,
+                               sines: np.ndarray, axial_forces: np.ndarray = None, include_elastic=True,
+                               **properties) -> np.ndarray:
+        """
+        Computes the local end forces of many elements of this type at once.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Global end displacements of shape (n_elements, n_dofs).
+        lengths : np.ndarray
+            Length of each element.
+        cosines : np.ndarray
+            Cosine of the angle between each element and the global x-axis.
+        sines : np.ndarray
+            Sine of the angle between each element and the global x-axis.
+        axial_forces : np.ndarray, optional
+            Axial force of each element, tension positive. The geometric stiffness is included only if given.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+        **properties : np.ndarray
+            Section and material properties consumed by `batch_first_order_elastic_stiffness_matrices`.
+
+        Returns
+        -------
+        np.ndarray
+            Local end forces of shape (n_elements, n_dofs).
+        """
+        local_end_displacements = np.einsum("nij,nj->ni", cls.batch_transformation_matrices(cosines, sines),
+                                            global_end_displacements)
+        if include_elastic:
+            stiffness_matrices = cls.batch_first_order_elastic_stiffness_matrices(lengths, **properties)
+        else:
+            stiffness_matrices = np.zeros(local_end_displacements.shape + local_end_displacements.shape[-1:])
+        if axial_forces is not None:
+            stiffness_matrices = stiffness_matrices + cls.batch_geometric_stiffness_matrices(lengths, axial_forces)
+        return np.einsum("nij,nj->ni", stiffness_matrices, local_end_displacements)
+
+    @classmethod
+    def batch_second_order_end_forces(cls, global_end_displacements: np.ndarray,
+                                      geometric_nonlinearity: np.ndarray = None, *, lengths: np.ndarray,
+                                      cosines: np.ndarray, sines: np.ndarray, **properties) -> tuple:
+        """
+        Computes the end forces and tangent stiffness matrices of many elements from their total
+        end displacements, including the second-order effect of the axial force.
+
+        The axial strain is the average Green-Lagrange strain of the element in its initial
+        configuration,
+
+            ε = a·d + dᵀ·G·d / (2L)
+
+        where d are the local end displacements, a·d is the elongation divided by the length and
+        G is the geometric stiffness matrix for a unit axial force. With the axial force N = EA·ε,
+        the end forces and their exact derivative are
+
+            f = K_b·d + N·(L·a + G·d)
+            K_t = K_b + EA·L·b·bᵀ + N·G,   b = a + G·d / L
+
+        where K_b is the first-order elastic stiffness without its axial part. Both reduce to the
+        first-order elastic ones for elements without geometric nonlinearity, and K_t equals the
+        elastic plus geometric stiffness of the current axial force to first order.
+
+        Parameters
+        ----------
+        global_end_displacements : np.ndarray
+            Total global end displacements of shape (n_elements, n_dofs).
+        geometric_nonlinearity : np.ndarray, optional
+            Whether each element includes geometric nonlinearity. All elements do by default.
+        lengths, cosines, sines : np.ndarray
+            Initial geometry of the elements, as returned by `batch_geometry`.
+        **properties : np.ndarray
+            Section and material properties consumed by `batch_first_order_elastic_stiffness_matrices`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Local end forces of shape (n_elements, n_dofs) and global tangent stiffness matrices of
+            shape (n_elements, n_dofs, n_dofs).
+        """
+        if geometric_nonlinearity is None:
+            geometric_nonlinearity = np.ones(len(lengths), dtype=bool)
+        transformation_matrices = cls.batch_transformation_matrices(cosines, sines)
+        d = np.einsum("nij,nj->ni", transformation_matrices, global_end_displacements)
+        l = lengths[:, None]
+        axial_rigidities = properties["elasticity_moduli"] * properties["areas"]
+        a = cls._elongation / l
+        elastic = cls.batch_first_order_elastic_stiffness_matrices(lengths, **properties)
+        bending = elastic - (axial_rigidities * lengths)[:, None, None] * a[:, :, None] * a[:, None, :]
+        g = cls.batch_geometric_stiffness_matrices(lengths, geometric_nonlinearity.astype(float))
+        gd = np.einsum("nij,nj->ni", g, d)
+        strains = np.sum(a * d, axis=1) + np.sum(d * gd, axis=1) / (2 * lengths)
+        axial_forces = axial_rigidities * strains
+        end_forces = np.einsum("nij,nj->ni", bending, d) + axial_forces[:, None] * (l * a + gd)
+        b = a + gd / l
+        tangents = (bending + (axial_rigidities * lengths)[:, None, None] * b[:, :, None] * b[:, None, :]
+                    + axial_forces[:, None, None] * g)
+        return end_forces, np.swapaxes(transformation_matrices, 1, 2) @ tangents @ transformation_matrices
+
+    @classmethod
+    def batch_corotated_geometry(cls, start_displacements: np.ndarray, end_displacements: np.ndarray,
+                                 lengths: np.ndarray, cosines: np.ndarray, sines: np.ndarray) -> tuple:
+        """
+        Computes the current geometry, elongation and rigid body rotation of many elements.
+
+        Parameters
+        ----------
+        start_displacements : np.ndarray
+            Global x and y displacements of the start node of each element, of shape (n_elements, 2).
+        end_displacements : np.ndarray
+            Global x and y displacements of the end node of each element, of shape (n_elements, 2).
+        lengths, cosines, sines : np.ndarray
+            Initial geometry of the elements, as returned by `batch_geometry`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Current lengths, cosines and sines, the elongations and the rotations of the chords
+            from their initial direction, in (-π, π].
+        """
+        dx = lengths * cosines + end_displacements[:, 0] - start_displacements[:, 0]
+        dy = lengths * sines + end_displacements[:, 1] - start_displacements[:, 1]
+        current_lengths = np.hypot(dx, dy)
+        current_cosines = dx / current_lengths
+        current_sines = dy / current_lengths
+        # Written as a quotient so that small elongations of long elements keep their precision.
+        elongations = (dx ** 2 + dy ** 2 - lengths ** 2) / (current_lengths + lengths)
+        rotations = np.arctan2(cosines * current_sines - sines * current_cosines,
+                               cosines * current_cosines + sines * current_sines)
+        return current_lengths, current_cosines, current_sines, elongations, rotations
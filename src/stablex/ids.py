@@ -0,0 +1,150 @@
+"""
+Allocation of the ids of nodes, degrees of freedom and elements.
+
+Every model object takes its id from the `ModelIds` of the current context when it is created.
+Outside a `model_scope` that is one set of allocators shared by the process, so ids are unique
+across all models, as before. Inside a scope the objects are numbered from 1 by allocators of
+their own, independent of any other scope or thread, so a model generated in a scope is numbered
+the same way however many models are generated concurrently.
+
+The allocators also hold the `TopologyRevision` of the objects they number, so a restraint or
+coupling change in one scope only invalidates the degree of freedom maps of that scope.
+
+Examples
+--------
+>>> with model_scope():
+...     first, second = Node(0, 0), Node(0, 1000)
+>>> first.id, second.id
+(1, 2)
+"""
+import contextlib
+import contextvars
+import threading
+
+
+class IdAllocator:
+    """
+    Thread-safe source of consecutive ids.
+
+    Parameters
+    ----------
+    start : int, optional
+        The first id (default is 1).
+    """
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    @property
+    def next_id(self) -> int:
+        """The id that the next call of `allocate` returns."""
+        return self._next
+
+    def allocate(self) -> int:
+        """
+        Returns the next id.
+
+        Returns
+        -------
+        int
+            An id that this allocator has not returned before.
+        """
+        with self._lock:
+            value = self._next
+            self._next += 1
+        return value
+
+
+class TopologyRevision:
+    """
+    Thread-safe counter of the restraint, coupling and connectivity changes of a model.
+
+    Nodes, degrees of freedom and elements keep the revision of the scope they were created in and
+    bump it from their setters. A `DofMap` is current while the revisions of its objects are unchanged.
+
+    Attributes
+    ----------
+    value : int
+        Number of changes so far.
+    """
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """Records a change."""
+        with self._lock:
+            self.value += 1
+
+    def __getstate__(self):
+        return {"value": self.value}
+
+    def __setstate__(self, state):
+        self.value = state["value"]
+        self._lock = threading.Lock()
+
+
+class ModelIds:
+    """
+    Id allocators of the nodes, degrees of freedom and elements of a model.
+
+    Attributes
+    ----------
+    nodes : IdAllocator
+        Allocator of the node ids.
+    dofs : IdAllocator
+        Allocator of the degree of freedom ids.
+    elements : IdAllocator
+        Allocator of the element ids.
+    topology : TopologyRevision
+        Revision of the connectivity of the objects numbered by these allocators.
+    """
+    def __init__(self):
+        self.nodes = IdAllocator()
+        self.dofs = IdAllocator()
+        self.elements = IdAllocator()
+        self.topology = TopologyRevision()
+
+
+_PROCESS_IDS = ModelIds()
+_current_ids = contextvars.ContextVar("stablex_model_ids", default=_PROCESS_IDS)
+
+
+def current_ids() -> ModelIds:
+    """
+    Returns the allocators that number the model objects created in the current context.
+
+    Returns
+    -------
+    ModelIds
+        The allocators of the innermost active `model_scope`, or those shared by the process.
+    """
+    return _current_ids.get()
+
+
+@contextlib.contextmanager
+def model_scope(ids: ModelIds = None):
+    """
+    Numbers the nodes, degrees of freedom and elements created in a block with allocators of their own.
+
+    The scope only applies to the current thread (or asyncio task), so threads that each build a
+    model in a scope get the same ids as if they had run one after the other. Objects of different
+    scopes may share ids and should not be combined in one structure.
+
+    Parameters
+    ----------
+    ids : ModelIds, optional
+        The allocators to use, for example to add objects to a model built in an earlier scope.
+        Defaults to new allocators that start at 1.
+
+    Yields
+    ------
+    ModelIds
+        The allocators of the scope.
+    """
+    ids = ModelIds() if ids is None else ids
+    token = _current_ids.set(ids)
+    try:
+        yield ids
+    finally:
+        _current_ids.reset(token)
@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class Load(ABC):
     """
     Abstract base class for representing loads in the structural analysis model.
 
-    .. note::
-        This class is not yet used in this release but is planned for future development
-        to represent various types of loads applied to elements or nodes.
+    Loads are grouped into load cases (see `LoadCase`) and assembled into force vectors without
+    changing the degrees of freedom they act on.
 
     Parameters
     ----------
@@ -30,3 +31,16 @@ class Load(ABC):
     def magnitude(self, value):
         self._magnitude = value
 
+    @abstractmethod
+    def add_to(self, force_vector: np.ndarray, index: dict):
+        """
+        Adds the load to a global force vector.
+
+        Parameters
+        ----------
+        force_vector : np.ndarray
+            Force vector in equation order, updated in place.
+        index : dict
+            Maps each degree of freedom of the structure to its equation number.
+        """
+        pass
@@ -0,0 +1,61 @@
+import numpy as np
+
+from stablex.loads.load import Load
+
+
+class LoadCase:
+    """
+    A named group of loads that are analyzed together.
+
+    Parameters
+    ----------
+    name : str
+        Name of the load case.
+    loads : list of Load, optional
+        Loads of the load case.
+
+    Attributes
+    ----------
+    name : str
+        Name of the load case.
+    loads : list of Load
+        Loads of the load case.
+    """
+    def __init__(self, name: str, loads: list[Load] = None):
+        self.name = name
+        self.loads = [] if loads is None else list(loads)
+
+    def add(self, load: Load):
+        """
+        Adds a load to the load case.
+
+        Parameters
+        ----------
+        load : Load
+            The load to add.
+        """
+        self.loads.append(load)
+
+    def force_vector(self, index: dict, size: int) -> np.ndarray:
+        """
+        Assembles the force vector of the load case.
+
+        Parameters
+        ----------
+        index : dict
+            Maps each degree of freedom of the structure to its equation number.
+        size : int
+            Number of degrees of freedom of the structure.
+
+        Returns
+        -------
+        np.ndarray
+            Forces in equation order.
+        """
+        force_vector = np.zeros(size)
+        for load in self.loads:
+            load.add_to(force_vector, index)
+        return force_vector
+
+    def __repr__(self):
+        return f"LoadCase({self.name!r}, {len(self.loads)} loads)"
@@ -0,0 +1,31 @@
+import numpy as np
+
+from stablex.degree_of_freedom import DegreeOfFreedom
+from stablex.loads.load import Load
+
+
+class NodalLoad(Load):
+    """
+    A concentrated force or moment acting in the direction of a node's degree of freedom.
+
+    Parameters
+    ----------
+    dof : DegreeOfFreedom
+        The degree of freedom the load acts in the direction of, e.g. `node.y_dof`.
+    magnitude : float
+        The magnitude of the load.
+
+    Attributes
+    ----------
+    dof : DegreeOfFreedom
+        The degree of freedom the load acts in the direction of.
+    """
+    def __init__(self, dof: DegreeOfFreedom, magnitude: float):
+        super().__init__(magnitude)
+        self.dof = dof
+
+    def add_to(self, force_vector: np.ndarray, index: dict):
+        try:
+            force_vector[index[self.dof]] += self.magnitude
+        except KeyError:
+            raise ValueError(f"The degree of freedom {self.dof.id} of the load is not part of the structure.") from None
@@ -1,4 +1,5 @@
 from stablex.degree_of_freedom import DegreeOfFreedom
+from stablex.ids import current_ids
 
 
 class Node:
@@ -17,7 +18,7 @@ class Node:
      Attributes
      ----------
      id : int
-         Unique identifier for the node.
+         Unique identifier for the node, allocated by the current `model_scope` (see `stablex.ids`).
      x : float
          The x-coordinate of the node.
      y : float
@@ -35,8 +36,11 @@ class Node:
          Returns a string representation of the node in the format:
          "Node {id} at <x={x}, y={y}>".
 
+     Notes
+     -----
+     Instances have no `__dict__`; their attributes live in slots to keep large models compact.
      """
-    id_counter = 1
+    __slots__ = ("id", "_topology", "x", "y", "_x_original", "_y_original", "_x_dof", "_y_dof", "_rz_dof")
 
     def __init__(self, x, y):
         """
@@ -54,7 +58,9 @@ class Node:
         Creates three degrees of freedom: two translational (x_dof and y_dof)
         and one rotational (rz_dof).
         """
-        self.id = Node.id_counter
+        ids = current_ids()
+        self.id = ids.nodes.allocate()
+        self._topology = ids.topology
         self.x = x
         self.y = y
         self._x_original = x
@@ -62,7 +68,45 @@ class Node:
         self.x_dof = DegreeOfFreedom()
         self.y_dof = DegreeOfFreedom()
         self.rz_dof = DegreeOfFreedom()
-        Node.id_counter += 1
+
+    @property
+    def x_dof(self) -> DegreeOfFreedom:
+        """
+        Gets and sets the translational degree of freedom in the x-direction.
+        Assigning another node's degree of freedom couples the two nodes in that direction.
+        """
+        return self._x_dof
+
+    @x_dof.setter
+    def x_dof(self, dof: DegreeOfFreedom):
+        self._x_dof = dof
+        self._topology.bump()
+
+    @property
+    def y_dof(self) -> DegreeOfFreedom:
+        """
+        Gets and sets the translational degree of freedom in the y-direction.
+        Assigning another node's degree of freedom couples the two nodes in that direction.
+        """
+        return self._y_dof
+
+    @y_dof.setter
+    def y_dof(self, dof: DegreeOfFreedom):
+        self._y_dof = dof
+        self._topology.bump()
+
+    @property
+    def rz_dof(self) -> DegreeOfFreedom:
+        """
+        Gets and sets the rotational degree of freedom about the z-axis.
+        Assigning another node's degree of freedom couples the two nodes in that direction.
+        """
+        return self._rz_dof
+
+    @rz_dof.setter
+    def rz_dof(self, dof: DegreeOfFreedom):
+        self._rz_dof = dof
+        self._topology.bump()
 
     @property
     def coordinates(self) -> tuple:
@@ -0,0 +1,347 @@
+"""
+Section sizing for a target critical load factor.
+
+`SectionSizing` scales the sections of a structure to the least material volume whose lowest
+buckling load factor reaches a target. Each design group is one section object shared by its
+elements. Its design variable is the scale s of the area, A = s·A₀, with the moment of inertia
+following as I = s^exponent·I₀: 2 for sections scaled uniformly in both directions, 3 for
+sections deepened at constant width, 1 for sections widened at constant depth.
+
+Every iteration is one buckling analysis with the adjoint sensitivities of
+`EigenSolver.sensitivities`, started from the modes of the previous design. The lowest load
+factors are aggregated with the Kreisselmeier-Steinhauser function
+
+    λ_KS = λ₁ - ln Σ exp(-ρ·(λᵢ - λ₁)/λ*) · λ*/ρ,
+
+a smooth lower bound of λ₁. The derivative of a repeated load factor depends on the direction of
+the design change, but λ_KS weighs the modes of a cluster equally, so its gradient is well defined
+wherever the modes cross. The design is updated with the optimality criteria method: each scale
+is multiplied by the square root of the ratio of its load factor gradient to its volume, times a
+Lagrange multiplier, within move limits, and the multiplier is found by bisection so that λ₁,
+extrapolated along the gradient of λ_KS, meets the target. The move limit of a group shrinks
+whenever its scale reverses direction, which damps the oscillation between groups that take turns
+being critical.
+
+Examples
+--------
+>>> sizing = SectionSizing(structure, target_load_factor=2.5)
+>>> result = sizing.run()
+>>> result.converged, result.load_factors[0]
+(True, 2.5004)
+>>> result.apply()
+"""
+import numpy as np
+
+from stablex.elements.unidimensional_elements.unidimensional_element import UniDimensionalElement
+from stablex.section import Rectangle, Section, UserDefinedSection
+from stablex.solver.eigen_solver import EigenSolver
+from stablex.structure import Structure
+
+
+class SizingResult:
+    """
+    Sized sections returned by `SectionSizing.run`.
+
+    Parameters
+    ----------
+    sizing : SectionSizing
+        The sizing problem.
+    scales : np.ndarray
+        Area scale of each design group.
+    load_factors : np.ndarray
+        Lowest load factors of the sized structure.
+    gradients : np.ndarray
+        Derivatives of the lowest load factors with respect to the scales, of shape (n_modes, n_groups).
+    history : list of tuple
+        Material volume and lowest load factor of each analyzed design.
+    converged : bool
+        Whether the design converged within the iteration limit.
+
+    Attributes
+    ----------
+    sections : list of Section
+        The sections of the design groups.
+    scales : np.ndarray
+        Area scale of each design group.
+    areas : np.ndarray
+        Sized area of each design group.
+    inertias : np.ndarray
+        Sized moment of inertia of each design group.
+    volume : float
+        Material volume of the sized structure.
+    load_factors : np.ndarray
+        Lowest load factors of the sized structure, in ascending order.
+    gradients : np.ndarray
+        Derivatives of the lowest load factors with respect to the scales, of shape (n_modes, n_groups).
+    volume_gradients : np.ndarray
+        Derivative of the material volume with respect to the scale of each design group.
+    history : list of tuple
+        Material volume and lowest load factor of each analyzed design.
+    analysis_count : int
+        Number of buckling analyses.
+    converged : bool
+        Whether the design converged within the iteration limit.
+    """
+    def __init__(self, sizing: "SectionSizing", scales: np.ndarray, load_factors: np.ndarray, gradients: np.ndarray,
+                 history: list, converged: bool):
+        self.sections = sizing.sections
+        self.exponent = sizing.exponent
+        self.scales = scales
+        self.areas = sizing.areas(scales)
+        self.inertias = sizing.inertias(scales)
+        self.volume = sizing.volume(scales)
+        self.load_factors = load_factors
+        self.gradients = gradients
+        self.volume_gradients = sizing._group_volumes
+        self.history = history
+        self.analysis_count = len(history)
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"SizingResult(volume={self.volume:.6g}, load_factor={self.load_factors[0]:.6g}, "
+                f"analysis_count={self.analysis_count}, converged={self.converged})")
+
+    def apply(self):
+        """
+        Writes the sized areas and moments of inertia to the sections of the design groups.
+
+        A `UserDefinedSection` takes the area and inertia as they are. A `Rectangle` is scaled by
+        s^((3 - exponent)/2) in width and s^((exponent - 1)/2) in height, which gives the sized
+        area and inertia for exponents from 1 to 3.
+
+        Raises
+        ------
+        TypeError
+            If a design group has a section of another type, or a rectangle is sized with an
+            exponent outside 1 to 3.
+        """
+        for section, scale, area, inertia in zip(self.sections, self.scales, self.areas, self.inertias):
+            if isinstance(section, UserDefinedSection):
+                section.area, section.inertia = float(area), float(inertia)
+            elif isinstance(section, Rectangle) and 1 <= self.exponent <= 3:
+                section.width = section.width * scale ** ((3 - self.exponent) / 2)
+                section.height = section.height * scale ** ((self.exponent - 1) / 2)
+            else:
+                raise TypeError(f"Sections of type {type(section).__name__} cannot be resized with exponent "
+                                f"{self.exponent}.")
+
+
+class SectionSizing:
+    """
+    Minimizes the material volume of a structure subject to a target critical load factor.
+
+    Parameters
+    ----------
+    structure : Structure
+        The structure to size. It is not changed until `SizingResult.apply` is called.
+    target_load_factor : float
+        The lowest buckling load factor the sized structure must reach.
+    sections : list of Section, optional
+        The sections to size, one design group each. Defaults to every distinct section of the
+        structure's elements; the others keep their size.
+    exponent : float, optional
+        Exponent of the moment of inertia in the area scale, I = s^exponent·I₀ (default is 2).
+    bounds : tuple of float, optional
+        Smallest and largest area scale relative to the initial sections (default is (0.01, 100)).
+    modes : int, optional
+        Number of lowest load factors aggregated into the constraint (default is 3).
+    aggregation : float, optional
+        Aggregation parameter ρ of the Kreisselmeier-Steinhauser function. Larger values follow the
+        lowest load factor more closely and smaller ones share the gradient more evenly between
+        close load factors (default is 100).
+
+    Methods
+    -------
+    areas(scales) -> np.ndarray
+        Area of each design group.
+    inertias(scales) -> np.ndarray
+        Moment of inertia of each design group.
+    volume(scales) -> float
+        Material volume of a design.
+    run(max_iterations, tolerance, move_limit) -> SizingResult
+        Sizes the sections.
+    """
+    def __init__(self, structure: Structure, target_load_factor: float, sections: list = None, exponent: float = 2.,
+                 bounds: tuple = (0.01, 100.), modes: int = 3, aggregation: float = 100.):
+        if target_load_factor <= 0:
+            raise ValueError("The target load factor must be positive.")
+        self.structure = structure
+        self.model = structure.compile()
+        self.target_load_factor = float(target_load_factor)
+        self.exponent = float(exponent)
+        self.bounds = bounds
+        self.modes = modes
+        self.aggregation = aggregation
+
+        elements = structure.elements
+        if sections is None:
+            sections = list({id(element.section): element.section for element in elements
+                             if isinstance(element, UniDimensionalElement)}.values())
+        if not sections or not all(isinstance(section, Section) for section in sections):
+            raise ValueError("At least one section is needed as a design group.")
+        self.sections = list(sections)
+        group_of = {id(section): index for index, section in enumerate(self.sections)}
+        self._groups = np.array([group_of.get(id(element.section), -1) if isinstance(element, UniDimensionalElement)
+                                 else -1 for element in elements], dtype=np.intp)
+        missing = set(range(len(self.sections))) - set(self._groups.tolist())
+        if missing:
+            raise ValueError(f"The sections {sorted(missing)} are used by no element of the structure.")
+        self._positions = np.flatnonzero(self._groups >= 0)
+        self._initial_areas = np.array([section.area for section in self.sections], dtype=float)
+        self._initial_inertias = np.array([section.inertia for section in self.sections], dtype=float)
+
+        lengths = np.zeros(self.model.element_count)
+        has_inertia = np.zeros(self.model.element_count, dtype=bool)
+        for group in self.model.element_groups:
+            arrays = group.arrays(self.model.coordinates)
+            if "lengths" in arrays:
+                lengths[group.positions] = arrays["lengths"]
+            has_inertia[group.positions] = "inertias" in group.properties
+        self._inertia_positions = self._positions[has_inertia[self._positions]]
+        # Material volume of each group at the initial size, the derivative of the volume with respect to its scale.
+        self._group_volumes = np.bincount(self._groups[self._positions], weights=lengths[self._positions],
+                                          minlength=len(self.sections)) * self._initial_areas
+        fixed = np.setdiff1d(np.flatnonzero([isinstance(element, UniDimensionalElement) for element in elements]),
+                             self._positions)
+        self._fixed_volume = float(sum(elements[position].section.area * lengths[position] for position in fixed))
+
+    def areas(self, scales: np.ndarray) -> np.ndarray:
+        """
+        Computes the area of each design group.
+
+        Parameters
+        ----------
+        scales : np.ndarray
+            Area scale of each design group.
+
+        Returns
+        -------
+        np.ndarray
+            The areas.
+        """
+        return self._initial_areas * scales
+
+    def inertias(self, scales: np.ndarray) -> np.ndarray:
+        """
+        Computes the moment of inertia of each design group.
+
+        Parameters
+        ----------
+        scales : np.ndarray
+            Area scale of each design group.
+
+        Returns
+        -------
+        np.ndarray
+            The moments of inertia.
+        """
+        return self._initial_inertias * scales ** self.exponent
+
+    def volume(self, scales: np.ndarray) -> float:
+        """
+        Computes the material volume of all elements with a section.
+
+        Parameters
+        ----------
+        scales : np.ndarray
+            Area scale of each design group.
+
+        Returns
+        -------
+        float
+            The volume.
+        """
+        return self._fixed_volume + float(self._group_volumes @ scales)
+
+    def _analyze(self, scales: np.ndarray, initial_modes: np.ndarray = None) -> tuple:
+        """Returns the mode set of a design and the load factor gradients with respect to the scales."""
+        groups = self._groups[self._positions]
+        inertia_groups = self._groups[self._inertia_positions]
+        model = self.model.variant(properties={
+            "areas": (self._positions, self.areas(scales)[groups]),
+            "inertias": (self._inertia_positions, self.inertias(scales)[inertia_groups])})
+        mode_set, derivatives = EigenSolver(model).sensitivities(self.modes, initial_modes, return_modes=True)
+        if not len(mode_set):
+            raise ValueError("The structure has no buckling mode with a positive load factor.")
+        area_terms = derivatives["areas"][:, self._positions] * self._initial_areas[groups]
+        inertia_terms = (derivatives["inertias"][:, self._inertia_positions] * self.exponent
+                         * (self._initial_inertias * scales ** (self.exponent - 1))[inertia_groups])
+        gradients = np.zeros((len(mode_set), len(self.sections)))
+        for index in range(len(mode_set)):
+            gradients[index] = (np.bincount(groups, weights=area_terms[index], minlength=len(self.sections))
+                                + np.bincount(inertia_groups, weights=inertia_terms[index],
+                                              minlength=len(self.sections)))
+        return mode_set, gradients
+
+    def _aggregate_gradient(self, load_factors: np.ndarray, gradients: np.ndarray) -> np.ndarray:
+        """Returns the gradient of the Kreisselmeier-Steinhauser aggregate of the load factors over the target."""
+        ratios = load_factors / self.target_load_factor
+        weights = np.exp(-self.aggregation * (ratios - ratios[0]))
+        return (weights / weights.sum()) @ gradients / self.target_load_factor
+
+    def _update(self, scales: np.ndarray, ratio: float, gradient: np.ndarray, move_limits: np.ndarray) -> np.ndarray:
+        """Returns the optimality criteria update of the scales whose extrapolated load factor meets the target."""
+        lower = np.maximum(scales * (1 - move_limits), self.bounds[0])
+        upper = np.minimum(scales * (1 + move_limits), self.bounds[1])
+        efficiency = np.maximum(gradient, 0) / self._group_volumes
+        if not np.any(efficiency > 0):
+            raise ValueError("No design group raises the critical load factor.")
+
+        def trial(log_multiplier):
+            return np.clip(scales * np.sqrt(np.exp(log_multiplier) * efficiency), lower, upper)
+
+        def shortfall(log_multiplier):
+            return ratio + gradient @ (trial(log_multiplier) - scales) - 1
+
+        low = high = -np.log(np.mean(efficiency[efficiency > 0]))
+        while shortfall(low) > 0 and np.any(trial(low) > lower):
+            low -= 2.
+        while shortfall(high) < 0 and np.any(trial(high) < upper):
+            high += 2.
+        for _ in range(60):
+            middle = (low + high) / 2
+            low, high = (low, middle) if shortfall(middle) >= 0 else (middle, high)
+        return trial(high)
+
+    def run(self, max_iterations: int = 50, tolerance: float = 1e-3, move_limit: float = 0.2) -> SizingResult:
+        """
+        Sizes the sections.
+
+        Parameters
+        ----------
+        max_iterations : int, optional
+            Largest number of buckling analyses (default is 50).
+        tolerance : float, optional
+            The design has converged once no scale changes by more than this fraction and the
+            lowest load factor is within this fraction of the target (default is 1e-3).
+        move_limit : float, optional
+            Largest change of a scale per iteration, as a fraction of the scale (default is 0.2).
+
+        Returns
+        -------
+        SizingResult
+            The sized design.
+        """
+        scales = np.ones(len(self.sections))
+        move_limits = np.full(len(self.sections), move_limit)
+        previous_step = np.zeros(len(self.sections))
+        history = []
+        modes = None
+        converged = False
+        for _ in range(max_iterations):
+            mode_set, gradients = self._analyze(scales, modes)
+            modes = mode_set.modes
+            history.append((self.volume(scales), float(mode_set.load_factors[0])))
+            ratio = mode_set.load_factors[0] / self.target_load_factor
+            updated = self._update(scales, ratio, self._aggregate_gradient(mode_set.load_factors, gradients),
+                                   move_limits)
+            step = updated - scales
+            if np.max(np.abs(step) / scales) <= tolerance and abs(ratio - 1) <= tolerance:
+                converged = True
+                break
+            if len(history) == max_iterations:
+                break
+            reversed_steps = step * previous_step < 0
+            move_limits = np.where(reversed_steps, move_limits / 2, np.minimum(move_limits * 1.2, move_limit))
+            scales, previous_step = updated, step
+        return SizingResult(self, scales, mode_set.load_factors, gradients, history, converged)
@@ -0,0 +1,227 @@
+"""
+Binary model files.
+
+A structure is stored as an uncompressed `.npz` archive of flat arrays: the node coordinates, the
+degrees of freedom of each node with their restraints, forces and prescribed displacements, the
+sections, and the type, connectivity, section, elasticity modulus and spring stiffness of each
+element. Coupled nodes share a degree of freedom row, and elements that share a section object
+share a section row. Because the archive is not compressed, its arrays can be memory-mapped
+instead of read, see `load_arrays`.
+"""
+import os
+import struct
+import zipfile
+
+import numpy as np
+from numpy.lib import format
+
+from stablex.degree_of_freedom import DegreeOfFreedom
+from stablex.elements.spring_elements.rotational_spring_element import LinearRotationalSpringElement
+from stablex.elements.spring_elements.spring_element import SpringElement
+from stablex.elements.unidimensional_elements.frame_element import FrameElement
+from stablex.elements.unidimensional_elements.truss_element import TrussElement
+from stablex.elements.unidimensional_elements.unidimensional_element import UniDimensionalElement
+from stablex.node import Node
+from stablex.section import Rectangle, UserDefinedSection
+
+FORMAT_VERSION = 1
+ELEMENT_TYPES = {element_type.__name__: element_type
+                 for element_type in (FrameElement, TrussElement, LinearRotationalSpringElement)}
+SECTION_TYPES = {section_type.__name__: section_type for section_type in (Rectangle, UserDefinedSection)}
+_DOF_NAMES = ("x_dof", "y_dof", "rz_dof")
+
+
+def structure_arrays(elements: list) -> dict:
+    """
+    Gathers the arrays that describe a structure.
+
+    Parameters
+    ----------
+    elements : list of Element
+        Elements that define the structure.
+
+    Returns
+    -------
+    dict of str to np.ndarray
+        The arrays of the model file.
+
+    Raises
+    ------
+    ValueError
+        If an element type is not in `ELEMENT_TYPES`.
+    """
+    nodes = sorted({node for element in elements for node in element.nodes}, key=lambda node: node.id)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    dofs = sorted({getattr(node, name) for node in nodes for name in _DOF_NAMES}, key=lambda dof: dof.id)
+    dof_index = {dof: i for i, dof in enumerate(dofs)}
+    sections = {}
+    for element in elements:
+        if type(element).__name__ not in ELEMENT_TYPES:
+            raise ValueError(f"Elements of type {type(element).__name__} cannot be saved.")
+        if isinstance(element, UniDimensionalElement):
+            sections.setdefault(id(element.section), element.section)
+    section_index = {key: i for i, key in enumerate(sections)}
+    # Sections of other types are stored by their area and inertia.
+    section_types = [type(section).__name__ if type(section).__name__ in SECTION_TYPES else UserDefinedSection.__name__
+                     for section in sections.values()]
+    section_parameters = [(section.width, section.height) if isinstance(section, Rectangle)
+                          else (section.area, section.inertia) for section in sections.values()]
+    unidimensional = [isinstance(element, UniDimensionalElement) for element in elements]
+    return {
+        "format_version": np.array(FORMAT_VERSION),
+        "node_coordinates": np.array([node.coordinates for node in nodes], dtype=float).reshape(-1, 2),
+        "node_dofs": np.array([[dof_index[getattr(node, name)] for name in _DOF_NAMES] for node in nodes],
+                              dtype=np.intp).reshape(-1, 3),
+        "dof_restrained": np.array([dof.restrained for dof in dofs], dtype=bool),
+        "dof_forces": np.array([dof.force for dof in dofs], dtype=float),
+        "dof_displacements": np.array([dof.displacement for dof in dofs], dtype=float),
+        "section_types": np.array(section_types, dtype=str),
+        "section_parameters": np.array(section_parameters, dtype=float).reshape(-1, 2),
+        "element_types": np.array([type(element).__name__ for element in elements], dtype=str),
+        "element_nodes": np.array([(node_index[element.start_node], node_index[element.end_node])
+                                   for element in elements], dtype=np.intp).reshape(-1, 2),
+        "element_geometric_nonlinearity": np.array([bool(element.geometric_nonlinearity) for element in elements]),
+        "element_sections": np.array([section_index[id(element.section)] if is_unidimensional else -1
+                                      for element, is_unidimensional in zip(elements, unidimensional)],
+                                     dtype=np.intp),
+        "element_elasticity_moduli": np.array([element.elasticity_modulus if is_unidimensional else np.nan
+                                               for element, is_unidimensional in zip(elements, unidimensional)],
+                                              dtype=float),
+        "element_rotational_stiffnesses": np.array([element.rotational_stiffness
+                                                    if isinstance(element, SpringElement) else np.nan
+                                                    for element in elements], dtype=float),
+    }
+
+
+def structure_elements(arrays: dict) -> list:
+    """
+    Creates the nodes, degrees of freedom, sections and elements described by the arrays of a model file.
+
+    Nodes and degrees of freedom are created in the order in which they were numbered when the file
+    was saved, so the loaded structure numbers its equations the same way.
+
+    Parameters
+    ----------
+    arrays : dict of str to np.ndarray
+        The arrays of the model file, as returned by `structure_arrays` or `load_arrays`.
+
+    Returns
+    -------
+    list of Element
+        Elements that define the structure.
+
+    Raises
+    ------
+    ValueError
+        If the file was written in a newer format or names an unknown element or section type.
+    """
+    if int(arrays["format_version"]) > FORMAT_VERSION:
+        raise ValueError(f"Model file format {int(arrays['format_version'])} is newer than the supported "
+                         f"format {FORMAT_VERSION}.")
+    nodes = [Node(x, y) for x, y in np.asarray(arrays["node_coordinates"]).tolist()]
+    node_dofs = np.asarray(arrays["node_dofs"])
+    dof_count = len(arrays["dof_restrained"])
+    dof_indices, owners = np.unique(node_dofs.ravel(), return_index=True)
+    if len(dof_indices) != dof_count:
+        raise ValueError("The model file has degrees of freedom that belong to no node.")
+    if np.all(np.diff(owners) > 0):
+        # The degree of freedom of the first node slot that holds it keeps its numbering order.
+        dofs = [getattr(nodes[owner // 3], _DOF_NAMES[owner % 3]) for owner in owners.tolist()]
+    else:
+        dofs = [DegreeOfFreedom() for _ in range(dof_count)]
+    for position, index in enumerate(node_dofs.ravel().tolist()):
+        node, name = nodes[position // 3], _DOF_NAMES[position % 3]
+        if getattr(node, name) is not dofs[index]:
+            setattr(node, name, dofs[index])
+    for dof, restrained, force, displacement in zip(dofs, np.asarray(arrays["dof_restrained"]).tolist(),
+                                                    np.asarray(arrays["dof_forces"]).tolist(),
+                                                    np.asarray(arrays["dof_displacements"]).tolist()):
+        if restrained:
+            dof.restrained = True
+        if force:
+            dof.force = force
+        if displacement:
+            dof.displacement = displacement
+
+    sections = []
+    for section_type, parameters in zip(np.asarray(arrays["section_types"]).tolist(),
+                                        np.asarray(arrays["section_parameters"]).tolist()):
+        if section_type not in SECTION_TYPES:
+            raise ValueError(f"Unknown section type '{section_type}' in the model file.")
+        sections.append(SECTION_TYPES[section_type](*parameters))
+
+    elements = []
+    for element_type, (start, end), geometric_nonlinearity, section, elasticity_modulus, rotational_stiffness in zip(
+            np.asarray(arrays["element_types"]).tolist(), np.asarray(arrays["element_nodes"]).tolist(),
+            np.asarray(arrays["element_geometric_nonlinearity"]).tolist(),
+            np.asarray(arrays["element_sections"]).tolist(), np.asarray(arrays["element_elasticity_moduli"]).tolist(),
+            np.asarray(arrays["element_rotational_stiffnesses"]).tolist()):
+        if element_type not in ELEMENT_TYPES:
+            raise ValueError(f"Unknown element type '{element_type}' in the model file.")
+        element_type = ELEMENT_TYPES[element_type]
+        if issubclass(element_type, UniDimensionalElement):
+            element = element_type(nodes[start], nodes[end], sections[section], geometric_nonlinearity,
+                                   elasticity_modulus)
+        else:
+            element = element_type(nodes[start], nodes[end], rotational_stiffness)
+            element.geometric_nonlinearity = geometric_nonlinearity
+        elements.append(element)
+    return elements
+
+
+def save_arrays(path, arrays: dict):
+    """
+    Writes arrays to an uncompressed `.npz` archive.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The archive. It is written as given, without appending an extension.
+    arrays : dict of str to np.ndarray
+        The arrays to write.
+    """
+    with open(path, "wb") as file:
+        np.savez(file, **arrays)
+
+
+def load_arrays(path, mmap_mode: str = None) -> dict:
+    """
+    Reads the arrays of an uncompressed `.npz` archive.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The archive.
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional
+        If given, the arrays are memory-mapped from the archive with this mode, as for `np.load`,
+        instead of read into memory. Empty and zero-dimensional arrays are always read.
+
+    Returns
+    -------
+    dict of str to np.ndarray
+        The arrays by name.
+    """
+    path = os.fspath(path)
+    with np.load(path) as archive:
+        if mmap_mode is None:
+            return {name: archive[name] for name in archive.files}
+        arrays = {}
+        with zipfile.ZipFile(path) as zip_file, open(path, "rb") as file:
+            for info in zip_file.infolist():
+                name = info.filename[:-len(".npy")]
+                if info.compress_type != zipfile.ZIP_STORED:
+                    arrays[name] = archive[name]
+                    continue
+                # The local file header is 30 bytes followed by the file name and an extra field.
+                file.seek(info.header_offset + 26)
+                name_length, extra_length = struct.unpack("<HH", file.read(4))
+                file.seek(info.header_offset + 30 + name_length + extra_length)
+                version = format.read_magic(file)
+                read_header = format.read_array_header_1_0 if version == (1, 0) else format.read_array_header_2_0
+                shape, fortran_order, dtype = read_header(file)
+                if not shape or 0 in shape or dtype.hasobject:
+                    arrays[name] = archive[name]
+                    continue
+                arrays[name] = np.memmap(path, dtype=dtype, mode=mmap_mode, offset=file.tell(), shape=shape,
+                                         order="F" if fortran_order else "C")
+        return arrays
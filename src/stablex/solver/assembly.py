@@ -0,0 +1,149 @@
+import numpy as np
+
+
+def import_scipy_sparse():
+    """
+    Imports `scipy.sparse` on demand.
+
+    SciPy is an optional dependency; it is only needed for the sparse code paths.
+
+    Raises
+    ------
+    ImportError
+        If SciPy is not installed.
+    """
+    try:
+        from scipy import sparse
+    except ImportError as error:
+        raise ImportError("Sparse analysis requires scipy. Install it with `pip install scipy` "
+                          "or `pip install stablex[sparse]`.") from error
+    return sparse
+
+
+def scipy_sparse_available() -> bool:
+    """
+    Whether `scipy.sparse` can be imported.
+
+    Returns
+    -------
+    bool
+        True if SciPy is installed.
+    """
+    try:
+        import_scipy_sparse()
+    except ImportError:
+        return False
+    return True
+
+
+class ScatterPlan:
+    """
+    Precomputed plan to scatter element matrices into a global matrix.
+
+    The row and column of every element matrix term are computed once per topology. The
+    sparsity pattern of the global matrix is also precomputed, so each assembly is a single
+    vectorized scatter-add of the raveled element matrices.
+
+    Parameters
+    ----------
+    element_indices : list of np.ndarray
+        Equation numbers of each element's degrees of freedom.
+    size : int
+        Number of rows and columns of the global matrix.
+
+    Attributes
+    ----------
+    size : int
+        Number of rows and columns of the global matrix.
+    rows : np.ndarray
+        Global row of each term of the raveled element matrices, concatenated in element order.
+    cols : np.ndarray
+        Global column of each term of the raveled element matrices, concatenated in element order.
+    """
+
+    def __init__(self, element_indices: list, size: int):
+        self.size = size
+        if element_indices:
+            self.rows = np.concatenate([np.repeat(indices, len(indices)) for indices in element_indices])
+            self.cols = np.concatenate([np.tile(indices, len(indices)) for indices in element_indices])
+        else:
+            self.rows = np.zeros(0, dtype=np.intp)
+            self.cols = np.zeros(0, dtype=np.intp)
+        self._flat_index = self.rows * size + self.cols
+        keys, self._term_position = np.unique(self._flat_index, return_inverse=True)
+        self._csr_indices = keys % size if size else keys
+        self._csr_indptr = np.searchsorted(keys, np.arange(size + 1) * size)
+
+    @property
+    def nnz(self) -> int:
+        """Number of structurally nonzero terms in the global matrix."""
+        return len(self._csr_indices)
+
+    def assemble_dense(self, data: np.ndarray) -> np.ndarray:
+        """
+        Assembles the raveled element matrices into a dense global matrix.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Raveled element matrices, concatenated in element order.
+
+        Returns
+        -------
+        np.ndarray
+            The dense global matrix.
+        """
+        return np.bincount(self._flat_index, weights=data, minlength=self.size ** 2).reshape(self.size, self.size)
+
+    def assemble_dense_stack(self, data: np.ndarray) -> np.ndarray:
+        """
+        Assembles the raveled element matrices of many variants of the topology into stacked dense matrices.
+
+        All variants are scattered with a single `np.bincount`, offsetting the terms of each variant
+        by the size of one global matrix.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Raveled element matrices of each variant, of shape (n_variants, n_terms).
+
+        Returns
+        -------
+        np.ndarray
+            The dense global matrices, of shape (n_variants, size, size).
+        """
+        count = len(data)
+        area = self.size ** 2
+        index = (np.arange(count)[:, None] * area + self._flat_index).ravel()
+        return np.bincount(index, weights=np.ravel(data), minlength=count * area).reshape(count, self.size, self.size)
+
+    def assemble_sparse(self, data: np.ndarray):
+        """
+        Assembles the raveled element matrices into a sparse global matrix.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Raveled element matrices, concatenated in element order.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The global matrix in compressed sparse row format.
+        """
+        sparse = import_scipy_sparse()
+        values = np.bincount(self._term_position, weights=data, minlength=self.nnz)
+        return sparse.csr_matrix((values, self._csr_indices, self._csr_indptr), shape=(self.size, self.size))
+
+    def assemble(self, data: np.ndarray, sparse=False):
+        """
+        Assembles the raveled element matrices into a dense or sparse global matrix.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Raveled element matrices, concatenated in element order.
+        sparse : bool, optional
+            Whether to return a sparse matrix (default is False).
+        """
+        return self.assemble_sparse(data) if sparse else self.assemble_dense(data)
@@ -0,0 +1,266 @@
+import numpy as np
+
+from stablex.compiled_model import CompiledModel
+from stablex.structure import Structure
+
+
+class BatchSolver:
+    """
+    First-order and buckling analyses of many variants of a model that differ only in element
+    properties and nodal forces, solved as stacked matrices.
+
+    The variants share the topology, geometry and restraints of the model. Their stiffness
+    matrices are assembled into one dense array of shape (n_variants, n, n), with one batch kernel
+    call per element group and one scatter for all variants, and solved with stacked
+    `np.linalg.solve`, `np.linalg.cholesky` and `np.linalg.eigh` calls. For small models, such as
+    frames of tens of degrees of freedom analyzed thousands of times in a Monte Carlo study, this
+    removes the per-analysis Python overhead of `Solver` and `EigenSolver`. Memory grows with
+    n_variants·n², so large models are better served by `Sweep`.
+
+    Parameters
+    ----------
+    model : Structure or CompiledModel
+        The model whose variants are analyzed.
+    properties : dict of str to tuple, optional
+        Maps the name of a property of `batch_properties`, such as 'inertias' or
+        'rotational_stiffnesses', to the positions of the elements to change and their values in
+        each variant, of shape (n_variants,) for one value per variant or (n_variants, n_positions).
+    forces : np.ndarray, optional
+        Nodal forces of each variant in equation order, of shape (n_variants, n_dofs). Defaults to
+        the forces of the model.
+
+    Attributes
+    ----------
+    model : CompiledModel
+        The compiled model whose variants are analyzed.
+    variant_count : int
+        Number of variants.
+    forces : np.ndarray
+        Nodal forces of each variant, of shape (n_variants, n_dofs).
+
+    Methods
+    -------
+    stiffness_matrices(axial_forces, include_elastic) -> np.ndarray
+        Assembles the global stiffness matrices of all variants.
+    analyze() -> tuple
+        Solves the first-order elastic analysis of all variants.
+    end_forces(displacements) -> list
+        Computes the local end forces of all variants.
+    axial_forces(end_forces) -> np.ndarray
+        Gathers the axial forces of all variants.
+    buckling_modes(k) -> tuple
+        Computes the k lowest buckling load factors and mode shapes of all variants.
+
+    Examples
+    --------
+    >>> inertias = rng.normal(1943e4, 1e6, size=(1000, 8))
+    >>> batch = BatchSolver(structure, properties={"inertias": (range(8), inertias)})
+    >>> load_factors, modes = batch.buckling_modes(k=2)
+    >>> load_factors.shape
+    (1000, 2)
+    """
+    def __init__(self, model, properties: dict = None, forces: np.ndarray = None):
+        self.model = model.compile() if isinstance(model, Structure) else model
+        if not isinstance(self.model, CompiledModel):
+            raise TypeError("The model must be a Structure or a CompiledModel.")
+        counts = {len(np.atleast_1d(values)) for _, values in (properties or {}).values()}
+        if forces is not None:
+            counts.add(len(forces))
+        if not counts:
+            raise ValueError("The variants need property values or nodal forces.")
+        if len(counts) > 1:
+            raise ValueError("All property values and forces must be given for the same number of variants.")
+        self.variant_count = counts.pop()
+
+        if forces is None:
+            forces = np.broadcast_to(self.model.forces, (self.variant_count, self.model.dof_count))
+        elif np.shape(forces) != (self.variant_count, self.model.dof_count):
+            raise ValueError(f"Expected nodal forces of shape {(self.variant_count, self.model.dof_count)}, "
+                             f"got {np.shape(forces)}.")
+        self.forces = np.asarray(forces, dtype=float)
+
+        # Properties of each group as (n_variants, n_elements) arrays, changed where a variant sets them.
+        group_properties = [dict(group.properties) for group in self.model.element_groups]
+        for name, (positions, values) in (properties or {}).items():
+            group_indices, rows = self.model.element_locations(np.asarray(positions, dtype=np.intp).ravel())
+            values = np.asarray(values, dtype=float)
+            values = np.broadcast_to(values[:, None] if values.ndim == 1 else values, (self.variant_count, len(rows)))
+            for group_index in np.unique(group_indices).tolist():
+                group = self.model.element_groups[group_index]
+                if name not in group.properties:
+                    raise ValueError(f"Elements of type {group.element_type.__name__} have no property '{name}'.")
+                selected = group_indices == group_index
+                stacked = group_properties[group_index][name]
+                if stacked.ndim == 1:
+                    stacked = np.tile(stacked, (self.variant_count, 1))
+                stacked[:, rows[selected]] = values[:, selected]
+                group_properties[group_index][name] = stacked
+
+        # The kernels see the elements of all variants as one batch, variant after variant.
+        self._group_arrays = []
+        for group, stacked_properties in zip(self.model.element_groups, group_properties):
+            arrays = group.arrays(self.model.coordinates)
+            for name, value in arrays.items():
+                stacked = stacked_properties.get(name)
+                if stacked is not None and stacked.ndim == 2:
+                    arrays[name] = stacked.ravel()
+                else:
+                    arrays[name] = np.tile(value, (self.variant_count,) + (1,) * (np.ndim(value) - 1))
+            self._group_arrays.append(arrays)
+
+    def stiffness_matrices(self, axial_forces: np.ndarray = None, include_elastic=True) -> np.ndarray:
+        """
+        Assembles the global stiffness matrices of all variants.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray, optional
+            Axial force of each element in each variant, of shape (n_variants, n_elements). If
+            given, the geometric stiffness of the elements that include geometric nonlinearity is added.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+
+        Returns
+        -------
+        np.ndarray
+            The dense global stiffness matrices in equation order, of shape (n_variants, n_dofs, n_dofs).
+        """
+        data = []
+        for group, arrays in zip(self.model.element_groups, self._group_arrays):
+            group_axial_forces = None
+            if axial_forces is not None:
+                group_axial_forces = (axial_forces[:, group.positions] * group.geometric_nonlinearity).ravel()
+            matrices = group.element_type.batch_global_stiffness_matrices(axial_forces=group_axial_forces,
+                                                                          include_elastic=include_elastic, **arrays)
+            data.append(matrices.reshape(self.variant_count, -1))
+        data = np.concatenate(data, axis=1) if data else np.zeros((self.variant_count, 0))
+        return self.model.scatter_plan.assemble_dense_stack(data)
+
+    def analyze(self) -> tuple:
+        """
+        Solves the first-order elastic analysis of all variants with one stacked solve.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Displacements of all degrees of freedom, of shape (n_variants, n_dofs), and reactions of
+            the restrained degrees of freedom, of shape (n_variants, n_restrained), in equation order.
+
+        Raises
+        ------
+        np.linalg.LinAlgError
+            If the free-free stiffness matrix of a variant is singular.
+        """
+        return self._analyze(self.stiffness_matrices())
+
+    def _analyze(self, global_matrices):
+        f = self.model.free_count
+        prescribed = self.model.prescribed_displacements
+        kfs = global_matrices[:, :f, f:]
+        free_forces = self.forces[:, :f] - kfs @ prescribed
+        free_displacements = np.linalg.solve(global_matrices[:, :f, :f], free_forces[..., None])[..., 0]
+        reactions = np.einsum("vfr,vf->vr", kfs, free_displacements) + global_matrices[:, f:, f:] @ prescribed
+        displacements = np.concatenate([free_displacements,
+                                        np.broadcast_to(prescribed, (self.variant_count, len(prescribed)))], axis=1)
+        return displacements, reactions
+
+    def end_forces(self, displacements: np.ndarray) -> list:
+        """
+        Computes the local end forces of every element group in all variants.
+
+        Parameters
+        ----------
+        displacements : np.ndarray
+            Displacements of all degrees of freedom, of shape (n_variants, n_dofs).
+
+        Returns
+        -------
+        list of np.ndarray
+            Local end forces of each group, of shape (n_variants, n_elements, n_dofs).
+        """
+        end_forces = []
+        for group, arrays in zip(self.model.element_groups, self._group_arrays):
+            group_displacements = displacements[:, group.dof_indices].reshape(-1, group.dof_indices.shape[1])
+            forces = group.element_type.batch_local_end_forces(group_displacements, **arrays)
+            end_forces.append(forces.reshape(self.variant_count, len(group), -1))
+        return end_forces
+
+    def axial_forces(self, end_forces: list) -> np.ndarray:
+        """
+        Gathers the axial forces that contribute to the geometric stiffness in all variants.
+
+        Parameters
+        ----------
+        end_forces : list of np.ndarray
+            Local end forces of each group, as returned by `end_forces`.
+
+        Returns
+        -------
+        np.ndarray
+            Axial force of each element in each variant, of shape (n_variants, n_elements).
+            Elements without geometric nonlinearity get a zero axial force.
+        """
+        axial_forces = np.zeros((self.variant_count, self.model.element_count))
+        for group, forces in zip(self.model.element_groups, end_forces):
+            group_axial_forces = group.element_type.batch_axial_forces(forces.reshape(-1, forces.shape[-1]))
+            axial_forces[:, group.positions] = group_axial_forces.reshape(self.variant_count, -1)
+            axial_forces[:, group.positions] *= group.geometric_nonlinearity
+        return axial_forces
+
+    def buckling_modes(self, k: int = 1) -> tuple:
+        """
+        Computes the k lowest positive buckling load factors and mode shapes of all variants.
+
+        As in `EigenSolver`, the axial forces of a first-order analysis give the geometric
+        stiffness [K_g], and the inverted problem (-[K_g]){Δ} = μ[K_E]{Δ}, μ = 1/λ, is reduced to
+        standard symmetric form with the Cholesky factor of [K_E]. The reduction and `eigh` run
+        on the whole stack at once.
+
+        Parameters
+        ----------
+        k : int, optional
+            Number of modes per variant (default is 1).
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Load factors in ascending order, of shape (n_variants, k), and mode shapes of the free
+            degrees of freedom, of shape (n_variants, n_free, k), each scaled to a unit norm. Load
+            factors and modes are NaN where a variant has fewer than k modes with a positive load factor.
+
+        Raises
+        ------
+        ValueError
+            If the elastic stiffness matrix of a variant is not positive definite.
+        """
+        f = self.model.free_count
+        elastic_matrices = self.stiffness_matrices()
+        displacements, _ = self._analyze(elastic_matrices)
+        axial_forces = self.axial_forces(self.end_forces(displacements))
+        geometric_matrices = self.stiffness_matrices(axial_forces, include_elastic=False)[:, :f, :f]
+        elastic_matrices = elastic_matrices[:, :f, :f]
+        try:
+            lower = np.linalg.cholesky(elastic_matrices)
+        except np.linalg.LinAlgError:
+            failed = [index for index, matrix in enumerate(elastic_matrices)
+                      if np.any(np.linalg.eigvalsh(matrix) <= 0)]
+            raise ValueError(f"The elastic stiffness matrix of variants {failed} is not positive definite.") from None
+        lower_inverse = np.linalg.solve(lower, np.broadcast_to(np.eye(f), lower.shape))
+        reduced = -lower_inverse @ geometric_matrices @ lower_inverse.transpose(0, 2, 1)
+        inverse_values, vectors = np.linalg.eigh((reduced + reduced.transpose(0, 2, 1)) / 2)
+
+        # eigh sorts ascending, so the largest μ, the lowest positive load factors, come last.
+        tolerance = 1e-10 * np.maximum(np.max(np.abs(inverse_values), axis=1, initial=0.), np.finfo(float).tiny)
+        count = min(k, f)
+        inverse_values = inverse_values[:, ::-1][:, :count]
+        modes = lower_inverse.transpose(0, 2, 1) @ vectors[:, :, ::-1][:, :, :count]
+        positive = inverse_values > tolerance[:, None]
+        modes = modes / np.linalg.norm(modes, axis=1, keepdims=True)
+        largest = np.take_along_axis(modes, np.argmax(np.abs(modes), axis=1)[:, None, :], axis=1)
+        modes = modes * np.sign(largest)
+
+        load_factors = np.full((self.variant_count, k), np.nan)
+        load_factors[:, :count] = np.where(positive, 1. / np.where(positive, inverse_values, 1.), np.nan)
+        padded = np.full((self.variant_count, f, k), np.nan)
+        padded[:, :, :count] = np.where(positive[:, None, :], modes, np.nan)
+        return load_factors, padded
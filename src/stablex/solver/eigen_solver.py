@@ -1,6 +1,9 @@
 import numpy as np
 
+from stablex.compiled_model import CompiledModel
 from stablex.solver.first_order_solver import Solver
+from stablex.solver.linear_solvers import DenseCholeskySolver, import_scipy_linalg
+from stablex.solver.mode_set import ModeSet
 from stablex.structure import Structure
 
 
@@ -13,10 +16,12 @@ class EigenSolver:
     -------
     solve(mode_shape: int)
         Solves for the specified buckling mode, returning the critical load factor (eigenvalue) and mode shape (eigenvector).
-    set_element_geometric_matrix()
-        Sets the geometric stiffness matrix for each element in the structure.
-    create_sorted_dict(eigenvalues, eigenvectors)
-        Creates and returns a sorted dictionary of eigenvalues and their corresponding eigenvectors.
+    solve_modes(k: int) -> ModeSet
+        Solves for the k lowest buckling modes at once.
+    buckling_modes(k: int)
+        Computes the k lowest positive buckling load factors and their mode shapes as arrays.
+    sensitivities(k: int)
+        Computes the derivatives of the k lowest load factors with respect to all element properties.
     reset_node_displacements()
         Resets the displacements of all nodes' degrees of freedom to zero.
     reset_node_coordinates()
@@ -29,94 +34,279 @@ class EigenSolver:
 
         Parameters
         ----------
-        structure : Structure
-            The structural model for which to perform the buckling analysis.
+        structure : Structure or CompiledModel
+            The structural model for which to perform the buckling analysis. Only `solve` writes its
+            mode shape to the degrees of freedom of a structure; the other methods leave it untouched.
         """
         self.structure = structure
 
     def solve(self, mode_shape: int):
+        """
+        Performs a buckling analysis and returns a single mode.
+
+        The lowest `mode_shape` modes are computed with `solve_modes`; the selected mode shape is
+        written to the degrees of freedom of the structure.
+
+        Parameters
+        ----------
+        mode_shape : int
+            The mode shape number for which to solve.
+
+        Returns
+        -------
+        tuple
+            A tuple containing the selected eigenvalue and its eigenvector for the free degrees of freedom.
+        """
+        mode_set = self.solve_modes(mode_shape)
+        if len(mode_set) < mode_shape:
+            raise ValueError(f"The structure has only {len(mode_set)} buckling modes with a positive load factor.")
+        if isinstance(self.structure, Structure):
+            mode_set.apply(self.structure, mode_shape)
+        return mode_set.load_factors[mode_shape - 1], mode_set.mode(mode_shape)
+
+    def solve_modes(self, k: int = 1) -> ModeSet:
         """
         Performs a buckling analysis by first executing a first-order elastic analysis to determine
-        the axial loads in the structural members, then solving for the eigenvalues and eigenvectors
-        of the buckling equation:
+        the axial loads in the structural members, then solving the symmetric generalized eigenvalue
+        problem of the buckling equation:
 
-            (-[K_E]⁻¹[K_g] - λ[I]){Δ} = 0
+            [K_E]{Δ} = λ(-[K_g]){Δ}
 
         where:
         - **[K_E]** is the elastic stiffness matrix from the first-order analysis,
         - **[K_g]** is the geometric stiffness matrix based on the internal axial forces,
-        - **λ** represents the eigenvalues associated with critical buckling loads,
-        - **[I]** is the identity matrix, and
+        - **λ** represents the eigenvalues associated with critical buckling loads, and
         - **{Δ}** is the eigenvector representing the buckling mode shape.
 
         The eigenvalues obtained represent the load factors at which buckling occurs,
-        and the corresponding eigenvectors indicate the buckling mode shapes.
+        and the corresponding eigenvectors indicate the buckling mode shapes. The analysis
+        runs once for all k modes.
 
         Parameters
         ----------
-        mode_shape : int
-            The mode shape number for which to solve.
+        k : int, optional
+            Number of modes to compute (default is 1).
 
         Returns
         -------
-        tuple
-            A tuple containing the selected eigenvalue and eigenvectors for the specified mode shape.
+        ModeSet
+            The k lowest positive load factors and their mode shapes. Fewer modes are returned if
+            the structure has fewer than k modes with a positive load factor.
         """
-        self.reset_node_displacements()
-        self.reset_node_coordinates()
-        solver = Solver(self.structure)
-        solver.solve_first_order_elastic()
-        kff_matrix = solver._free_free_matrix(solver._global_stiffness_matrix)
-        self.reset_node_coordinates()
-        self.set_element_geometric_matrix()
-        kffg_matrix = solver._free_free_matrix(solver._global_stiffness_matrix)
-        eigenvalues, eigenvectors = np.linalg.eig(np.linalg.inv(-kff_matrix).dot(kffg_matrix))
-        eigen_dict = EigenSolver.create_sorted_dict(1./eigenvalues, eigenvectors.T)
-        eigenvalue = list(eigen_dict.keys())[mode_shape-1].real
-        eigenvector = list(eigen_dict.values())[mode_shape-1]
-        solver.displacement_vector = eigenvector
-
-        return eigenvalue, eigenvectors
-
-    def set_element_geometric_matrix(self):
-        """
-         Sets the geometric stiffness matrix for each element in the structure, accounting for nonlinearity.
-         """
-        for element in self.structure.elements:
-            if element.geometric_nonlinearity:
-                element.stiffness_matrix = element.geometric_stiffness_matrix(element.local_end_forces())
-            else:
-                element.stiffness_matrix = element.geometric_stiffness_matrix(element.local_end_forces() * 0)
+        return ModeSet(*self._solve_modes(k))
 
-    @staticmethod
-    def create_sorted_dict(eigenvalues, eigenvectors):
+    def buckling_modes(self, k: int = 1):
         """
-        Creates a sorted dictionary of eigenvalues and corresponding eigenvectors.
+        Computes the k lowest positive buckling load factors and their mode shapes.
+
+        The problem is solved in the inverted form (-[K_g]){Δ} = μ[K_E]{Δ}, μ = 1/λ, whose largest
+        eigenvalues are the lowest buckling loads. Large sparse models use the Lanczos method
+        (`scipy.sparse.linalg.eigsh`), reusing the factorization of [K_E] from the first-order
+        analysis; other models are reduced to a dense symmetric problem with the Cholesky factor
+        of [K_E] and solved with `numpy.linalg.eigh`.
 
         Parameters
         ----------
-        eigenvalues : array-like
-            Eigenvalues to be sorted.
-        eigenvectors : array-like
-            Corresponding eigenvectors for each eigenvalue.
+        k : int, optional
+            Number of modes to compute (default is 1).
 
         Returns
         -------
-        dict
-            A dictionary mapping each eigenvalue to its eigenvector, sorted in ascending order of eigenvalues.
+        tuple of np.ndarray
+            Load factors in ascending order, of shape (k,), and mode shapes of the free degrees of
+            freedom, one per column, of shape (n_free, k), each scaled to a unit norm. Fewer modes
+            are returned if the structure has fewer than k modes with a positive load factor.
+        """
+        load_factors, modes, _ = self._solve_modes(k)
+        return load_factors, modes
+
+    def sensitivities(self, k: int = 1, initial_modes: np.ndarray = None, return_modes=False) -> tuple:
         """
-        counter = 0
-        eigen_dict = {}
-        for value in eigenvalues:
-            eigen_dict[value]= eigenvectors[counter]
-            counter += 1
-        sorted(eigen_dict)
-        return dict(sorted(eigen_dict.items(), reverse=False))
+        Computes the derivatives of the k lowest buckling load factors with respect to the section,
+        material and spring properties of every element.
+
+        Differentiating ([K_E] + λ[K_g]){Δ} = 0 gives, for a simple load factor λ with mode {Δ},
+
+            dλ/dp = -{Δ}ᵀ(∂[K_E]/∂p + λ·d[K_g]/dp){Δ} / {Δ}ᵀ[K_g]{Δ}.
+
+        [K_g] depends on p through the prebuckling axial forces N = B·{u}, both directly and
+        through the displacements {u} = [K_E]⁻¹{F}. With the adjoint displacements
+        {ψ} = [K_E]⁻¹·Σ c_e·B_eᵀ, where c_e = {Δ}ᵀ[k_g,e(N=1)]{Δ}, the second term is
+
+            {Δ}ᵀ(d[K_g]/dp){Δ} = c_e·(∂N_e/∂p) - {ψ}ᵀ(∂[K_E]/∂p){u},
+
+        so the derivatives of all elements follow from one multi-column solve with the
+        factorization of the first-order analysis, and element-level stiffness matrices evaluated
+        by the batch kernels. The elastic stiffness of every element type is linear in each of its
+        properties, so ∂[k_e]/∂p is the difference of the stiffness at p = 1 and p = 0.
+
+        Parameters
+        ----------
+        k : int, optional
+            Number of modes (default is 1).
+        initial_modes : np.ndarray, optional
+            Modes of a similar model, such as the previous design of an optimization, of shape
+            (n_free, n_modes). Large sparse models start the Lanczos iteration from them; dense
+            models solve all eigenvalues directly and ignore them.
+        return_modes : bool, optional
+            Whether to return the modes as a `ModeSet` instead of the load factors alone (default is False).
+
+        Returns
+        -------
+        tuple
+            Load factors in ascending order, of shape (k,), or the modes as a `ModeSet` with
+            `return_modes`, and a dict that maps each property of `batch_properties`, such as
+            'areas', 'inertias', 'elasticity_moduli' and 'rotational_stiffnesses', to the
+            derivatives of the load factors with respect to the property of each element, of shape
+            (k, n_elements), in the order of the structure's elements. Elements without the
+            property get NaN. Fewer modes are returned if the structure has fewer than k modes with
+            a positive load factor.
+
+        Notes
+        -----
+        The derivative of a repeated load factor depends on the direction of the change; the
+        derivatives returned for it are those of the computed modes.
+        """
+        load_factors, modes, solver, result = self._analyze_modes(k, initial_modes)
+        model = solver.model
+        mode_count = len(load_factors)
+        free_count = model.free_count
+        mode_shapes = np.zeros((model.dof_count, mode_count))
+        mode_shapes[:free_count] = modes
+        displacements = result.displacements
+
+        # Mode curvature of each element under a unit axial force and the axial force operator.
+        group_terms = []
+        denominators = np.zeros(mode_count)
+        adjoint_forces = np.zeros((model.dof_count, mode_count))
+        for group in model.element_groups:
+            arrays = group.arrays(model.coordinates)
+            group_modes = mode_shapes[group.dof_indices]
+            unit_geometric = group.element_type.batch_global_stiffness_matrices(
+                axial_forces=group.geometric_nonlinearity.astype(float), include_elastic=False, **arrays)
+            curvatures = np.einsum("nim,nij,njm->nm", group_modes, unit_geometric, group_modes)
+            rows = self._axial_force_rows(group, arrays)
+            denominators += curvatures.T @ np.einsum("ni,ni->n", rows, displacements[group.dof_indices])
+            np.add.at(adjoint_forces, group.dof_indices, curvatures[:, None, :] * rows[:, :, None])
+            group_terms.append((arrays, group_modes, curvatures))
+        adjoint = np.zeros((model.dof_count, mode_count))
+        if mode_count:
+            adjoint[:free_count] = solver.solve(adjoint_forces[:free_count]).reshape(free_count, mode_count)
+
+        # Element matrices stacked by Element.batch_element_matrices are not scalar properties.
+        names = {name for group in model.element_groups
+                 for name, values in group.properties.items() if values.ndim == 1}
+        derivatives = {name: np.full((mode_count, model.element_count), np.nan) for name in sorted(names)}
+        for group, (arrays, group_modes, curvatures) in zip(model.element_groups, group_terms):
+            group_displacements = displacements[group.dof_indices]
+            group_adjoint = adjoint[group.dof_indices]
+            for name in names.intersection(group.properties):
+                stiffness_changes, axial_changes = [], []
+                for value in (0., 1.):
+                    varied = {**arrays, name: np.full(len(group), value)}
+                    stiffness_changes.append(group.element_type.batch_global_stiffness_matrices(**varied))
+                    axial_changes.append(np.einsum("ni,ni->n", self._axial_force_rows(group, varied),
+                                                   group_displacements))
+                stiffness_change = stiffness_changes[1] - stiffness_changes[0]
+                axial_change = axial_changes[1] - axial_changes[0]
+                elastic = np.einsum("nim,nij,njm->nm", group_modes, stiffness_change, group_modes)
+                geometric = (curvatures * axial_change[:, None]
+                             - np.einsum("nim,nij,nj->nm", group_adjoint, stiffness_change, group_displacements))
+                derivatives[name][:, group.positions] = (-(elastic + load_factors * geometric) / denominators).T
+        if return_modes:
+            return ModeSet(load_factors, modes, model), derivatives
+        return load_factors, derivatives
+
+    @staticmethod
+    def _axial_force_rows(group, arrays: dict) -> np.ndarray:
+        """Returns the linear map from the global end displacements to the axial force of each element."""
+        count, dof_count = group.dof_indices.shape
+        repeated = {name: np.repeat(values, dof_count, axis=0) for name, values in arrays.items()}
+        unit_displacements = np.tile(np.eye(dof_count), (count, 1))
+        end_forces = group.element_type.batch_local_end_forces(unit_displacements, **repeated)
+        rows = group.element_type.batch_axial_forces(end_forces).reshape(count, dof_count)
+        return rows * group.geometric_nonlinearity[:, None]
+
+    def _solve_modes(self, k):
+        load_factors, modes, solver, _ = self._analyze_modes(k)
+        return load_factors, modes, solver.model
+
+    def _analyze_modes(self, k, initial_modes=None):
+        solver = Solver(self.structure)
+        result = solver.analyze()
+        axial_forces = solver.model.element_axial_forces(result.end_forces)
+        kffg_matrix = solver._free_free_matrix(solver.global_stiffness_matrix(axial_forces, include_elastic=False))
+        size = kffg_matrix.shape[0]
+        if solver.sparse and k < size - 1 and import_scipy_linalg() is not None:
+            inverse_values, modes = EigenSolver._lanczos(solver, -kffg_matrix, k, initial_modes)
+        else:
+            inverse_values, modes = EigenSolver._dense(solver, -EigenSolver._to_dense(kffg_matrix))
+
+        tolerance = 1e-10 * max(np.max(np.abs(inverse_values), initial=0.), np.finfo(float).tiny)
+        order = np.argsort(-inverse_values)
+        order = order[inverse_values[order] > tolerance][:k]
+        modes = modes[:, order]
+        modes = modes / np.linalg.norm(modes, axis=0)
+        modes = modes * np.sign(modes[np.argmax(np.abs(modes), axis=0), np.arange(len(order))])
+        return 1. / inverse_values[order], modes, solver, result
+
+    @staticmethod
+    def _to_dense(matrix):
+        return matrix.toarray() if hasattr(matrix, "toarray") else matrix
+
+    @staticmethod
+    def _lanczos(solver, geometric_matrix, k, initial_modes=None):
+        """Solves the inverted problem for the k largest eigenvalues with ARPACK, starting from the given modes."""
+        from scipy.sparse.linalg import LinearOperator, eigsh
+        size = geometric_matrix.shape[0]
+        elastic_matrix = solver._free_free_matrix(solver.factorized_matrix)
+        elastic_inverse = LinearOperator((size, size), matvec=solver.solve, dtype=float)
+        start = None
+        if initial_modes is not None and np.shape(initial_modes)[0] == size:
+            # A combination of the previous modes has a component along each of them.
+            start = np.asarray(initial_modes, dtype=float).reshape(size, -1).sum(axis=1)
+            start = start if np.any(start) else None
+        return eigsh(geometric_matrix, k=k, M=elastic_matrix, Minv=elastic_inverse, which="LA", v0=start)
+
+    @staticmethod
+    def _dense(solver, geometric_matrix):
+        """
+        Solves the inverted problem for all eigenvalues, reduced to standard symmetric form with the
+        Cholesky factor of the elastic stiffness matrix of the first-order analysis.
+        """
+        try:
+            lower = EigenSolver._cholesky_factor(solver)
+        except np.linalg.LinAlgError:
+            eigenvalues, modes = np.linalg.eig(solver.solve(geometric_matrix))
+            real = np.abs(eigenvalues.imag) <= 1e-8 * np.abs(eigenvalues)
+            return eigenvalues.real * real, modes.real
+        linalg = import_scipy_linalg()
+        if linalg is None:
+            lower_inverse = np.linalg.inv(lower)
+            eigenvalues, vectors = np.linalg.eigh(lower_inverse @ geometric_matrix @ lower_inverse.T)
+            return eigenvalues, lower_inverse.T @ vectors
+        half = linalg.solve_triangular(lower, geometric_matrix, lower=True)
+        reduced = linalg.solve_triangular(lower, half.T, lower=True)
+        eigenvalues, vectors = np.linalg.eigh((reduced + reduced.T) / 2)
+        return eigenvalues, linalg.solve_triangular(lower.T, vectors, lower=False)
+
+    @staticmethod
+    def _cholesky_factor(solver):
+        """Returns the lower Cholesky factor of the free-free elastic stiffness matrix factorized by the solver."""
+        backend = solver.linear_solver
+        if isinstance(backend, DenseCholeskySolver) and backend.method == "cholesky":
+            factor, lower = backend.factorization
+            return np.tril(factor) if lower else np.triu(factor).T
+        if isinstance(backend, DenseCholeskySolver) and backend.method == "lu":
+            raise np.linalg.LinAlgError("The elastic stiffness matrix is not positive definite.")
+        return np.linalg.cholesky(EigenSolver._to_dense(solver._free_free_matrix(solver.factorized_matrix)))
 
     def reset_node_displacements(self):
         """
         Resets displacements of all degrees of freedom in each node to zero.
         """
+        if isinstance(self.structure, CompiledModel):
+            return
         for node in self.structure.nodes:
             node.x_dof.displacement = 0
             node.y_dof.displacement = 0
@@ -126,6 +316,8 @@ class EigenSolver:
         """
         Resets coordinates of each node to its original position.
         """
+        if isinstance(self.structure, CompiledModel):
+            return
         for node in self.structure.nodes:
             node.x = node._x_original
             node.y = node._y_original
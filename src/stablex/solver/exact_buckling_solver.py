@@ -0,0 +1,234 @@
+import numpy as np
+
+from stablex.compiled_model import CompiledModel
+from stablex.solver.first_order_solver import Solver
+from stablex.solver.linear_solvers import DenseLDLSolver, import_scipy_linalg
+from stablex.solver.mode_set import ModeSet
+from stablex.structure import Structure
+
+
+class ExactBucklingSolver:
+    """
+    Computes exact buckling loads of frames from the stability functions with the Wittrick-Williams algorithm.
+
+    Each frame member is modelled by a single element whose stiffness K(λ) is the transcendental
+    stiffness of a beam-column under λ times its axial force from a first-order analysis of the
+    reference loads. Because the stiffness is exact, the critical loads do not depend on how the
+    members are subdivided.
+
+    The Wittrick-Williams algorithm counts the critical load factors below a trial value λ as
+
+        J(λ) = Σ J_m(λ) + s{K(λ)}
+
+    where s{K(λ)} is the number of negative eigenvalues of the free-free stiffness matrix, read
+    from the signs of an LDLᵀ factorization, and J_m(λ) is the number of buckling loads of member m
+    with both ends clamped that lie below λ. Each critical load factor is bracketed and then
+    bisected on this count, so no mode is ever skipped.
+
+    Parameters
+    ----------
+    structure : Structure or CompiledModel
+        The structure under the reference loads.
+    tolerance : float, optional
+        Relative tolerance of the critical load factors (default is 1e-10).
+
+    Methods
+    -------
+    solve(mode_shape: int)
+        Solves for the specified buckling mode, returning the critical load factor and mode shape.
+    solve_modes(k: int) -> ModeSet
+        Solves for the k lowest critical load factors and their mode shapes.
+    eigenvalue_count(load_factor: float) -> int
+        Counts the critical load factors below a trial load factor.
+    stiffness_matrix(load_factor: float) -> np.ndarray
+        Assembles the exact free-free stiffness matrix at a load factor.
+    """
+    max_bracketing_steps = 200
+
+    def __init__(self, structure, tolerance: float = 1e-10):
+        self.structure = structure
+        self.tolerance = tolerance
+        self._reference_axial_forces = None
+        self._model = None
+
+    @property
+    def model(self) -> CompiledModel:
+        """The compiled model of the structure."""
+        if self._model is None:
+            self._model = self.structure if isinstance(self.structure, CompiledModel) else self.structure.compile()
+        return self._model
+
+    @property
+    def reference_axial_forces(self) -> np.ndarray:
+        """Axial force of each element under the reference loads, tension positive."""
+        if self._reference_axial_forces is None:
+            result = Solver(self.model).analyze()
+            self._reference_axial_forces = self.model.element_axial_forces(result.end_forces)
+        return self._reference_axial_forces
+
+    def _group_axial_forces(self, group, load_factor):
+        return load_factor * self.reference_axial_forces[group.positions] * group.geometric_nonlinearity
+
+    def stiffness_matrix(self, load_factor: float) -> np.ndarray:
+        """
+        Assembles the exact free-free stiffness matrix K(λ).
+
+        Parameters
+        ----------
+        load_factor : float
+            The load factor λ applied to the reference axial forces.
+
+        Returns
+        -------
+        np.ndarray
+            The free-free stiffness matrix.
+        """
+        data = [group.element_type.batch_stability_stiffness_matrices(
+                    self._group_axial_forces(group, load_factor), **group.arrays(self.model.coordinates)).ravel()
+                for group in self.model.element_groups]
+        data = np.concatenate(data) if data else np.zeros(0)
+        free_count = self.model.free_count
+        return self.model.scatter_plan.assemble(data, False)[:free_count, :free_count]
+
+    def eigenvalue_count(self, load_factor: float, matrix: np.ndarray = None) -> int:
+        """
+        Counts the critical load factors below a trial load factor with the Wittrick-Williams algorithm.
+
+        Parameters
+        ----------
+        load_factor : float
+            The trial load factor.
+        matrix : np.ndarray, optional
+            The free-free stiffness matrix K(λ) at the trial load factor, if already assembled.
+
+        Returns
+        -------
+        int
+            Number of critical load factors between zero and the trial load factor.
+        """
+        arrays = [group.arrays(self.model.coordinates) for group in self.model.element_groups]
+        fixed_end_count = sum(int(np.sum(group.element_type.batch_fixed_end_eigenvalue_counts(
+                                  self._group_axial_forces(group, load_factor), **group_arrays)))
+                              for group, group_arrays in zip(self.model.element_groups, arrays))
+        if matrix is None:
+            matrix = self.stiffness_matrix(load_factor)
+        if import_scipy_linalg() is None:
+            return fixed_end_count + int(np.count_nonzero(np.linalg.eigvalsh(matrix) < 0))
+        ldl = DenseLDLSolver()
+        ldl.factorize(matrix)
+        return fixed_end_count + ldl.negative_eigenvalue_count()
+
+    def _count(self, load_factor):
+        """Returns the eigenvalue count at a trial load factor and the stiffness matrix it was read from."""
+        # A trial value that hits a pole of a member stiffness is nudged off it.
+        matrix = self.stiffness_matrix(load_factor)
+        while not np.all(np.isfinite(matrix)):
+            load_factor *= 1 + 1e-12
+            matrix = self.stiffness_matrix(load_factor)
+        return self.eigenvalue_count(load_factor, matrix), matrix
+
+    def _check_stable(self, counts: dict):
+        """Checks that no critical load factor lies below zero and records the count at zero."""
+        counts[0.] = self._count(0.)[0]
+        if counts[0.] != 0:
+            raise ValueError("The structure is unstable without load.")
+
+    def _bisect(self, mode_shape: int, counts: dict) -> tuple:
+        """
+        Brackets and bisects one critical load factor, starting from the tightest bounds among the
+        trial load factors in `counts`, which maps each trial to its eigenvalue count and is extended
+        with the new trials. Returns the load factor and the stiffness matrix at the upper bound.
+        """
+        lower = max(load_factor for load_factor, count in counts.items() if count < mode_shape)
+        upper = min((load_factor for load_factor, count in counts.items() if count >= mode_shape), default=None)
+        matrix = None
+        if upper is None:
+            upper = 2 * lower if lower > 0 else 1.
+            for _ in range(self.max_bracketing_steps):
+                counts[upper], matrix = self._count(upper)
+                if counts[upper] >= mode_shape:
+                    break
+                lower, upper = upper, 2 * upper
+            else:
+                raise ValueError(f"No critical load factor found for mode {mode_shape}; "
+                                 f"check that the reference loads compress the structure.")
+        while upper - lower > self.tolerance * upper:
+            middle = (lower + upper) / 2
+            counts[middle], middle_matrix = self._count(middle)
+            if counts[middle] >= mode_shape:
+                upper, matrix = middle, middle_matrix
+            else:
+                lower = middle
+        if matrix is None:
+            matrix = self._count(upper)[1]
+        return (lower + upper) / 2, matrix
+
+    def critical_load_factor(self, mode_shape: int) -> float:
+        """
+        Computes one critical load factor by bracketing and bisection on the eigenvalue count.
+
+        Parameters
+        ----------
+        mode_shape : int
+            The mode number, starting at 1.
+
+        Returns
+        -------
+        float
+            The critical load factor.
+        """
+        counts = {}
+        self._check_stable(counts)
+        return self._bisect(mode_shape, counts)[0]
+
+    def solve_modes(self, k: int = 1) -> ModeSet:
+        """
+        Computes the k lowest critical load factors and their mode shapes.
+
+        The load factors are bisected one after the other, each starting from the bounds left by
+        the trials of the lower modes. The mode shape of a critical load factor is the null vector
+        of K(λ), taken from the matrix at the upper bound of the bisection. Modes in which a
+        member buckles between its end nodes while the nodes stay fixed have no nodal
+        displacements; their shape is then only indicative.
+
+        Parameters
+        ----------
+        k : int, optional
+            Number of modes to compute (default is 1).
+
+        Returns
+        -------
+        ModeSet
+            The critical load factors in ascending order and their unit-norm mode shapes.
+        """
+        counts = {}
+        self._check_stable(counts)
+        load_factors = np.zeros(k)
+        modes = np.zeros((self.model.free_count, k))
+        for column in range(k):
+            load_factors[column], matrix = self._bisect(column + 1, counts)
+            eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+            mode = eigenvectors[:, np.argmin(np.abs(eigenvalues))]
+            modes[:, column] = mode * np.sign(mode[np.argmax(np.abs(mode))])
+        return ModeSet(load_factors, modes, self.model)
+
+    def solve(self, mode_shape: int):
+        """
+        Computes the critical load factor and mode shape of one mode.
+
+        The mode shape is written to the degrees of freedom of the structure.
+
+        Parameters
+        ----------
+        mode_shape : int
+            The mode number, starting at 1.
+
+        Returns
+        -------
+        tuple
+            The critical load factor and its mode shape for the free degrees of freedom.
+        """
+        mode_set = self.solve_modes(mode_shape)
+        if isinstance(self.structure, Structure):
+            mode_set.apply(self.structure, mode_shape)
+        return mode_set.load_factors[mode_shape - 1], mode_set.mode(mode_shape)
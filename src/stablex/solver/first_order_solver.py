@@ -1,5 +1,9 @@
 import numpy as np
 
+from stablex.compiled_model import CompiledModel
+from stablex.solver.assembly import scipy_sparse_available
+from stablex.solver.linear_solvers import LinearSolver, LowRankUpdateSolver, make_linear_solver
+from stablex.solver.results import LinearResult
 from stablex.structure import Structure
 
 
@@ -8,19 +12,89 @@ class Solver:
     Solver class to perform structural analysis on a given structure by calculating displacements
     and reaction forces based on the first-order elastic stiffness matrix.
 
+    `analyze` returns the results as an immutable `LinearResult` and leaves the structure
+    untouched, so several solvers can analyze the same structure or compiled model at once.
+    `solve_first_order_elastic` additionally stores the results on the solver and writes them to
+    the degrees of freedom of the structure.
+
     Parameters
     ----------
-    structure : Structure
-        The structure to analyze.
+    structure : Structure or CompiledModel
+        The structure to analyze. A structure is compiled when the solver is created and results
+        are written back to its degrees of freedom; a compiled model is analyzed as is.
+    sparse : bool, optional
+        Whether to assemble and solve the global stiffness matrix in sparse format. By default the
+        sparse path is used for models with at least `sparse_threshold` degrees of freedom when
+        SciPy is installed, and the dense path otherwise.
+    linear_solver : str or LinearSolver, optional
+        Backend that factorizes the free-free stiffness matrix: 'cholesky', 'ldl', 'banded',
+        'sparse', 'sparse_ldl' or 'low_rank' (see `LINEAR_SOLVERS`), or a `LinearSolver` instance. Defaults to
+        'sparse' on the sparse path and 'cholesky' otherwise.
+
+    Attributes
+    ----------
+    model : CompiledModel
+        The compiled model the solver operates on.
+    sparse_threshold : int
+        Number of degrees of freedom from which the sparse path is used by default, if SciPy is installed.
+    axial_forces : np.ndarray or None
+        Axial force of each element, in the order of the structure's elements. When set, the
+        geometric stiffness of the elements that include geometric nonlinearity is added to the
+        global stiffness matrix. None by default.
+    coordinates : np.ndarray or None
+        Nodal coordinates to assemble the stiffness matrix in. None to use the compiled coordinates.
+    linear_solver : LinearSolver
+        The backend holding the factorization of the last free-free stiffness matrix, reused by
+        `solve` for further right-hand sides.
     """
-    def __init__(self, structure: Structure):
-        self.structure = structure
-        self.degrees_of_freedom_count = len(self.structure.degrees_of_freedom)
-        self._force_vector = np.array([dof.force for dof in self.structure.free_degrees_of_freedom])
-        self._displacement_vector = np.zeros(len(structure.free_degrees_of_freedom))
-        self._reactions_vector = np.zeros(len(structure.restrained_degrees_of_freedom))
-        for element in structure.elements:
-            element.stiffness_matrix = element.first_order_elastic_stiffness_matrix()
+    sparse_threshold = 500
+
+    def __init__(self, structure, sparse: bool = None, linear_solver=None):
+        if isinstance(structure, CompiledModel):
+            self.structure = None
+            self.model = structure
+        else:
+            self.structure = structure
+            self.model = structure.compile()
+        self.degrees_of_freedom_count = self.model.dof_count
+        if sparse is None:
+            sparse = Solver.default_sparse(self.degrees_of_freedom_count)
+        self.sparse = sparse
+        if linear_solver is None:
+            linear_solver = "sparse" if sparse else "cholesky"
+        self.linear_solver: LinearSolver = make_linear_solver(linear_solver)
+        self._force_vector = self.model.free_forces.copy()
+        self._displacement_vector = np.zeros(self.model.free_count)
+        self._reactions_vector = np.zeros(self.model.dof_count - self.model.free_count)
+        self.axial_forces = None
+        self.coordinates = None
+        self._factorization = None
+
+    @property
+    def factorized_matrix(self):
+        """
+        The global stiffness matrix assembled by the last `analyze`, whose free-free part
+        `linear_solver` holds factorized, or None if it has been invalidated since.
+        """
+        return self._factorization[-1] if self._factorization_is_current() else None
+
+    @staticmethod
+    def default_sparse(dof_count: int) -> bool:
+        """
+        Whether a model is solved on the sparse path when the caller does not choose.
+
+        Parameters
+        ----------
+        dof_count : int
+            Number of degrees of freedom of the model.
+
+        Returns
+        -------
+        bool
+            True if the model has at least `sparse_threshold` degrees of freedom and SciPy, an
+            optional dependency, is installed.
+        """
+        return dof_count >= Solver.sparse_threshold and scipy_sparse_available()
 
     @property
     def _global_stiffness_matrix(self):
@@ -29,74 +103,79 @@ class Solver:
 
         Returns
         -------
-        np.ndarray
-            The global stiffness matrix.
+        np.ndarray or scipy.sparse.csr_matrix
+            The global stiffness matrix, sparse if the solver uses the sparse path.
         """
-        global_matrix = np.zeros((self.degrees_of_freedom_count, self.degrees_of_freedom_count))
-        for element in self.structure.elements:
-            element_stiffness_matrix = element.global_stiffness_matrix()
-            i = 0
-            for dof_i in element.stiffness_matrix_dofs:
-                j = 0
-                for dof_j in element.stiffness_matrix_dofs:
-                    m = self.structure.degrees_of_freedom.index(dof_i)
-                    n = self.structure.degrees_of_freedom.index(dof_j)
-                    stiffness_term = element_stiffness_matrix[i, j]
-                    global_matrix[m, n] += stiffness_term
-                    j += 1
-                i += 1
+        return self.global_stiffness_matrix(self.axial_forces)
 
-        return global_matrix
+    def global_stiffness_matrix(self, axial_forces: np.ndarray = None, include_elastic=True):
+        """
+        Assembles the global stiffness matrix with one batch kernel call per element type.
+
+        Parameters
+        ----------
+        axial_forces : np.ndarray, optional
+            Axial force of each element, in the order of the structure's elements. If given, the
+            geometric stiffness of the elements that include geometric nonlinearity is added.
+        include_elastic : bool, optional
+            Whether to include the first-order elastic stiffness (default is True).
+
+        Returns
+        -------
+        np.ndarray or scipy.sparse.csr_matrix
+            The global stiffness matrix, sparse if the solver uses the sparse path.
+        """
+        return self.model.global_stiffness_matrix(axial_forces, include_elastic, self.coordinates, self.sparse)
 
-    def _free_free_matrix(self, global_matrix: np.ndarray):
+    def _free_free_matrix(self, global_matrix):
         """
         Extracts the free-free partition from the global stiffness matrix.
 
         Parameters
         ----------
-        global_matrix : np.ndarray
+        global_matrix : np.ndarray or scipy.sparse.csr_matrix
             The global stiffness matrix.
 
         Returns
         -------
-        np.ndarray
+        np.ndarray or scipy.sparse.csr_matrix
             The free-free partition of the stiffness matrix.
         """
-        f = len(self.structure.free_degrees_of_freedom)
+        f = self.model.free_count
         return global_matrix[:f, :f]
 
-    def _free_restrained_matrix(self, global_matrix: np.ndarray):
+    def _free_restrained_matrix(self, global_matrix):
         """
         Extracts the free-restrained partition from the global stiffness matrix.
 
         Parameters
         ----------
-        global_matrix : np.ndarray
+        global_matrix : np.ndarray or scipy.sparse.csr_matrix
             The global stiffness matrix.
 
         Returns
         -------
-        np.ndarray
+        np.ndarray or scipy.sparse.csr_matrix
             The free-restrained partition of the stiffness matrix.
         """
-        f = len(self.structure.free_degrees_of_freedom)
+        f = self.model.free_count
         return global_matrix[:f, f:]
 
-    def _restrained_restrained_matrix(self, global_matrix: np.ndarray):
+    def _restrained_restrained_matrix(self, global_matrix):
         """
         Extracts the restrained-restrained partition from the global stiffness matrix.
 
         Parameters
         ----------
-        global_matrix : np.ndarray
+        global_matrix : np.ndarray or scipy.sparse.csr_matrix
             The global stiffness matrix.
 
         Returns
         -------
-        np.ndarray
+        np.ndarray or scipy.sparse.csr_matrix
             The restrained-restrained partition of the stiffness matrix.
         """
-        f = len(self.structure.free_degrees_of_freedom)
+        f = self.model.free_count
         return global_matrix[f:, f:]
 
     def _restrained_displacement_vector(self):
@@ -108,20 +187,193 @@ class Solver:
         np.ndarray
             The displacement vector for restrained degrees of freedom.
         """
-        return np.array([dof.displacement for dof in self.structure.restrained_degrees_of_freedom])
+        return self.model.prescribed_displacements
 
-    def solve_first_order_elastic(self):
+    def analyze(self) -> LinearResult:
         """
         Solves for displacements and reaction forces using first-order elastic stiffness analysis.
+
+        Neither the structure nor the solver's force, displacement and reaction vectors are
+        modified; only the factorization of the free-free stiffness matrix is kept for `solve`.
+        With a `LowRankUpdateSolver` backend, as after `update`, the assembled matrix and its
+        factorization are reused until the model, axial forces or coordinates are reassigned or
+        the backend factorizes another matrix.
+
+        Returns
+        -------
+        LinearResult
+            Displacements, reactions and element end forces.
         """
-        global_matrix = self._global_stiffness_matrix
-        kff = self._free_free_matrix(global_matrix)
+        if isinstance(self.linear_solver, LowRankUpdateSolver) and self._factorization_is_current():
+            global_matrix = self._factorization[-1]
+        else:
+            global_matrix = self._global_stiffness_matrix
+            self.linear_solver.factorize(self._free_free_matrix(global_matrix))
+            self._factorization = self._factorization_key() + (global_matrix,)
         kfs = self._free_restrained_matrix(global_matrix)
         kss = self._restrained_restrained_matrix(global_matrix)
         ff = self.force_vector
         ds = self._restrained_displacement_vector()
-        self.displacement_vector = np.linalg.inv(kff).dot(ff - kfs.dot(ds))
-        self.reactions_vector = kfs.T.dot(self.displacement_vector) + kss.dot(ds)
+        displacements = self.linear_solver.solve(ff - kfs.dot(ds))
+        reactions = kfs.T.dot(displacements) + kss.dot(ds)
+        return LinearResult(self.model, self.model.full_displacement_vector(displacements), reactions,
+                            coordinates=self.coordinates)
+
+    def _factorization_key(self) -> tuple:
+        return self.model, self.axial_forces, self.coordinates, self.linear_solver, self.linear_solver.factorization
+
+    def _factorization_is_current(self) -> bool:
+        return self._factorization is not None and all(
+            stored is current for stored, current in zip(self._factorization, self._factorization_key()))
+
+    def update(self, properties: dict = None, forces: np.ndarray = None):
+        """
+        Changes element properties or nodal forces of the solver's model, updating the stiffness
+        matrix and its factorization instead of assembling and factorizing them again.
+
+        The stiffness change of the changed elements is added to the matrix assembled by the last
+        `analyze`, and to its factorization as a low-rank update: the backend is wrapped in a
+        `LowRankUpdateSolver` on the first update. Changing the stiffness of a spring is a rank-1
+        update and changing the section of a frame element one of rank 3 at most, so the next
+        `analyze` costs little more than a solve with the stored factorization. The factorization
+        is computed afresh once the accumulated rank exceeds the `max_rank` of the backend.
+        Before the first analysis, or after the axial forces or coordinates were changed, the
+        model is only replaced.
+
+        The structure the solver was created from is not changed.
+
+        Parameters
+        ----------
+        properties : dict of str to tuple, optional
+            Maps the name of a property of `batch_properties`, such as 'inertias' or
+            'rotational_stiffnesses', to the positions of the elements to change and their new
+            values, as for `CompiledModel.variant`.
+        forces : np.ndarray, optional
+            Nodal forces of all degrees of freedom in equation order.
+        """
+        model = self.model.variant(forces, properties)
+        if properties and self._factorization_is_current():
+            global_matrix = self._factorization[-1]
+            positions = np.unique(np.concatenate([np.asarray(positions, dtype=np.intp).ravel()
+                                                  for positions, _ in properties.values()]))
+            indices, change = self._stiffness_change(model, positions)
+            if not isinstance(self.linear_solver, LowRankUpdateSolver):
+                backend = self.linear_solver
+                self.linear_solver = LowRankUpdateSolver(backend)
+                self.linear_solver.adopt(self._free_free_matrix(global_matrix))
+            free = indices < self.model.free_count
+            self.linear_solver.update(indices[free], change[np.ix_(free, free)])
+            self.model = model
+            self._factorization = self._factorization_key() + (self._changed_matrix(global_matrix, indices, change),)
+        else:
+            self.model = model
+        if forces is not None:
+            self._force_vector = model.free_forces.copy()
+
+    def _stiffness_change(self, model: CompiledModel, positions: np.ndarray) -> tuple:
+        """Returns the equation numbers the changed elements touch and the change of their stiffness block."""
+        coordinates = self.model.coordinates if self.coordinates is None else self.coordinates
+        group_indices, rows = self.model.element_locations(positions)
+        dof_indices, changes = [], []
+        for group_index in np.unique(group_indices).tolist():
+            group_rows = rows[group_indices == group_index]
+            matrices = []
+            for group in (self.model.element_groups[group_index], model.element_groups[group_index]):
+                arrays = {name: values[group_rows] for name, values in group.arrays(coordinates).items()}
+                matrices.append(group.element_type.batch_global_stiffness_matrices(**arrays))
+            dof_indices.append(self.model.element_groups[group_index].dof_indices[group_rows])
+            changes.append(matrices[1] - matrices[0])
+        indices = np.unique(np.concatenate([dofs.ravel() for dofs in dof_indices]))
+        change = np.zeros((len(indices), len(indices)))
+        for dofs, element_changes in zip(dof_indices, changes):
+            local = np.searchsorted(indices, dofs)
+            np.add.at(change, (local[:, :, None], local[:, None, :]), element_changes)
+        return indices, change
+
+    def _changed_matrix(self, global_matrix, indices: np.ndarray, change: np.ndarray):
+        """Returns a copy of the global matrix with the change added to the block of the given equations."""
+        if hasattr(global_matrix, "tocsr"):
+            rows, cols = np.meshgrid(indices, indices, indexing="ij")
+            update = type(global_matrix)((change.ravel(), (rows.ravel(), cols.ravel())), shape=global_matrix.shape)
+            return (global_matrix + update).tocsr()
+        global_matrix = global_matrix.copy()
+        global_matrix[np.ix_(indices, indices)] += change
+        return global_matrix
+
+    def solve_first_order_elastic(self):
+        """
+        Solves for displacements and reaction forces using first-order elastic stiffness analysis,
+        storing them on the solver and writing them to the degrees of freedom of the structure.
+        """
+        result = self.analyze()
+        self.displacement_vector = result.free_displacements.copy()
+        self.reactions_vector = result.reactions
+
+    def solve_load_cases(self, load_cases) -> tuple:
+        """
+        Solves several load cases against a single factorization of the free-free stiffness matrix.
+
+        The load cases are solved as one multi-column right-hand side. The degrees of freedom and
+        the solver's own force, displacement and reaction vectors are left untouched. Prescribed
+        displacements of the restrained degrees of freedom apply to every case.
+
+        Parameters
+        ----------
+        load_cases : list of LoadCase or np.ndarray
+            The load cases, or forces on the free degrees of freedom of shape (n_free, n_cases).
+            Load cases require the solver to be created from a structure.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Displacements of the free degrees of freedom, of shape (n_free, n_cases), and reactions
+            of the restrained degrees of freedom, of shape (n_restrained, n_cases).
+        """
+        if isinstance(load_cases, np.ndarray):
+            forces = load_cases.reshape(self.model.free_count, -1)
+        elif self.structure is None:
+            raise ValueError("Load cases can only be solved by a solver created from a structure; "
+                             "pass the free forces as an array instead.")
+        else:
+            forces = self.structure.load_matrix(load_cases)[:self.model.free_count]
+        global_matrix = self._global_stiffness_matrix
+        kfs = self._free_restrained_matrix(global_matrix)
+        kss = self._restrained_restrained_matrix(global_matrix)
+        ds = self._restrained_displacement_vector()
+        self.linear_solver.factorize(self._free_free_matrix(global_matrix))
+        displacements = self.linear_solver.solve(forces - kfs.dot(ds)[:, None])
+        reactions = kfs.T.dot(displacements) + kss.dot(ds)[:, None]
+        return displacements, np.asarray(reactions)
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solves the free-free system for further right-hand sides, reusing the factorization of the
+        last `solve_first_order_elastic` call.
+
+        Parameters
+        ----------
+        rhs : np.ndarray
+            Right-hand side vector for the free degrees of freedom, or matrix with one right-hand
+            side per column.
+
+        Returns
+        -------
+        np.ndarray
+            The solution, with the same shape as `rhs`.
+        """
+        return self.linear_solver.solve(rhs)
+
+    def element_end_forces(self) -> list:
+        """
+        Computes the local first-order end forces of every element from the current displacements.
+
+        Returns
+        -------
+        list of np.ndarray
+            Local end forces of each element group of the compiled model, of shape (n_elements, n_dofs).
+        """
+        displacements = self.model.full_displacement_vector(self.displacement_vector)
+        return self.model.element_end_forces(displacements, coordinates=self.coordinates)
 
     @property
     def force_vector(self) -> np.ndarray:
@@ -145,10 +397,9 @@ class Solver:
         value : np.ndarray
             New force values for the free degrees of freedom, updating the associated DOFs in the structure.
         """
-        i = 0
-        for dof in self.structure.free_degrees_of_freedom:
-            dof.force = value[i]
-            i += 1
+        if self.structure is not None:
+            for dof, force in zip(self.structure.free_degrees_of_freedom, value):
+                dof.force = force
         self._force_vector = value
 
     @property
@@ -166,17 +417,16 @@ class Solver:
     @displacement_vector.setter
     def displacement_vector(self, value: np.ndarray):
         """
-        Gets the reaction forces vector for restrained degrees of freedom.
+        Sets the displacement vector for free degrees of freedom.
 
-        Returns
-        -------
-        np.ndarray
-            The reactions vector for restrained degrees of freedom.
+        Parameters
+        ----------
+        value : np.ndarray
+            Displacements of the free degrees of freedom, updating the associated DOFs in the structure.
         """
-        i = 0
-        for dof in self.structure.free_degrees_of_freedom:
-            dof.displacement = value[i]
-            i += 1
+        if self.structure is not None:
+            for dof, displacement in zip(self.structure.free_degrees_of_freedom, value):
+                dof.displacement = displacement
         self._displacement_vector = value
 
     @property
@@ -201,8 +451,7 @@ class Solver:
         value : np.ndarray
              Reaction values for the restrained degrees of freedom, updating the associated DOFs in the structure.
         """
-        i = 0
-        for dof in self.structure.restrained_degrees_of_freedom:
-            dof.force = value[i]
-            i += 1
+        if self.structure is not None:
+            for dof, reaction in zip(self.structure.restrained_degrees_of_freedom, value):
+                dof.force = reaction
         self._reactions_vector = value
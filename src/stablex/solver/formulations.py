@@ -0,0 +1,170 @@
+import numpy as np
+
+from stablex.compiled_model import CompiledModel
+
+
+class Formulation:
+    """
+    Base class of the kinematic formulations of the nonlinear solver.
+
+    A formulation maps the total displacements of a compiled model to the internal force vector
+    and the tangent stiffness matrix that the equilibrium iterations of `NonlinearSolver` need.
+
+    Parameters
+    ----------
+    model : CompiledModel
+        The compiled model to evaluate.
+
+    Attributes
+    ----------
+    name : str
+        Name under which the formulation is registered in `FORMULATIONS`.
+    model : CompiledModel
+        The compiled model to evaluate.
+
+    Methods
+    -------
+    evaluate(displacements, tangent, sparse) -> tuple
+        Computes the internal forces, the tangent stiffness matrix and the element end forces.
+    """
+    name = None
+
+    def __init__(self, model: CompiledModel):
+        self.model = model
+
+    def evaluate(self, displacements: np.ndarray, tangent: bool = True, sparse: bool = False) -> tuple:
+        """
+        Computes the internal forces, the tangent stiffness matrix and the element end forces.
+
+        Parameters
+        ----------
+        displacements : np.ndarray
+            Total displacements of all degrees of freedom, in equation order.
+        tangent : bool, optional
+            Whether to assemble the tangent stiffness matrix (default is True).
+        sparse : bool, optional
+            Whether to return the tangent stiffness matrix in sparse format (default is False).
+
+        Returns
+        -------
+        tuple
+            The internal force vector of all degrees of freedom, the global tangent stiffness
+            matrix (None if not requested) and the local end forces of each element group.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement evaluate.")
+
+
+class SecondOrderFormulation(Formulation):
+    """
+    Second-order formulation in the initial configuration.
+
+    Each element evaluates its average Green-Lagrange axial strain, so the internal forces include
+    the P-Δ and P-δ effects of the axial forces and the tangent stiffness is their exact
+    derivative. The formulation is accurate for moderate rotations; elements without geometric
+    nonlinearity stay linear. See `batch_second_order_end_forces`.
+    """
+    name = "second_order"
+
+    def evaluate(self, displacements, tangent=True, sparse=False):
+        model = self.model
+        internal_forces = np.zeros(model.dof_count)
+        data = []
+        end_forces = []
+        for group in model.element_groups:
+            arrays = group.arrays(model.coordinates)
+            group_end_forces, matrices = group.element_type.batch_second_order_end_forces(
+                displacements[group.dof_indices], group.geometric_nonlinearity, **arrays)
+            global_end_forces = group.element_type.batch_global_end_forces(group_end_forces, **arrays)
+            np.add.at(internal_forces, group.dof_indices, global_end_forces)
+            end_forces.append(group_end_forces)
+            data.append(matrices.ravel())
+        matrix = None
+        if tangent:
+            data = np.concatenate(data) if data else np.zeros(0)
+            matrix = model.scatter_plan.assemble(data, sparse)
+        return internal_forces, matrix, end_forces
+
+
+class CorotationalFormulation(Formulation):
+    """
+    Corotational formulation for large displacements and rotations.
+
+    The rigid body motion of each element is removed by a frame that follows its chord, so the
+    element stays linear elastic in that frame while the structure undergoes arbitrarily large
+    rotations. All elements of a group are evaluated from the current nodal configuration in one
+    vectorized kernel call, `batch_corotational_end_forces`. Elements without geometric
+    nonlinearity stay linear.
+
+    The deformations and local end forces of each group are kept in preallocated buffers that
+    every evaluation overwrites.
+
+    Attributes
+    ----------
+    deformations : list of np.ndarray
+        End displacements of each element in its corotated frame, per group, of shape
+        (n_elements, n_dofs). Zero for elements without geometric nonlinearity.
+    end_forces : list of np.ndarray
+        Local end forces of the last evaluation, per group, of shape (n_elements, n_dofs).
+    """
+    name = "corotational"
+
+    def __init__(self, model: CompiledModel):
+        super().__init__(model)
+        self.deformations = [np.zeros(group.dof_indices.shape) for group in model.element_groups]
+        self.end_forces = [np.zeros(group.dof_indices.shape) for group in model.element_groups]
+        self._arrays = [group.arrays(model.coordinates) for group in model.element_groups]
+
+    def evaluate(self, displacements, tangent=True, sparse=False):
+        model = self.model
+        internal_forces = np.zeros(model.dof_count)
+        data = []
+        for group, arrays, deformations, end_forces in zip(model.element_groups, self._arrays, self.deformations,
+                                                           self.end_forces):
+            element_type = group.element_type
+            end_displacements = displacements[group.dof_indices]
+            _, global_end_forces, matrices = element_type.batch_corotational_end_forces(
+                end_displacements, deformations, end_forces, **arrays)
+            linear = ~group.geometric_nonlinearity
+            if np.any(linear):
+                linear_arrays = {name: values[linear] for name, values in arrays.items()}
+                deformations[linear] = 0
+                end_forces[linear] = element_type.batch_local_end_forces(end_displacements[linear], **linear_arrays)
+                global_end_forces[linear] = element_type.batch_global_end_forces(end_forces[linear], **linear_arrays)
+                matrices[linear] = element_type.batch_global_stiffness_matrices(**linear_arrays)
+            np.add.at(internal_forces, group.dof_indices, global_end_forces)
+            data.append(matrices.ravel())
+        matrix = None
+        if tangent:
+            data = np.concatenate(data) if data else np.zeros(0)
+            matrix = model.scatter_plan.assemble(data, sparse)
+        return internal_forces, matrix, [end_forces.copy() for end_forces in self.end_forces]
+
+
+FORMULATIONS = {formulation.name: formulation for formulation in (SecondOrderFormulation, CorotationalFormulation)}
+
+
+def make_formulation(formulation, model: CompiledModel) -> Formulation:
+    """
+    Creates a formulation for a compiled model.
+
+    Parameters
+    ----------
+    formulation : str, type or Formulation
+        Name of a formulation in `FORMULATIONS`, a `Formulation` subclass or an instance, which is
+        returned as is.
+    model : CompiledModel
+        The compiled model to evaluate.
+
+    Returns
+    -------
+    Formulation
+        The formulation.
+    """
+    if isinstance(formulation, Formulation):
+        return formulation
+    if isinstance(formulation, type) and issubclass(formulation, Formulation):
+        return formulation(model)
+    try:
+        return FORMULATIONS[formulation](model)
+    except KeyError:
+        raise ValueError(f"Unknown formulation '{formulation}'. Available: {', '.join(FORMULATIONS)}.") from None
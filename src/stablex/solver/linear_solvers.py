@@ -0,0 +1,445 @@
+import numpy as np
+
+from stablex.solver.assembly import import_scipy_sparse
+
+
+def import_scipy_linalg():
+    """
+    Imports `scipy.linalg` on demand.
+
+    Returns
+    -------
+    module or None
+        The `scipy.linalg` module, or None if SciPy is not installed.
+    """
+    try:
+        from scipy import linalg
+    except ImportError:
+        return None
+    return linalg
+
+
+def _dense(matrix) -> np.ndarray:
+    """Returns the matrix as a dense array."""
+    return matrix.toarray() if hasattr(matrix, "toarray") else np.asarray(matrix, dtype=float)
+
+
+class LinearSolver:
+    """
+    Base class of the linear solver backends.
+
+    A backend factorizes a symmetric matrix once and then solves any number of right-hand sides
+    with the stored factorization.
+
+    Attributes
+    ----------
+    name : str
+        Name under which the backend is registered in `LINEAR_SOLVERS`.
+    size : int
+        Number of rows of the factorized matrix, 0 before the first factorization.
+
+    Methods
+    -------
+    factorize(matrix)
+        Factorizes the matrix and stores the factors.
+    solve(rhs) -> np.ndarray
+        Solves for one right-hand side vector or for the columns of a right-hand side matrix.
+    """
+    name = None
+
+    def __init__(self):
+        self.size = 0
+        self._factors = None
+
+    @property
+    def factorized(self) -> bool:
+        """Whether a factorization is stored."""
+        return self._factors is not None
+
+    @property
+    def factorization(self):
+        """
+        The stored factorization, or None before the first factorization.
+
+        The object is replaced by every `factorize` call, so comparing it by identity tells whether
+        the matrix has been factorized again. It is backend specific and must not be changed.
+        """
+        return self._factors
+
+    def factorize(self, matrix):
+        """
+        Factorizes the matrix and stores the factors.
+
+        Parameters
+        ----------
+        matrix : np.ndarray or scipy.sparse matrix
+            Square symmetric matrix.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement factorize.")
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solves the factorized system for the given right-hand side.
+
+        Parameters
+        ----------
+        rhs : np.ndarray
+            Right-hand side vector, or matrix with one right-hand side per column.
+
+        Returns
+        -------
+        np.ndarray
+            The solution, with the same shape as `rhs`.
+        """
+        if not self.factorized:
+            raise RuntimeError("The linear solver has no factorization; call factorize first.")
+        return self._solve(np.asarray(rhs, dtype=float))
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        raise NotImplementedError(f"{type(self).__name__} does not implement solve.")
+
+
+class DenseCholeskySolver(LinearSolver):
+    """
+    Dense Cholesky factorization through LAPACK.
+
+    Matrices that are not positive definite, such as tangent matrices past a limit point, fall back
+    to an LU factorization. Without SciPy the matrix is kept and every right-hand side is solved
+    with `numpy.linalg.solve`.
+
+    Attributes
+    ----------
+    method : str
+        Factorization in use: 'cholesky', 'lu' or 'numpy'.
+    """
+    name = "cholesky"
+
+    def factorize(self, matrix):
+        matrix = _dense(matrix)
+        self.size = len(matrix)
+        linalg = import_scipy_linalg()
+        if linalg is None:
+            self.method, self._factors = "numpy", matrix
+            return
+        try:
+            self.method, self._factors = "cholesky", linalg.cho_factor(matrix)
+        except linalg.LinAlgError:
+            self.method, self._factors = "lu", linalg.lu_factor(matrix)
+
+    def _solve(self, rhs):
+        if self.method == "numpy":
+            return np.linalg.solve(self._factors, rhs)
+        linalg = import_scipy_linalg()
+        if self.method == "cholesky":
+            return linalg.cho_solve(self._factors, rhs)
+        return linalg.lu_solve(self._factors, rhs)
+
+
+class DenseLDLSolver(LinearSolver):
+    """
+    Dense symmetric indefinite LDLᵀ factorization through LAPACK (Bunch-Kaufman pivoting).
+
+    By Sylvester's law of inertia, the block diagonal factor D has as many negative eigenvalues as
+    the factorized matrix, which `negative_eigenvalue_count` reports. Requires SciPy.
+    """
+    name = "ldl"
+
+    def negative_eigenvalue_count(self) -> int:
+        """
+        Counts the negative eigenvalues of the factorized matrix.
+
+        Returns
+        -------
+        int
+            Number of negative eigenvalues.
+        """
+        if not self.factorized:
+            raise RuntimeError("The linear solver has no factorization; call factorize first.")
+        d_banded = self._factors[1]
+        if self.size == 0:
+            return 0
+        eigenvalues = import_scipy_linalg().eigvalsh_tridiagonal(d_banded[1], d_banded[0, 1:])
+        return int(np.count_nonzero(eigenvalues < 0))
+
+    def factorize(self, matrix):
+        linalg = import_scipy_linalg()
+        if linalg is None:
+            raise ImportError("The LDL backend requires scipy. Install it with `pip install scipy`.")
+        matrix = _dense(matrix)
+        self.size = len(matrix)
+        lu, d, perm = linalg.ldl(matrix, lower=True)
+        d_banded = np.zeros((3, self.size))
+        d_banded[0, 1:] = np.diagonal(d, 1)
+        d_banded[1] = np.diagonal(d)
+        d_banded[2, :-1] = np.diagonal(d, -1)
+        self._factors = (lu[perm], d_banded, perm)
+
+    def _solve(self, rhs):
+        linalg = import_scipy_linalg()
+        triangular, d_banded, perm = self._factors
+        y = linalg.solve_triangular(triangular, rhs[perm], lower=True, unit_diagonal=True)
+        y = linalg.solve_banded((1, 1), d_banded, y)
+        y = linalg.solve_triangular(triangular.T, y, lower=False, unit_diagonal=True)
+        solution = np.empty_like(y)
+        solution[perm] = y
+        return solution
+
+
+class BandedCholeskySolver(LinearSolver):
+    """
+    Banded Cholesky factorization through LAPACK.
+
+    The half bandwidth is taken from the nonzero pattern of the matrix, so the backend pays off when
+    the degrees of freedom are numbered along the structure. Matrices that are not positive
+    definite fall back to the dense LU factorization. Requires SciPy.
+
+    Attributes
+    ----------
+    bandwidth : int
+        Half bandwidth of the factorized matrix.
+    """
+    name = "banded"
+
+    def factorize(self, matrix):
+        linalg = import_scipy_linalg()
+        if linalg is None:
+            raise ImportError("The banded backend requires scipy. Install it with `pip install scipy`.")
+        if hasattr(matrix, "tocoo"):
+            coo = matrix.tocoo()
+            rows, cols = coo.row[coo.data != 0], coo.col[coo.data != 0]
+        else:
+            matrix = np.asarray(matrix, dtype=float)
+            rows, cols = np.nonzero(matrix)
+        self.size = matrix.shape[0]
+        self.bandwidth = int(np.max(np.abs(cols - rows), initial=0))
+        upper = np.zeros((self.bandwidth + 1, self.size))
+        for k in range(self.bandwidth + 1):
+            upper[self.bandwidth - k, k:] = matrix.diagonal(k)
+        try:
+            self.method, self._factors = "cholesky", linalg.cholesky_banded(upper)
+        except linalg.LinAlgError:
+            self.method, self._factors = "lu", linalg.lu_factor(_dense(matrix))
+
+    def _solve(self, rhs):
+        linalg = import_scipy_linalg()
+        if self.method == "cholesky":
+            return linalg.cho_solve_banded((self._factors, False), rhs)
+        return linalg.lu_solve(self._factors, rhs)
+
+
+class SparseLUSolver(LinearSolver):
+    """
+    Sparse direct LU factorization (SuperLU). Requires SciPy.
+    """
+    name = "sparse"
+
+    def factorize(self, matrix):
+        sparse = import_scipy_sparse()
+        from scipy.sparse.linalg import splu
+        self.size = matrix.shape[0]
+        self._factors = splu(sparse.csc_matrix(matrix))
+
+    def _solve(self, rhs):
+        return self._factors.solve(rhs)
+
+
+class SparseLDLSolver(LinearSolver):
+    """
+    Sparse symmetric factorization through SuperLU with a symmetric fill-reducing ordering and diagonal pivoting.
+
+    Without off-diagonal pivots the LU factors of a symmetric matrix are L·(D·Lᵀ), so the diagonal of U
+    is the diagonal factor D and `negative_eigenvalue_count` reads the inertia from it, as the dense
+    LDLᵀ backend does, without densifying the matrix. Requires SciPy.
+    """
+    name = "sparse_ldl"
+
+    def negative_eigenvalue_count(self) -> int:
+        """
+        Counts the negative eigenvalues of the factorized matrix.
+
+        Returns
+        -------
+        int
+            Number of negative eigenvalues.
+        """
+        if not self.factorized:
+            raise RuntimeError("The linear solver has no factorization; call factorize first.")
+        if not np.array_equal(self._factors.perm_r, self._factors.perm_c):
+            raise np.linalg.LinAlgError("A zero pivot forced an off-diagonal pivot; the inertia is not available.")
+        return int(np.count_nonzero(self._factors.U.diagonal() < 0))
+
+    def factorize(self, matrix):
+        sparse = import_scipy_sparse()
+        from scipy.sparse.linalg import splu
+        self.size = matrix.shape[0]
+        self._factors = splu(sparse.csc_matrix(matrix), permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.,
+                             options={"SymmetricMode": True})
+
+    def _solve(self, rhs):
+        return self._factors.solve(rhs)
+
+
+class LowRankUpdateSolver(LinearSolver):
+    """
+    Keeps the factorization of another backend up to date with symmetric low-rank changes of the matrix.
+
+    `update` adds a change ΔK confined to a few rows and columns, such as the stiffness change of
+    a spring or of an element section. The changes since the last factorization of K₀ are
+    accumulated in one dense block over the rows they touch, whose eigendecomposition
+    ΔK = U·C·Uᵀ gives their rank r, and systems with K₀ + ΔK are solved with the
+    Sherman-Morrison-Woodbury identity
+
+        (K₀ + U·C·Uᵀ)⁻¹·b = y - Z·(I + C·Uᵀ·Z)⁻¹·C·Uᵀ·y,  y = K₀⁻¹·b,  Z = K₀⁻¹·U.
+
+    A solve costs one solve with K₀ plus O(n·r), and an update r solves with K₀. Once the
+    accumulated rank exceeds `max_rank`, or the update makes the capacitance matrix singular, the
+    changed matrix is factorized afresh and becomes the new K₀. K₀ is kept for that without a
+    copy, so it must not be modified in place.
+
+    Parameters
+    ----------
+    backend : str, type or LinearSolver, optional
+        Backend that factorizes K₀, as for `make_linear_solver` (default is 'cholesky').
+    max_rank : int, optional
+        Largest accumulated rank solved with the Woodbury identity (default is 32).
+
+    Attributes
+    ----------
+    backend : LinearSolver
+        The backend holding the factorization of K₀.
+    rank : int
+        Rank of the changes accumulated since the last factorization.
+    refactorization_count : int
+        Number of factorizations that `update` fell back to.
+    """
+    name = "low_rank"
+
+    def __init__(self, backend="cholesky", max_rank: int = 32):
+        super().__init__()
+        self.backend = make_linear_solver(backend)
+        self.max_rank = max_rank
+        self.refactorization_count = 0
+        self._matrix = None
+        self._clear_updates()
+
+    def _clear_updates(self):
+        self.rank = 0
+        self._indices = np.zeros(0, dtype=np.intp)
+        self._change = np.zeros((0, 0))
+        self._basis = self._solved_basis = self._correction = None
+        self._factors = None if self._matrix is None else (self.backend.factorization, self._change)
+
+    def factorize(self, matrix):
+        self.backend.factorize(matrix)
+        self.size = self.backend.size
+        self._matrix = matrix
+        self._clear_updates()
+
+    def adopt(self, matrix):
+        """
+        Takes over the factorization that the backend already holds.
+
+        Parameters
+        ----------
+        matrix : np.ndarray or scipy.sparse matrix
+            The matrix the backend has factorized, kept to factorize the changed matrix afresh.
+        """
+        if not self.backend.factorized:
+            raise RuntimeError("The backend has no factorization to adopt.")
+        self.size = self.backend.size
+        self._matrix = matrix
+        self._clear_updates()
+
+    def update(self, indices: np.ndarray, change: np.ndarray):
+        """
+        Adds a symmetric change to the factorized matrix.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Rows and columns of the matrix that the change touches.
+        change : np.ndarray
+            The change of the block of those rows and columns, of shape (n_indices, n_indices).
+        """
+        if not self.factorized:
+            raise RuntimeError("The linear solver has no factorization; call factorize first.")
+        indices = np.asarray(indices, dtype=np.intp).ravel()
+        change = np.asarray(change, dtype=float)
+        if change.shape != (len(indices), len(indices)):
+            raise ValueError(f"Expected a change of shape {(len(indices), len(indices))}, got {change.shape}.")
+        union = np.union1d(self._indices, indices)
+        accumulated = np.zeros((len(union), len(union)))
+        previous = np.searchsorted(union, self._indices)
+        accumulated[np.ix_(previous, previous)] = self._change
+        added = np.searchsorted(union, indices)
+        np.add.at(accumulated, np.ix_(added, added), change)
+        accumulated = (accumulated + accumulated.T) / 2
+
+        values, vectors = np.linalg.eigh(accumulated)
+        kept = np.abs(values) > 1e-12 * np.max(np.abs(values), initial=0.)
+        rank = int(np.count_nonzero(kept))
+        if rank > self.max_rank:
+            self._refactorize(union, accumulated)
+            return
+        basis, coupling = vectors[:, kept], values[kept]
+        expanded = np.zeros((self.size, rank))
+        expanded[union] = basis
+        solved_basis = self.backend.solve(expanded)
+        capacitance = np.eye(rank) + coupling[:, None] * (basis.T @ solved_basis[union])
+        try:
+            correction = np.linalg.solve(capacitance, np.diag(coupling))
+        except np.linalg.LinAlgError:
+            self._refactorize(union, accumulated)
+            return
+        self.rank = rank
+        self._indices, self._change = union, accumulated
+        self._basis, self._solved_basis, self._correction = basis, solved_basis, correction
+        self._factors = (self.backend.factorization, self._change)
+
+    def _refactorize(self, indices, change):
+        if hasattr(self._matrix, "tocsr"):
+            rows, cols = np.meshgrid(indices, indices, indexing="ij")
+            update = import_scipy_sparse().csr_matrix((change.ravel(), (rows.ravel(), cols.ravel())),
+                                                      shape=self._matrix.shape)
+            matrix = (self._matrix + update).tocsr()
+        else:
+            matrix = np.array(self._matrix, dtype=float)
+            matrix[np.ix_(indices, indices)] += change
+        self.factorize(matrix)
+        self.refactorization_count += 1
+
+    def _solve(self, rhs):
+        solution = self.backend.solve(rhs)
+        if not self.rank:
+            return solution
+        return solution - self._solved_basis @ (self._correction @ (self._basis.T @ solution[self._indices]))
+
+
+LINEAR_SOLVERS = {backend.name: backend for backend in
+                  (DenseCholeskySolver, DenseLDLSolver, BandedCholeskySolver, SparseLUSolver, SparseLDLSolver,
+                   LowRankUpdateSolver)}
+
+
+def make_linear_solver(backend) -> LinearSolver:
+    """
+    Creates a linear solver backend.
+
+    Parameters
+    ----------
+    backend : str, type or LinearSolver
+        Name of a backend in `LINEAR_SOLVERS`, a `LinearSolver` subclass or an instance, which is
+        returned as is.
+
+    Returns
+    -------
+    LinearSolver
+        The linear solver.
+    """
+    if isinstance(backend, LinearSolver):
+        return backend
+    if isinstance(backend, type) and issubclass(backend, LinearSolver):
+        return backend()
+    try:
+        return LINEAR_SOLVERS[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown linear solver '{backend}'. Available: {', '.join(LINEAR_SOLVERS)}.") from None
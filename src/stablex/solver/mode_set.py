@@ -0,0 +1,107 @@
+import numpy as np
+
+from stablex.compiled_model import CompiledModel
+
+
+class ModeSet:
+    """
+    Buckling load factors and mode shapes returned by `EigenSolver.solve_modes`.
+
+    The mode shapes are stored for the free degrees of freedom only. Per-node displacements are
+    expanded on request and cached.
+
+    Parameters
+    ----------
+    load_factors : np.ndarray
+        Load factors in ascending order, of shape (k,).
+    modes : np.ndarray
+        Mode shapes of the free degrees of freedom, one per column, of shape (n_free, k).
+    model : CompiledModel
+        The compiled model the modes were computed for.
+
+    Attributes
+    ----------
+    load_factors : np.ndarray
+        Load factors in ascending order. Repeated load factors of symmetric structures are kept.
+    modes : np.ndarray
+        Mode shapes of the free degrees of freedom, one per column, each scaled to a unit norm.
+    model : CompiledModel
+        The compiled model the modes were computed for.
+
+    Notes
+    -----
+    Modes are numbered from 1, like the `mode_shape` argument of `EigenSolver.solve`.
+    """
+    def __init__(self, load_factors: np.ndarray, modes: np.ndarray, model: CompiledModel):
+        self.load_factors = np.asarray(load_factors, dtype=float)
+        self.modes = np.asarray(modes, dtype=float)
+        self.load_factors.flags.writeable = False
+        self.modes.flags.writeable = False
+        self.model = model
+        self._node_displacements = {}
+
+    def __len__(self):
+        return len(self.load_factors)
+
+    def __iter__(self):
+        return iter(zip(self.load_factors, self.modes.T))
+
+    def __repr__(self):
+        return f"ModeSet(load_factors={np.array2string(self.load_factors, precision=6)})"
+
+    def mode(self, mode_shape: int) -> np.ndarray:
+        """
+        Gets the shape of a mode for the free degrees of freedom.
+
+        Parameters
+        ----------
+        mode_shape : int
+            The mode number, starting at 1.
+
+        Returns
+        -------
+        np.ndarray
+            Displacements of the free degrees of freedom.
+        """
+        return self.modes[:, self._column(mode_shape)]
+
+    def node_displacements(self, mode_shape: int) -> np.ndarray:
+        """
+        Expands a mode shape to per-node x, y and rz displacements.
+
+        Parameters
+        ----------
+        mode_shape : int
+            The mode number, starting at 1.
+
+        Returns
+        -------
+        np.ndarray
+            Nodal displacements of shape (n_nodes, 3), in the order of the model's nodes.
+        """
+        column = self._column(mode_shape)
+        if column not in self._node_displacements:
+            displacements = np.zeros(self.model.dof_count)
+            displacements[:self.model.free_count] = self.modes[:, column]
+            self._node_displacements[column] = self.model.node_displacements(displacements)
+        return self._node_displacements[column]
+
+    def apply(self, structure, mode_shape: int):
+        """
+        Writes a mode shape to the free degrees of freedom of a structure, e.g. for plotting.
+
+        Parameters
+        ----------
+        structure : Structure
+            The structure the modes were computed for.
+        mode_shape : int
+            The mode number, starting at 1.
+        """
+        mode = self.mode(mode_shape)
+        for dof, displacement in zip(structure.free_degrees_of_freedom, mode):
+            dof.displacement = displacement
+
+    def _column(self, mode_shape: int) -> int:
+        if not 1 <= mode_shape <= len(self):
+            raise IndexError(f"Mode {mode_shape} is out of range; the set holds modes 1 to {len(self)}.")
+        return mode_shape - 1
@@ -1,102 +1,620 @@
+import os
+
 import numpy as np
 
-from src.stablex.degree_of_freedom import DegreeOfFreedom
-from src.stablex.solver.first_order_solver import Solver
-from src.stablex.structure import Structure
+from stablex.compiled_model import CompiledModel
+from stablex.degree_of_freedom import DegreeOfFreedom
+from stablex.solver.first_order_solver import Solver
+from stablex.solver.formulations import Formulation, make_formulation
+from stablex.solver.linear_solvers import LinearSolver, make_linear_solver
+from stablex.solver.recorder import Recorder
+from stablex.solver.results import NonlinearResult
+from stablex.structure import Structure
 
 
 class NonlinearSolver:
     """
-    A class for solving nonlinear structural problems using an incremental approach.
+    A class for solving nonlinear structural problems.
+
+    `analyze_newton_raphson` traces the load-displacement path with Newton-Raphson equilibrium
+    iterations on the internal forces of a `Formulation` and an adaptive load step.
+    `analyze_arc_length` follows the path with an adaptive arc length instead, through limit points.
+    `analyze` applies equal load steps with a single linear solve per step and no equilibrium
+    iterations. Both return an immutable `NonlinearResult` and leave the structure untouched;
+    `solve_newton_raphson` and `solve_incrementally` also write the displacements to the structure.
+    The path-following analyses record the load and the displacement of one degree of freedom;
+    a `Recorder` records any further responses. Given a `checkpoint` path, they save their state at
+    regular step intervals and resume from the saved state when the path exists, continuing exactly
+    as the interrupted analysis would have.
 
     **Warning**: This solver is currently under development. It should not be used or should be used with caution,
     as it may undergo changes in future releases.
 
     Attributes:
-        structure (Structure): The structure to be analyzed.
+        structure (Structure or CompiledModel): The structure to be analyzed.
+        model (CompiledModel): The compiled model the solver operates on.
         load (list): A list to store applied loads at each step.
         displacement (list): A list to store cumulative displacements.
+        coordinates (np.array): Current nodal coordinates of shape (n_nodes, 2).
         cumulative_displacement_vector (np.array): A vector of cumulative displacements for free degrees of freedom.
-        cumulative_element_end_forces (list): Cumulative end forces for elements with geometric nonlinearity.
-        cumulative_element_global_end_forces (list): Cumulative global end forces for elements with geometric nonlinearity.
+        cumulative_element_end_forces (list): Cumulative local end forces of each element group of the compiled
+            model, of shape (n_elements, n_dofs). Only elements with geometric nonlinearity accumulate forces.
+        formulation (Formulation): Internal forces and tangent stiffness of the Newton-Raphson iterations.
+        linear_solver (LinearSolver): The backend factorizing the tangent stiffness matrix.
+        load_factor (float): Load factor of the last converged Newton-Raphson or arc-length step.
+        step_size (float): Load factor increment of the next Newton-Raphson step, or arc length of the next
+            arc-length step.
+        factorization_count (int): Number of tangent factorizations of the last path-following analysis.
+        iteration_count (int): Number of equilibrium iterations of the last path-following analysis.
+        tolerance (float): Relative tolerance of the residual force norm, against the applied load.
+        displacement_tolerance (float): Relative tolerance of the iterative displacement norm, against the total
+            displacement.
+        max_iterations (int): Equilibrium iterations after which a step is cut back.
+        desired_iterations (int): Iterations per step the step size adaptation aims for, doubled for modified
+            Newton-Raphson.
+        refactorization_ratio (float): In modified Newton-Raphson, the tangent is refactorized when an iteration
+            reduces the residual norm by less than this ratio.
     """
-    def __init__(self, structure: Structure):
+    tolerance = 1e-8
+    displacement_tolerance = 1e-8
+    max_iterations = 20
+    desired_iterations = 5
+    refactorization_ratio = 0.5
+
+    def __init__(self, structure, formulation="second_order", sparse: bool = None, linear_solver=None):
         """
         Initializes the NonlinearSolver with a given structure.
 
         Args:
-            structure (Structure): The structure to be solved.
+            structure (Structure or CompiledModel): The structure to be solved. Results are written back to the
+                degrees of freedom of a structure; a compiled model is analyzed as is.
+            formulation (str, type or Formulation): Formulation of the Newton-Raphson iterations:
+                'second_order' (the default) or 'corotational' for large rotations (see `FORMULATIONS`).
+            sparse (bool): Whether to assemble and factorize the tangent in sparse format. Defaults to the choice
+                of `Solver` for the model size.
+            linear_solver (str or LinearSolver): Backend factorizing the tangent, as for `Solver`.
         """
         self.structure = structure
+        self.model = structure if isinstance(structure, CompiledModel) else structure.compile()
+        if sparse is None:
+            sparse = Solver.default_sparse(self.model.dof_count)
+        self.sparse = sparse
+        self.formulation: Formulation = make_formulation(formulation, self.model)
+        self.linear_solver: LinearSolver = make_linear_solver(linear_solver or ("sparse" if sparse else "cholesky"))
+        self.load_factor = 0.
+        self.step_size = 0.
+        self.factorization_count = 0
+        self.iteration_count = 0
         self.load = []
         self.displacement = []
-        self.cumulative_displacement_vector = np.array([dof.displacement for dof
-                                                        in self.structure.free_degrees_of_freedom], dtype='float64')
+        self.coordinates = self.model.coordinates.copy()
+        self.cumulative_displacement_vector = np.zeros(self.model.free_count)
+        self.cumulative_element_end_forces = [np.zeros(group.dof_indices.shape, dtype='float64')
+                                              for group in self.model.element_groups]
+        self._increment = np.zeros(self.model.dof_count)
+        self._previous_coordinates = self.coordinates.copy()
+        self._previous_axial_forces = np.zeros(self.model.element_count)
 
-        self.cumulative_element_end_forces = [np.zeros(len(element.stiffness_matrix_dofs)) for element
-                                              in self.structure.elements if element.geometric_nonlinearity]
+    def dof_index(self, dof) -> int:
+        """
+        Returns the equation number of a degree of freedom, found with `CompiledModel.dof_index`.
 
-        self.cumulative_element_global_end_forces = [np.zeros(len(element.stiffness_matrix_dofs)) for element
-                                                     in self.structure.elements if element.geometric_nonlinearity]
+        Args:
+            dof (DegreeOfFreedom or int): A degree of freedom of the structure, or its equation number.
 
-    def solve_incrementally(self, number_of_steps: int, recorded_dof_load: DegreeOfFreedom,
-                            recorded_dof: DegreeOfFreedom):
+        Returns:
+            int: The equation number.
         """
-         Solves the nonlinear problem incrementally over a specified number of steps.
+        return self.model.dof_index(dof)
 
-         Args:
-             number_of_steps (int): The number of increments to divide the load application.
-             recorded_dof_load (DegreeOfFreedom): The degree of freedom associated with the load.
-             recorded_dof (DegreeOfFreedom): The degree of freedom to record displacements for.
-         """
-        solver = Solver(self.structure)
+    def analyze(self, number_of_steps: int, recorded_dof_load: DegreeOfFreedom, recorded_dof: DegreeOfFreedom):
+        """
+        Solves the nonlinear problem incrementally over a specified number of steps without
+        modifying the structure.
+
+        Args:
+            number_of_steps (int): The number of increments to divide the load application.
+            recorded_dof_load (DegreeOfFreedom or int): The degree of freedom associated with the load.
+            recorded_dof (DegreeOfFreedom or int): The degree of freedom to record displacements for.
+
+        Returns:
+            NonlinearResult: Cumulative displacements, reactions and end forces, and the load-displacement
+            history of the recorded degree of freedom.
+        """
+        solver = Solver(self.model)
         step = 0
         cumulative_recorded_dof_displacement = 0
+        load_index = self.dof_index(recorded_dof_load)
+        recorded_index = self.dof_index(recorded_dof)
+        step_load = self.model.forces[load_index] / number_of_steps
         solver.force_vector = solver.force_vector / number_of_steps
+        reactions = np.zeros(self.model.dof_count - self.model.free_count)
         while step <= number_of_steps:
             self.update_element_stiffness_matrix()
-            solver.solve_first_order_elastic()
-            self.cumulative_displacement_vector += solver.displacement_vector
-            self.load.append(abs(recorded_dof_load.force * step))
-            cumulative_recorded_dof_displacement += abs(recorded_dof.displacement)
+            solver.coordinates = self.coordinates
+            solver.axial_forces = self._previous_axial_forces
+            result = solver.analyze()
+            self.cumulative_displacement_vector += result.free_displacements
+            reactions += result.reactions
+            self._increment = np.array(result.displacements)
+            self.load.append(abs(step_load * step))
+            cumulative_recorded_dof_displacement += abs(self._increment[recorded_index])
             self.displacement.append(cumulative_recorded_dof_displacement)
             self.update_coordinates()
             step += 1
 
-        solver.displacement_vector = self.cumulative_displacement_vector
         self.reset_node_coordinates()
+        return NonlinearResult(self.model, self.model.full_displacement_vector(self.cumulative_displacement_vector),
+                               reactions, self.cumulative_element_end_forces, self.load, self.displacement)
+
+    def solve_incrementally(self, number_of_steps: int, recorded_dof_load: DegreeOfFreedom,
+                            recorded_dof: DegreeOfFreedom):
+        """
+         Solves the nonlinear problem incrementally over a specified number of steps and writes the
+         cumulative displacements to the degrees of freedom of the structure.
+
+         Args:
+             number_of_steps (int): The number of increments to divide the load application.
+             recorded_dof_load (DegreeOfFreedom or int): The degree of freedom associated with the load.
+             recorded_dof (DegreeOfFreedom or int): The degree of freedom to record displacements for.
+         """
+        result = self.analyze(number_of_steps, recorded_dof_load, recorded_dof)
+        if isinstance(self.structure, Structure):
+            for dof, displacement in zip(self.structure.free_degrees_of_freedom, result.free_displacements):
+                dof.displacement = displacement
+
+    def analyze_newton_raphson(self, recorded_dof_load: DegreeOfFreedom, recorded_dof: DegreeOfFreedom,
+                               load_factor: float = 1., initial_step: float = 0.1, min_step: float = 1e-6,
+                               max_step: float = None, modified: bool = False, recorder: Recorder = None,
+                               checkpoint=None, checkpoint_interval: int = 10) -> NonlinearResult:
+        """
+        Traces the equilibrium path up to a load factor with Newton-Raphson iterations, without modifying the
+        structure.
+
+        The nodal forces and prescribed displacements of the model are scaled by the load factor. Each step
+        iterates on the residual between the applied and the internal forces until both the residual norm and
+        the iterative displacement norm are within tolerance. A step that does not converge within
+        `max_iterations`, or diverges, is restarted with half the load increment; after a converged step the
+        increment is scaled by sqrt(desired_iterations / iterations), at most doubling it. Modified Newton-Raphson
+        converges linearly and aims for twice `desired_iterations`.
+
+        Full Newton-Raphson refactorizes the tangent at every iteration. Modified Newton-Raphson factorizes it
+        once per step and refactorizes only when an iteration reduces the residual by less than
+        `refactorization_ratio`.
+
+        Args:
+            recorded_dof_load (DegreeOfFreedom or int): The degree of freedom associated with the load.
+            recorded_dof (DegreeOfFreedom or int): The degree of freedom to record displacements for.
+            load_factor (float): The load factor to reach (default is 1).
+            initial_step (float): The load factor increment of the first step (default is 0.1).
+            min_step (float): The smallest increment before the analysis gives up (default is 1e-6).
+            max_step (float): The largest increment. Defaults to the load factor to reach.
+            modified (bool): Whether to use modified Newton-Raphson (default is False).
+            recorder (Recorder): Records further responses at the initial state and every converged step.
+            checkpoint (str or os.PathLike): Checkpoint file of the analysis, if any. An existing checkpoint is
+                resumed from; see `save_checkpoint`.
+            checkpoint_interval (int): Number of converged steps between checkpoints (default is 10). A
+                checkpoint is also saved at the end of the analysis.
+
+        Returns:
+            NonlinearResult: Displacements, reactions and end forces at the final load factor, and the
+            load-displacement history of the recorded degree of freedom at every converged step.
+
+        Raises:
+            RuntimeError: If a step does not converge with the smallest increment.
+        """
+        max_step = load_factor if max_step is None else max_step
+        restored = self.load_checkpoint(checkpoint, "newton_raphson")
+        if restored is None:
+            self.load_factor, self.step_size = 0., min(initial_step, max_step)
+            self.factorization_count = self.iteration_count = 0
+            displacements = np.zeros(self.model.free_count)
+        else:
+            displacements = restored["displacements"]
+        state = self._evaluate(displacements, self.load_factor, tangent=False)
+        history = self._start_history(recorded_dof_load, recorded_dof, recorder, displacements, state, restored)
+        try:
+            while self.load_factor < load_factor * (1 - 1e-12):
+                step = min(self.step_size, load_factor - self.load_factor)
+                converged = self._equilibrium_iterations(displacements, self.load_factor + step, modified)
+                if converged is None:
+                    self.step_size = step / 2
+                    if self.step_size < min_step:
+                        raise RuntimeError(f"Newton-Raphson iterations do not converge at load factor "
+                                           f"{self.load_factor + step:.6g} with the smallest step {min_step:g}.")
+                    continue
+                displacements, state, iterations = converged
+                self.load_factor += step
+                self._record_step(history, displacements, state)
+                desired_iterations = 2 * self.desired_iterations if modified else self.desired_iterations
+                growth = min(2., np.sqrt(desired_iterations / max(iterations, 1)))
+                self.step_size = float(np.clip(step * growth, min_step, max_step))
+                if checkpoint is not None and (len(self.load) - 1) % checkpoint_interval == 0:
+                    self.save_checkpoint(checkpoint, "newton_raphson", displacements, state, recorder)
+            if checkpoint is not None:
+                self.save_checkpoint(checkpoint, "newton_raphson", displacements, state, recorder)
+        finally:
+            if recorder is not None:
+                recorder.close()
+        return self._path_result(displacements, state)
+
+    def solve_newton_raphson(self, recorded_dof_load: DegreeOfFreedom, recorded_dof: DegreeOfFreedom,
+                             load_factor: float = 1., **options):
+        """
+        Traces the equilibrium path with Newton-Raphson iterations and writes the displacements to the degrees
+        of freedom of the structure.
+
+        Args:
+            recorded_dof_load (DegreeOfFreedom or int): The degree of freedom associated with the load.
+            recorded_dof (DegreeOfFreedom or int): The degree of freedom to record displacements for.
+            load_factor (float): The load factor to reach (default is 1).
+            **options: Step and iteration options of `analyze_newton_raphson`.
+
+        Returns:
+            NonlinearResult: The result of `analyze_newton_raphson`.
+        """
+        result = self.analyze_newton_raphson(recorded_dof_load, recorded_dof, load_factor, **options)
+        if isinstance(self.structure, Structure):
+            result.apply(self.structure)
+        return result
+
+    def analyze_arc_length(self, recorded_dof_load: DegreeOfFreedom, recorded_dof: DegreeOfFreedom,
+                           max_steps: int = 100, initial_step: float = 0.1, load_factor: float = None,
+                           max_displacement: float = None, spherical: bool = False, recorder: Recorder = None,
+                           checkpoint=None, checkpoint_interval: int = 10) -> NonlinearResult:
+        """
+        Traces the equilibrium path with the arc-length method of Crisfield, without modifying the structure.
+
+        The load factor λ becomes an unknown, and every step of arc length Δl satisfies
+
+            Δuᵀ·Δu + ψ²·Δλ²·qᵀq = Δl²
+
+        where Δu and Δλ are the displacement and load factor increments of the step and q is the reference
+        load. The cylindrical constraint, ψ = 0, measures the step on the displacements alone. The spherical
+        one includes the load, with ψ scaled so that both terms are equal in the initial tangent direction,
+        since forces and displacements have different units. Because the load factor can decrease, the path
+        is followed through limit points into the post-buckling range.
+
+        The predictor follows the tangent. Its direction is taken from the sign of the stiffness parameter
+        qᵀ·K⁻¹·q in the first step and afterwards from the sign of the angle with the previous increment, which
+        changes when a limit point has been passed. Each corrector iteration solves the residual and the
+        reference load against one factorization of the tangent and picks the root of the constraint closest
+        to the current increment. A step that fails to converge is restarted with half the arc length; after a
+        converged step the arc length is scaled by sqrt(desired_iterations / iterations), at most doubling it,
+        and kept between 1e-4 and 100 times the first arc length.
+
+        The analysis stops after `max_steps` converged steps, once the load factor reaches `load_factor`, or once
+        the recorded displacement reaches `max_displacement`.
+
+        Args:
+            recorded_dof_load (DegreeOfFreedom or int): The degree of freedom associated with the load.
+            recorded_dof (DegreeOfFreedom or int): The degree of freedom to record displacements for.
+            max_steps (int): The largest number of steps (default is 100).
+            initial_step (float): The load factor of the first predictor, which sets the first arc length
+                (default is 0.1).
+            load_factor (float): The load factor at which to stop, if any.
+            max_displacement (float): The magnitude of the recorded displacement at which to stop, if any.
+            spherical (bool): Whether to use the spherical instead of the cylindrical constraint (default is
+                False).
+            recorder (Recorder): Records further responses at the initial state and every converged step.
+            checkpoint (str or os.PathLike): Checkpoint file of the analysis, if any. An existing checkpoint is
+                resumed from; see `save_checkpoint`.
+            checkpoint_interval (int): Number of converged steps between checkpoints (default is 10). A
+                checkpoint is also saved at the end of the analysis.
+
+        Returns:
+            NonlinearResult: Displacements, reactions and end forces at the last step, and the load-displacement
+            history of the recorded degree of freedom at every converged step.
+
+        Raises:
+            RuntimeError: If a step does not converge with the smallest arc length.
+        """
+        restored = self.load_checkpoint(checkpoint, "arc_length")
+        if restored is None:
+            self.load_factor = 0.
+            self.factorization_count = self.iteration_count = 0
+            displacements = np.zeros(self.model.free_count)
+            state = self._evaluate(displacements, 0., tangent=True)
+            history = self._start_history(recorded_dof_load, recorded_dof, recorder, displacements, state)
+            tangent_displacements = self._tangent_displacements(state)
+            load_weight = tangent_displacements.dot(tangent_displacements) if spherical else 0.
+            self.step_size = initial_step * np.sqrt(tangent_displacements.dot(tangent_displacements) + load_weight)
+            first_arc_length = self.step_size
+            previous_increment = None
+        else:
+            displacements = restored["displacements"]
+            state = self._evaluate(displacements, self.load_factor, tangent=True)
+            history = self._start_history(recorded_dof_load, recorded_dof, recorder, displacements, state, restored)
+            load_weight, first_arc_length = float(restored["load_weight"]), float(restored["first_arc_length"])
+            previous_increment = None
+            if "previous_increment" in restored:
+                previous_increment = restored["previous_increment"], float(restored["previous_load_factor_increment"])
+        min_arc_length, max_arc_length = 1e-4 * first_arc_length, 100 * first_arc_length
+        path_state = {"load_weight": load_weight, "first_arc_length": first_arc_length}
+        try:
+            while (len(self.load) <= max_steps
+                   and not (load_factor is not None and self.load_factor >= load_factor)
+                   and not (max_displacement is not None and self.displacement[-1] >= max_displacement)):
+                converged = self._arc_length_iterations(displacements, state, load_weight, previous_increment)
+                if converged is None:
+                    self.step_size /= 2
+                    if self.step_size < min_arc_length:
+                        raise RuntimeError(f"Arc-length iterations do not converge after load factor "
+                                           f"{self.load_factor:.6g} with the smallest arc length.")
+                    continue
+                increment, load_factor_increment, state, iterations = converged
+                displacements = displacements + increment
+                self.load_factor += load_factor_increment
+                previous_increment = increment, load_factor_increment
+                self._record_step(history, displacements, state)
+                growth = min(2., np.sqrt(self.desired_iterations / max(iterations, 1)))
+                self.step_size = float(np.clip(self.step_size * growth, min_arc_length, max_arc_length))
+                path_state.update(previous_increment=increment, previous_load_factor_increment=load_factor_increment)
+                if checkpoint is not None and (len(self.load) - 1) % checkpoint_interval == 0:
+                    self.save_checkpoint(checkpoint, "arc_length", displacements, state, recorder, **path_state)
+            if checkpoint is not None:
+                self.save_checkpoint(checkpoint, "arc_length", displacements, state, recorder, **path_state)
+        finally:
+            if recorder is not None:
+                recorder.close()
+        return self._path_result(displacements, state)
+
+    def _start_history(self, recorded_dof_load, recorded_dof, recorder, displacements, state,
+                       restored: dict = None) -> tuple:
+        """
+        Clears the load-displacement history, starts the recorder and records the initial state, or restores
+        the history and the recorder from a checkpoint.
+        """
+        history = self.dof_index(recorded_dof_load), self.dof_index(recorded_dof), recorder
+        if restored is None:
+            self.load, self.displacement = [], []
+            if recorder is not None:
+                recorder.start(self)
+            self._record_step(history, displacements, state)
+            return history
+        self.load, self.displacement = restored["load"].tolist(), restored["displacement"].tolist()
+        if recorder is not None:
+            recorder_state = {key[len("recorder."):]: value for key, value in restored.items()
+                              if key.startswith("recorder.")}
+            if not recorder_state:
+                raise ValueError("The checkpoint was saved without a recorder and cannot resume one.")
+            recorder.start(self, recorder_state)
+        return history
+
+    def save_checkpoint(self, path, method: str, displacements: np.ndarray, state: tuple, recorder: Recorder = None,
+                        **path_state):
+        """
+        Saves the state of a path-following analysis to a binary checkpoint. Called by the analyses.
+
+        The checkpoint is an uncompressed `.npz` archive of the free displacements, the load factor and step size,
+        the counters, the load-displacement history, the current coordinates, the local end forces of each element
+        group and the history of the recorder, together with the state specific to the method. Floats are stored
+        exactly, so an analysis resumed from the checkpoint continues bit for bit as the interrupted one. The file
+        is written next to the path and then moved over it, so a process killed while saving leaves the previous
+        checkpoint intact.
+
+        Args:
+            path (str or os.PathLike): The checkpoint file.
+            method (str): The analysis saving the checkpoint, 'newton_raphson' or 'arc_length'.
+            displacements (np.ndarray): Free displacements of the last converged step.
+            state (tuple): Formulation state of the last converged step.
+            recorder (Recorder): The recorder of the analysis, if any.
+            **path_state: Further arrays of the analysis, such as the previous arc-length increment.
+        """
+        arrays = {"method": np.array(method), "free_count": np.array(self.model.free_count),
+                  "displacements": displacements, "load_factor": np.array(self.load_factor),
+                  "step_size": np.array(self.step_size), "factorization_count": np.array(self.factorization_count),
+                  "iteration_count": np.array(self.iteration_count), "load": np.array(self.load),
+                  "displacement": np.array(self.displacement), "coordinates": self.coordinates}
+        arrays.update({f"end_forces.{index}": end_forces for index, end_forces in enumerate(state[2])})
+        arrays.update({name: np.asarray(value) for name, value in path_state.items()})
+        if recorder is not None:
+            arrays.update({f"recorder.{name}": value for name, value in recorder.checkpoint_state().items()})
+        path = os.fspath(path)
+        temporary = f"{path}.tmp.npz"
+        np.savez(temporary, **arrays)
+        os.replace(temporary, path)
+
+    def load_checkpoint(self, path, method: str):
+        """
+        Restores the solver from a checkpoint saved by `save_checkpoint`. Called by the analyses.
+
+        Args:
+            path (str or os.PathLike): The checkpoint file, or None.
+            method (str): The analysis to resume, 'newton_raphson' or 'arc_length'.
+
+        Returns:
+            dict or None: The arrays of the checkpoint, or None if there is no checkpoint to resume from.
+
+        Raises:
+            ValueError: If the checkpoint was saved by another method or for another model.
+        """
+        if path is None or not os.path.exists(path):
+            return None
+        with np.load(os.fspath(path)) as archive:
+            restored = {name: archive[name] for name in archive.files}
+        if str(restored["method"]) != method:
+            raise ValueError(f"The checkpoint was saved by a {restored['method']} analysis, not {method}.")
+        if int(restored["free_count"]) != self.model.free_count:
+            raise ValueError("The checkpoint was saved for a model with a different number of free degrees of "
+                             "freedom.")
+        self.load_factor, self.step_size = float(restored["load_factor"]), float(restored["step_size"])
+        self.factorization_count = int(restored["factorization_count"])
+        self.iteration_count = int(restored["iteration_count"])
+        self.coordinates = restored["coordinates"]
+        self.cumulative_element_end_forces = [restored[f"end_forces.{index}"]
+                                              for index in range(len(self.model.element_groups))]
+        return restored
+
+    def _record_step(self, history: tuple, displacements: np.ndarray, state: tuple):
+        """Appends a converged step to the load-displacement history and the recorder."""
+        load_index, recorded_index, recorder = history
+        total_displacements = self._total_displacements(displacements, self.load_factor)
+        self.load.append(abs(self.model.forces[load_index]) * self.load_factor)
+        self.displacement.append(abs(total_displacements[recorded_index]))
+        if recorder is not None:
+            recorder.record(self, self.load_factor, total_displacements, state)
+
+    def _path_result(self, displacements: np.ndarray, state: tuple) -> NonlinearResult:
+        """Stores the final state of a path-following analysis on the solver and returns it as a result."""
+        self.cumulative_displacement_vector = displacements
+        internal_forces, _, end_forces = state
+        self.cumulative_element_end_forces = end_forces
+        return NonlinearResult(self.model, self._total_displacements(displacements, self.load_factor),
+                               internal_forces[self.model.free_count:], end_forces, self.load, self.displacement)
+
+    def _tangent_displacements(self, state: tuple) -> np.ndarray:
+        """
+        Factorizes the tangent of a formulation state and solves for the displacements per unit load factor.
+
+        The reference load includes the forces of the prescribed displacements, which scale with the load factor.
+        """
+        free_count = self.model.free_count
+        tangent = state[1]
+        self.linear_solver.factorize(tangent[:free_count, :free_count])
+        self.factorization_count += 1
+        reference = self.model.free_forces - tangent[:free_count, free_count:].dot(self.model.prescribed_displacements)
+        return self.linear_solver.solve(reference)
+
+    def _arc_length_iterations(self, displacements: np.ndarray, state: tuple, load_weight: float,
+                               previous_increment: tuple):
+        """
+        Iterates to equilibrium on the arc-length constraint, starting from the converged state of the last step.
+
+        Returns:
+            tuple or None: The displacement and load factor increments of the step, the formulation state and the
+            number of iterations, or None if the iterations did not converge.
+        """
+        free_count = self.model.free_count
+        forces = self.model.free_forces
+        force_norm = max(np.linalg.norm(forces), np.finfo(float).tiny)
+        arc_length = self.step_size
+        tangent_displacements = self._tangent_displacements(state)
+        if previous_increment is None:
+            direction = np.sign(forces.dot(tangent_displacements)) or 1.
+        else:
+            previous_displacements, previous_load_factor = previous_increment
+            direction = np.sign(previous_displacements.dot(tangent_displacements)
+                                + load_weight * previous_load_factor) or 1.
+        load_factor_increment = direction * arc_length / np.sqrt(tangent_displacements.dot(tangent_displacements)
+                                                                 + load_weight)
+        increment = load_factor_increment * tangent_displacements
+        correction = increment
+        for iteration in range(1, self.max_iterations + 1):
+            load_factor = self.load_factor + load_factor_increment
+            state = self._evaluate(displacements + increment, load_factor, tangent=True)
+            residual = load_factor * forces - state[0][:free_count]
+            residual_norm = np.linalg.norm(residual)
+            if not np.isfinite(residual_norm) or residual_norm > 1e6 * force_norm * max(1., abs(load_factor)):
+                return None
+            if (residual_norm <= self.tolerance * force_norm * max(1., abs(load_factor))
+                    and np.linalg.norm(correction) <= self.displacement_tolerance
+                    * max(np.linalg.norm(displacements + increment), np.finfo(float).tiny)):
+                return increment, load_factor_increment, state, iteration - 1
+            tangent_displacements = self._tangent_displacements(state)
+            residual_displacements = self.linear_solver.solve(residual)
+            self.iteration_count += 1
+            trial = increment + residual_displacements
+            a = tangent_displacements.dot(tangent_displacements) + load_weight
+            b = 2 * (tangent_displacements.dot(trial) + load_weight * load_factor_increment)
+            c = trial.dot(trial) + load_weight * load_factor_increment ** 2 - arc_length ** 2
+            discriminant = b ** 2 - 4 * a * c
+            if not discriminant >= 0:
+                return None
+            roots = (-b + np.array([1., -1.]) * np.sqrt(discriminant)) / (2 * a)
+            alignments = [increment.dot(trial + root * tangent_displacements)
+                          + load_weight * load_factor_increment * (load_factor_increment + root) for root in roots]
+            root = roots[int(np.argmax(alignments))]
+            correction = residual_displacements + root * tangent_displacements
+            increment = increment + correction
+            load_factor_increment += root
+        return None
+
+    def _total_displacements(self, free_displacements: np.ndarray, load_factor: float) -> np.ndarray:
+        """Combines free displacements with the prescribed displacements scaled by the load factor."""
+        return np.concatenate([free_displacements, load_factor * self.model.prescribed_displacements])
+
+    def _evaluate(self, displacements: np.ndarray, load_factor: float, tangent: bool) -> tuple:
+        """Evaluates the formulation at the free displacements and the load factor."""
+        return self.formulation.evaluate(self._total_displacements(displacements, load_factor), tangent, self.sparse)
+
+    def _equilibrium_iterations(self, displacements: np.ndarray, load_factor: float, modified: bool):
+        """
+        Iterates to equilibrium at a load factor, starting from the displacements of the last converged step.
+
+        Returns:
+            tuple or None: The converged free displacements, the formulation state and the number of
+            iterations, or None if the iterations did not converge.
+        """
+        free_count = self.model.free_count
+        applied_forces = load_factor * self.model.free_forces
+        force_norm = max(np.linalg.norm(applied_forces), np.finfo(float).tiny)
+        displacements = displacements.copy()
+        state = self._evaluate(displacements, load_factor, tangent=True)
+        residual_norm = np.linalg.norm(applied_forces - state[0][:free_count])
+        for iteration in range(1, self.max_iterations + 1):
+            residual = applied_forces - state[0][:free_count]
+            previous_norm, residual_norm = residual_norm, np.linalg.norm(residual)
+            if not np.isfinite(residual_norm) or residual_norm > 1e6 * force_norm:
+                return None
+            if state[1] is None and residual_norm > self.refactorization_ratio * previous_norm:
+                state = self._evaluate(displacements, load_factor, tangent=True)
+            if state[1] is not None:
+                self.linear_solver.factorize(state[1][:free_count, :free_count])
+                self.factorization_count += 1
+            correction = self.linear_solver.solve(residual)
+            displacements += correction
+            self.iteration_count += 1
+            state = self._evaluate(displacements, load_factor, tangent=not modified)
+            converged_forces = np.linalg.norm(applied_forces - state[0][:free_count]) <= self.tolerance * force_norm
+            converged_displacements = (np.linalg.norm(correction) <= self.displacement_tolerance
+                                       * max(np.linalg.norm(displacements), np.finfo(float).tiny))
+            if converged_forces and converged_displacements:
+                return displacements, state, iteration
+        return None
 
     def update_coordinates(self):
         """
         Updates the coordinates of all nodes in the structure based on their displacements.
         """
-        for node in self.structure.nodes:
-            node.x += node.x_dof.displacement
-            node.y += node.y_dof.displacement
+        self.coordinates = self.coordinates + self.model.node_displacements(self._increment)[:, :2]
 
     def reset_node_coordinates(self):
         """
         Resets the coordinates of all nodes to their original values.
         """
-        for node in self.structure.nodes:
-            node.x = node._x_original
-            node.y = node._y_original
+        self.coordinates = self.model.coordinates.copy()
+        self._previous_coordinates = self.coordinates.copy()
 
     def update_element_stiffness_matrix(self):
         """
         Updates the stiffness matrix for all elements in the structure based on current displaced configuration and
         the current axial load.
+
+        The end forces of the last increment are computed with the stiffness of the previous configuration and
+        accumulated for the elements with geometric nonlinearity.
+        """
+        for group, cumulative_end_forces in zip(self.model.element_groups, self.cumulative_element_end_forces):
+            previous_arrays = group.arrays(self._previous_coordinates)
+            arrays = group.arrays(self.coordinates)
+            previous_arrays.update({name: arrays[name] for name in ("cosines", "sines") if name in arrays})
+            increment_end_forces = group.element_type.batch_local_end_forces(
+                self._increment[group.dof_indices], axial_forces=self._previous_axial_forces[group.positions]
+                * group.geometric_nonlinearity, **previous_arrays)
+            cumulative_end_forces += increment_end_forces * group.geometric_nonlinearity[:, None]
+        self._previous_axial_forces = self.model.element_axial_forces(self.cumulative_element_end_forces)
+        self._previous_coordinates = self.coordinates.copy()
+
+    def element_axial_forces(self):
+        """
+        Returns the cumulative axial force of every element, in the order of the structure's elements.
+
+        Elements without geometric nonlinearity are given zero axial force.
+
+        Returns:
+            np.array: The cumulative axial force of each element.
         """
-        counter = 0
-        for element in self.structure.elements:
-            if element.geometric_nonlinearity:
-                self.cumulative_element_end_forces[counter] += element.local_end_forces()
-                element_cum_forces = self.cumulative_element_end_forces[counter]
-                element.stiffness_matrix = (element.first_order_elastic_stiffness_matrix()
-                                            + element.geometric_stiffness_matrix(element_cum_forces))
-                counter += 1
-            else:
-                element.stiffness_matrix = element.first_order_elastic_stiffness_matrix()
+        return self.model.element_axial_forces(self.cumulative_element_end_forces)
 
     def internal_force_vector(self):
         """
@@ -105,15 +623,9 @@ class NonlinearSolver:
         Returns:
             np.array: The computed internal force vector.
         """
-        force = np.zeros(np.shape(self.structure.free_degrees_of_freedom))
-        counter = 0
-        for element in self.structure.elements:
-            self.cumulative_element_global_end_forces[counter] += element.global_end_forces()
-            dof_index = 0
-            for dof in element.stiffness_matrix_dofs:
-                if not dof.restrained:
-                    index = self.structure.free_degrees_of_freedom.index(dof)
-                    force[index] += self.cumulative_element_global_end_forces[counter][dof_index]
-                dof_index += 1
-            counter += 1
-        return force
+        force = np.zeros(self.model.dof_count)
+        for group, cumulative_end_forces in zip(self.model.element_groups, self.cumulative_element_end_forces):
+            global_end_forces = group.element_type.batch_global_end_forces(cumulative_end_forces,
+                                                                           **group.arrays(self.coordinates))
+            np.add.at(force, group.dof_indices, global_end_forces)
+        return force[:self.model.free_count]
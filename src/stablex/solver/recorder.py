@@ -0,0 +1,360 @@
+import os
+import zipfile
+
+import numpy as np
+from numpy.lib import format
+
+from stablex.solver.linear_solvers import DenseLDLSolver, SparseLDLSolver, import_scipy_linalg
+
+
+class Recorder:
+    """
+    Records any set of responses of a nonlinear analysis at every converged step.
+
+    Responses are registered as named channels before the analysis, which passes the recorder
+    its state after every converged step (and once for the initial state). Each channel holds
+    one row per step in a preallocated array that doubles its capacity when full. The load
+    factor is always recorded.
+
+    With a `path`, the rows are streamed to an `.npz` archive in chunks of `chunk_size` steps
+    instead, so only one chunk is held in memory. Each chunk is stored as an array named
+    `<channel>_<chunk number>`; `iter_chunks` reads them back one at a time and `read` joins them.
+
+    Parameters
+    ----------
+    path : str or os.PathLike, optional
+        Archive to stream the rows to. Any existing file is replaced when the analysis starts.
+    chunk_size : int, optional
+        Number of steps per chunk, and the initial capacity of the arrays (default is 256).
+
+    Methods
+    -------
+    add_displacements(name, dofs)
+        Records the displacements of degrees of freedom.
+    add_end_forces(name, positions)
+        Records the local end forces of elements.
+    add_reactions(name, dofs)
+        Records reactions of restrained degrees of freedom.
+    add_stability(name)
+        Records the current stiffness parameter and the number of negative tangent eigenvalues.
+    iter_chunks(path, names)
+        Reads a streamed archive chunk by chunk.
+    read(path, names) -> dict
+        Reads a streamed archive into one array per channel.
+
+    Examples
+    --------
+    >>> recorder = Recorder()
+    >>> recorder.add_displacements("top", [top.x_dof, top.y_dof])
+    >>> solver.analyze_arc_length(top.y_dof, top.x_dof, recorder=recorder)
+    >>> recorder["top"].shape
+    (101, 2)
+    """
+    def __init__(self, path=None, chunk_size: int = 256):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._requests = [("load_factor", self._load_factor_channel, ())]
+        self._channels = {}
+        self._buffers = {}
+        self._size = 0
+        self._chunk_count = 0
+        self._step_count = 0
+        self._reference_stiffness = None
+
+    @property
+    def names(self) -> list:
+        """Names of the recorded channels."""
+        return [name for name, _, _ in self._requests]
+
+    @property
+    def load_factors(self) -> np.ndarray:
+        """Load factor at every recorded step."""
+        return self["load_factor"][:, 0]
+
+    def __len__(self):
+        return self._step_count
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        The history of a channel, of shape (n_steps, width), including rows already streamed to the archive.
+
+        Only the chunks of this channel are read from the archive.
+        """
+        if name not in self._buffers:
+            raise KeyError(f"No channel named '{name}' has been recorded.")
+        rows = self._buffers[name][:self._size]
+        if self.path is None or self._chunk_count == 0:
+            return rows.copy()
+        return np.concatenate([chunk[name] for chunk in self.iter_chunks(self.path, [name])] + [rows])
+
+    def add_displacements(self, name: str, dofs: list):
+        """
+        Records the displacements of degrees of freedom.
+
+        Parameters
+        ----------
+        name : str
+            Name of the channel.
+        dofs : list of DegreeOfFreedom or int
+            Degrees of freedom of the structure, or their equation numbers.
+        """
+        self._add(name, self._displacement_channel, (dofs,))
+
+    def add_end_forces(self, name: str, positions: list):
+        """
+        Records the local end forces of elements, concatenated into one row per step.
+
+        Parameters
+        ----------
+        name : str
+            Name of the channel.
+        positions : list of int
+            Positions of the elements in the element list of the structure.
+        """
+        self._add(name, self._end_force_channel, (positions,))
+
+    def add_reactions(self, name: str, dofs: list = None):
+        """
+        Records reactions of restrained degrees of freedom.
+
+        Parameters
+        ----------
+        name : str
+            Name of the channel.
+        dofs : list of DegreeOfFreedom or int, optional
+            Restrained degrees of freedom, or their equation numbers. Defaults to all of them.
+        """
+        self._add(name, self._reaction_channel, (dofs,))
+
+    def add_stability(self, name: str = "stability"):
+        """
+        Records two stability indicators of the tangent stiffness matrix K.
+
+        The first column is the current stiffness parameter qᵀ·K₀⁻¹·q / qᵀ·K⁻¹·q of the reference
+        load q, which is 1 for the initial stiffness K₀, drops to 0 at a limit point and is negative
+        beyond it. The second is the number of negative eigenvalues of K, which counts the limit and
+        bifurcation points passed. Both need a factorization of the tangent at every step, which is
+        sparse on the sparse path of the solver and dense otherwise.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the channel (default is 'stability').
+        """
+        self._add(name, self._stability_channel, ())
+
+    def _add(self, name, factory, arguments):
+        if name in self.names:
+            raise ValueError(f"A channel named '{name}' is already registered.")
+        self._requests.append((name, factory, arguments))
+
+    def start(self, solver, checkpoint: dict = None):
+        """
+        Resolves the channels for a solver and clears the recorded history. Called by the solver.
+
+        Parameters
+        ----------
+        solver : NonlinearSolver
+            The solver about to run.
+        checkpoint : dict, optional
+            State returned by `checkpoint_state` to resume from instead of clearing the history.
+        """
+        # Each channel is resolved to its row width and a function of the state that returns the row.
+        self._channels = {name: factory(solver, *arguments) for name, factory, arguments in self._requests}
+        self._buffers = {name: np.empty((self.chunk_size, width)) for name, (width, _) in self._channels.items()}
+        self._size = self._chunk_count = self._step_count = 0
+        self._reference_stiffness = None
+        if checkpoint is not None:
+            self._restore(checkpoint)
+        elif self.path is not None:
+            with zipfile.ZipFile(self.path, "w"):
+                pass
+
+    def checkpoint_state(self) -> dict:
+        """
+        Captures the recorded history for a solver checkpoint.
+
+        A streaming recorder first writes its pending rows to the archive, so the state only refers
+        to the chunks written so far.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            Arrays from which `start` resumes the recording.
+        """
+        if self.path is not None and self._size:
+            self._flush()
+        state = {"step_count": np.array(self._step_count), "chunk_count": np.array(self._chunk_count),
+                 "reference_stiffness": np.array(np.nan if self._reference_stiffness is None
+                                                 else self._reference_stiffness)}
+        state.update({f"rows.{name}": buffer[:self._size] for name, buffer in self._buffers.items()})
+        return state
+
+    def _restore(self, state):
+        self._step_count = int(state["step_count"])
+        self._chunk_count = int(state["chunk_count"])
+        reference_stiffness = float(state["reference_stiffness"])
+        self._reference_stiffness = None if np.isnan(reference_stiffness) else reference_stiffness
+        for name in self._buffers:
+            rows = state[f"rows.{name}"]
+            capacity = len(self._buffers[name])
+            while capacity < len(rows):
+                capacity *= 2
+            self._buffers[name] = np.empty((capacity, rows.shape[1]))
+            self._buffers[name][:len(rows)] = rows
+            self._size = len(rows)
+        if self.path is not None:
+            # Chunks written after the checkpoint are dropped; the resumed run writes them again.
+            with zipfile.ZipFile(self.path) as archive:
+                kept = {name: archive.read(name) for name in archive.namelist()
+                        if int(name[:-len(".npy")].rsplit("_", 1)[1]) < self._chunk_count}
+            with zipfile.ZipFile(self.path, "w") as archive:
+                for name, data in kept.items():
+                    archive.writestr(name, data)
+
+    def record(self, solver, load_factor: float, displacements: np.ndarray, state: tuple):
+        """
+        Records one step. Called by the solver after every converged step.
+
+        Parameters
+        ----------
+        solver : NonlinearSolver
+            The running solver.
+        load_factor : float
+            Load factor of the step.
+        displacements : np.ndarray
+            Total displacements of all degrees of freedom.
+        state : tuple
+            Internal forces, tangent stiffness matrix (or None) and end forces of the step.
+        """
+        if self._size == len(next(iter(self._buffers.values()))):
+            if self.path is None:
+                self._buffers = {name: np.concatenate([buffer, np.empty_like(buffer)])
+                                 for name, buffer in self._buffers.items()}
+            else:
+                self._flush()
+        for name, (_, function) in self._channels.items():
+            self._buffers[name][self._size] = function(solver, load_factor, displacements, state)
+        self._size += 1
+        self._step_count += 1
+
+    def close(self):
+        """Writes the rows not yet streamed to the archive. Called by the solver at the end of the analysis."""
+        if self.path is not None and self._size:
+            self._flush()
+
+    def _flush(self):
+        with zipfile.ZipFile(self.path, "a") as archive:
+            for name, buffer in self._buffers.items():
+                with archive.open(f"{name}_{self._chunk_count:06d}.npy", "w", force_zip64=True) as file:
+                    format.write_array(file, np.ascontiguousarray(buffer[:self._size]))
+        self._chunk_count += 1
+        self._size = 0
+
+    @staticmethod
+    def iter_chunks(path, names: list = None):
+        """
+        Reads a streamed archive chunk by chunk.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The archive written by a recorder.
+        names : list of str, optional
+            Channels to read. Defaults to all of them; the arrays of the other channels are not read.
+
+        Yields
+        ------
+        dict of str to np.ndarray
+            The rows of each channel in one chunk, in step order.
+        """
+        with np.load(os.fspath(path)) as archive:
+            chunks = {}
+            for key in archive.files:
+                name, chunk = key.rsplit("_", 1)
+                if names is None or name in names:
+                    chunks.setdefault(int(chunk), []).append(name)
+            for chunk in sorted(chunks):
+                yield {name: archive[f"{name}_{chunk:06d}"] for name in chunks[chunk]}
+
+    @staticmethod
+    def read(path, names: list = None) -> dict:
+        """
+        Reads a streamed archive into one array per channel.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The archive written by a recorder.
+        names : list of str, optional
+            Channels to read (default is all of them).
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            The history of each channel, of shape (n_steps, width).
+        """
+        chunks = {}
+        for chunk in Recorder.iter_chunks(path, names):
+            for name, rows in chunk.items():
+                chunks.setdefault(name, []).append(rows)
+        return {name: np.concatenate(rows) for name, rows in chunks.items()}
+
+    @staticmethod
+    def _load_factor_channel(solver):
+        return 1, lambda solver, load_factor, displacements, state: load_factor
+
+    @staticmethod
+    def _displacement_channel(solver, dofs):
+        indices = np.array([solver.dof_index(dof) for dof in dofs], dtype=np.intp)
+        return len(indices), lambda solver, load_factor, displacements, state: displacements[indices]
+
+    @staticmethod
+    def _end_force_channel(solver, positions):
+        locations = []
+        for position in positions:
+            for group_index, group in enumerate(solver.model.element_groups):
+                rows = np.flatnonzero(group.positions == position)
+                if len(rows):
+                    locations.append((group_index, rows[0]))
+                    break
+            else:
+                raise IndexError(f"The model has no element at position {position}.")
+        width = sum(solver.model.element_groups[group].dof_indices.shape[1] for group, _ in locations)
+
+        def end_forces(solver, load_factor, displacements, state):
+            return np.concatenate([state[2][group][row] for group, row in locations])
+        return width, end_forces
+
+    @staticmethod
+    def _reaction_channel(solver, dofs):
+        free_count = solver.model.free_count
+        if dofs is None:
+            indices = np.arange(free_count, solver.model.dof_count)
+        else:
+            indices = np.array([solver.dof_index(dof) for dof in dofs], dtype=np.intp)
+            if np.any(indices < free_count):
+                raise ValueError("Reactions can only be recorded for restrained degrees of freedom.")
+        return len(indices), lambda solver, load_factor, displacements, state: state[0][indices]
+
+    def _stability_channel(self, solver):
+        free_count = solver.model.free_count
+        forces = solver.model.free_forces
+
+        def stability(solver, load_factor, displacements, state):
+            tangent = state[1]
+            if tangent is None:
+                tangent = solver.formulation.evaluate(displacements)[1]
+            tangent = tangent[:free_count, :free_count]
+            if import_scipy_linalg() is None:
+                negative_count = np.count_nonzero(np.linalg.eigvalsh(tangent) < 0)
+                stiffness = forces.dot(np.linalg.solve(tangent, forces))
+            else:
+                ldl = SparseLDLSolver() if hasattr(tangent, "tocsc") else DenseLDLSolver()
+                ldl.factorize(tangent)
+                negative_count = ldl.negative_eigenvalue_count()
+                stiffness = forces.dot(ldl.solve(forces))
+            if self._reference_stiffness is None:
+                self._reference_stiffness = stiffness
+            return self._reference_stiffness / stiffness, negative_count
+        return 2, stability
@@ -0,0 +1,148 @@
+import numpy as np
+
+from stablex.compiled_model import CompiledModel
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    """Returns the array as a float array that cannot be written to."""
+    array = np.array(array, dtype=float)
+    array.flags.writeable = False
+    return array
+
+
+class LinearResult:
+    """
+    Immutable result of a first-order elastic analysis, returned by `Solver.analyze`.
+
+    All arrays are in the equation order of the structure's `DofMap`: free degrees of freedom
+    first, then restrained ones. Analyses that return results leave the structure untouched;
+    `apply` writes a result back to it on request.
+
+    Parameters
+    ----------
+    model : CompiledModel
+        The compiled model that was analyzed.
+    displacements : np.ndarray
+        Displacements of all degrees of freedom.
+    reactions : np.ndarray
+        Reactions of the restrained degrees of freedom.
+    coordinates : np.ndarray, optional
+        Nodal coordinates the analysis was carried out in. Defaults to the compiled coordinates.
+    end_forces : list of np.ndarray, optional
+        Local end forces of each element group. Computed from the displacements on first use if
+        not given.
+
+    Attributes
+    ----------
+    model : CompiledModel
+        The compiled model that was analyzed.
+    displacements : np.ndarray
+        Displacements of all degrees of freedom.
+    reactions : np.ndarray
+        Reactions of the restrained degrees of freedom.
+    """
+    def __init__(self, model: CompiledModel, displacements: np.ndarray, reactions: np.ndarray,
+                 coordinates: np.ndarray = None, end_forces: list = None):
+        self.model = model
+        self.displacements = _frozen(displacements)
+        self.reactions = _frozen(reactions)
+        self._coordinates = coordinates
+        self._end_forces = None if end_forces is None else [_frozen(forces) for forces in end_forces]
+        self._node_displacements = None
+
+    @property
+    def free_displacements(self) -> np.ndarray:
+        """Displacements of the free degrees of freedom."""
+        return self.displacements[:self.model.free_count]
+
+    @property
+    def end_forces(self) -> list:
+        """Local end forces of each element group of the model, of shape (n_elements, n_dofs)."""
+        if self._end_forces is None:
+            self._end_forces = [_frozen(forces) for forces in
+                                self.model.element_end_forces(self.displacements, coordinates=self._coordinates)]
+        return self._end_forces
+
+    def node_displacements(self) -> np.ndarray:
+        """
+        Expands the displacements to per-node x, y and rz displacements.
+
+        Returns
+        -------
+        np.ndarray
+            Nodal displacements of shape (n_nodes, 3), in the order of the model's nodes.
+        """
+        if self._node_displacements is None:
+            self._node_displacements = self.model.node_displacements(self.displacements)
+            self._node_displacements.flags.writeable = False
+        return self._node_displacements
+
+    def element_end_forces(self, position: int) -> np.ndarray:
+        """
+        Gets the local end forces of one element.
+
+        Parameters
+        ----------
+        position : int
+            Position of the element in the element list of the structure.
+
+        Returns
+        -------
+        np.ndarray
+            Local end forces of the element.
+        """
+        for group, end_forces in zip(self.model.element_groups, self.end_forces):
+            row = np.flatnonzero(group.positions == position)
+            if len(row):
+                return end_forces[row[0]]
+        raise IndexError(f"The model has no element at position {position}.")
+
+    def apply(self, structure):
+        """
+        Writes the displacements and reactions to the degrees of freedom of a structure.
+
+        Parameters
+        ----------
+        structure : Structure
+            The structure the model was compiled from.
+        """
+        dof_map = structure.dof_map
+        if dof_map.count != self.model.dof_count or dof_map.free_count != self.model.free_count:
+            raise ValueError("The result does not match the degree of freedom numbering of the structure.")
+        for dof, displacement in zip(dof_map.degrees_of_freedom, self.displacements):
+            dof.displacement = displacement
+        for dof, reaction in zip(dof_map.restrained_degrees_of_freedom, self.reactions):
+            dof.force = reaction
+
+
+class NonlinearResult(LinearResult):
+    """
+    Immutable result of an incremental nonlinear analysis, returned by `NonlinearSolver.analyze`.
+
+    Parameters
+    ----------
+    model : CompiledModel
+        The compiled model that was analyzed.
+    displacements : np.ndarray
+        Cumulative displacements of all degrees of freedom.
+    reactions : np.ndarray
+        Cumulative reactions of the restrained degrees of freedom.
+    end_forces : list of np.ndarray
+        Cumulative local end forces of each element group.
+    load : np.ndarray
+        Applied load at each step.
+    displacement : np.ndarray
+        Cumulative displacement of the recorded degree of freedom at each step.
+
+    Attributes
+    ----------
+    load : np.ndarray
+        Applied load at each step.
+    displacement : np.ndarray
+        Cumulative displacement of the recorded degree of freedom at each step.
+    """
+    def __init__(self, model: CompiledModel, displacements: np.ndarray, reactions: np.ndarray, end_forces: list,
+                 load: np.ndarray, displacement: np.ndarray):
+        super().__init__(model, displacements, reactions, end_forces=end_forces)
+        self.load = _frozen(load)
+        self.displacement = _frozen(displacement)
@@ -0,0 +1,332 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from stablex.compiled_model import CompiledModel
+from stablex.solver.eigen_solver import EigenSolver
+from stablex.solver.exact_buckling_solver import ExactBucklingSolver
+from stablex.structure import Structure
+
+SOLVERS = {"eigen": EigenSolver, "exact": ExactBucklingSolver}
+
+
+class SweepResult:
+    """
+    Critical load factors of a parameter sweep, returned by `Sweep.run`.
+
+    Parameters
+    ----------
+    parameters : dict of str to np.ndarray
+        Values of each parameter at every grid point, of the grid shape.
+    load_factors : np.ndarray
+        Critical load factors of shape grid shape + (k,).
+    modes : np.ndarray, optional
+        Mode shapes of the free degrees of freedom, of shape grid shape + (n_free, k).
+
+    Attributes
+    ----------
+    parameters : dict of str to np.ndarray
+        Values of each parameter at every grid point, of the grid shape.
+    load_factors : np.ndarray
+        Critical load factors in ascending order at every grid point, NaN where a grid point has
+        fewer than k buckling modes.
+    modes : np.ndarray or None
+        Unit-norm mode shapes at every grid point, if requested.
+    """
+    def __init__(self, parameters: dict, load_factors: np.ndarray, modes: np.ndarray = None):
+        self.parameters = parameters
+        self.load_factors = load_factors
+        self.modes = modes
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the parameter grid."""
+        return self.load_factors.shape[:-1]
+
+    def __repr__(self):
+        return f"SweepResult(shape={self.shape}, parameters={list(self.parameters)})"
+
+
+class Sweep:
+    """
+    Buckling analyses over a grid of parameters, fanned out across a process pool.
+
+    The grid is the Cartesian product of the values of all parameters, in the order in which they
+    are added. Parameters vary either a compiled model or the arguments of a model factory:
+
+    - With a `Structure` or `CompiledModel`, `add_property` changes section, material or spring
+      properties of elements and `add_forces` changes nodal loads. Each grid point is a
+      `CompiledModel.variant` of the model, which shares all unchanged arrays. The model is sent
+      to each worker process once, not once per point.
+    - With a callable, each grid point calls it with the parameters added by `add_parameter` as
+      keyword arguments; it returns a `Structure` or `CompiledModel`. The factory is called in the
+      worker processes, so it must be picklable, e.g. a module-level function.
+
+    The grid points are split into chunks of consecutive points, which the workers solve in any
+    order; the results are collected in grid order. With a `checkpoint` path, the results of the
+    finished chunks are saved as the sweep proceeds, and a sweep that is run again resumes from
+    them.
+
+    Parameters
+    ----------
+    model : Structure, CompiledModel or callable
+        The model to vary, or a factory creating the model of a grid point.
+    method : {'eigen', 'exact'}, optional
+        `EigenSolver` (the default) or the stability-function based `ExactBucklingSolver`.
+
+    Methods
+    -------
+    add_parameter(name, values)
+        Adds a keyword argument of the model factory.
+    add_property(name, values, property_name, positions)
+        Adds a parameter that sets a property of elements.
+    add_forces(name, values, dofs)
+        Adds a parameter that sets the nodal forces of degrees of freedom.
+    run(k, return_modes, workers, chunk_size, checkpoint) -> SweepResult
+        Solves every grid point.
+
+    Examples
+    --------
+    >>> sweep = Sweep(structure)
+    >>> sweep.add_property("ks", np.logspace(3, 9, 100), "rotational_stiffnesses", [11, 12])
+    >>> sweep.add_property("ic", [1e7, 2e7, 4e7], "inertias", range(10))
+    >>> sweep.run(k=2).load_factors.shape
+    (100, 3, 2)
+    """
+    def __init__(self, model, method: str = "eigen"):
+        if method not in SOLVERS:
+            raise ValueError(f"Unknown method '{method}'. Available: {', '.join(SOLVERS)}.")
+        self.method = method
+        if isinstance(model, (Structure, CompiledModel)):
+            self.model = model.compile() if isinstance(model, Structure) else model
+            self.factory = None
+        elif callable(model):
+            self.model = None
+            self.factory = model
+        else:
+            raise TypeError("The model must be a Structure, a CompiledModel or a callable returning one.")
+        self._names = []
+        self._values = []
+        self._targets = []
+
+    @property
+    def names(self) -> list:
+        """Names of the parameters, one per grid axis."""
+        return list(self._names)
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the parameter grid."""
+        return tuple(len(values) for values in self._values)
+
+    def add_parameter(self, name: str, values):
+        """
+        Adds a keyword argument of the model factory.
+
+        Parameters
+        ----------
+        name : str
+            Name of the keyword argument.
+        values : array_like
+            Values of the argument along a new grid axis.
+        """
+        if self.factory is None:
+            raise TypeError("Plain parameters need a model factory; use add_property or add_forces for a model.")
+        self._add(name, values, None)
+
+    def add_property(self, name: str, values, property_name: str, positions):
+        """
+        Adds a parameter that sets a property of elements.
+
+        Parameters
+        ----------
+        name : str
+            Name of the parameter.
+        values : array_like
+            Values of the property along a new grid axis, given to all the elements at once.
+        property_name : str
+            A property of the element batch kernels, such as 'inertias', 'areas',
+            'elasticity_moduli' or 'rotational_stiffnesses'.
+        positions : array_like of int
+            Positions of the elements in the element list of the structure.
+        """
+        positions = np.asarray(positions, dtype=np.intp).ravel()
+        self._model_parameter().variant(properties={property_name: (positions, 0.)})
+        self._add(name, values, ("property", property_name, positions))
+
+    def add_forces(self, name: str, values, dofs: list):
+        """
+        Adds a parameter that sets the nodal forces of degrees of freedom.
+
+        Parameters
+        ----------
+        name : str
+            Name of the parameter.
+        values : array_like
+            Forces along a new grid axis, applied to all the degrees of freedom at once.
+        dofs : list of DegreeOfFreedom or int
+            Degrees of freedom of the structure, or their equation numbers. Degrees of freedom are
+            found by their ids with `CompiledModel.dof_index`.
+        """
+        model = self._model_parameter()
+        indices = np.array([model.dof_index(dof) for dof in dofs], dtype=np.intp)
+        if np.any(indices < 0) or np.any(indices >= model.dof_count):
+            raise IndexError("A degree of freedom is not part of the model.")
+        self._add(name, values, ("forces", None, indices))
+
+    def _model_parameter(self) -> CompiledModel:
+        if self.model is None:
+            raise TypeError("Element and force parameters need a model; use add_parameter for a model factory.")
+        return self.model
+
+    def _add(self, name, values, target):
+        if name in self._names:
+            raise ValueError(f"A parameter named '{name}' is already added.")
+        values = np.asarray(values)
+        if values.ndim != 1 or len(values) == 0:
+            raise ValueError(f"The values of parameter '{name}' must be a non-empty one-dimensional array.")
+        self._names.append(name)
+        self._values.append(values)
+        self._targets.append(target)
+
+    def run(self, k: int = 1, return_modes: bool = False, workers: int = None, chunk_size: int = None,
+            checkpoint=None) -> SweepResult:
+        """
+        Solves the k lowest critical load factors at every grid point.
+
+        Parameters
+        ----------
+        k : int, optional
+            Number of modes per grid point (default is 1).
+        return_modes : bool, optional
+            Whether to return the mode shapes (default is False). All grid points must then have
+            the same number of free degrees of freedom.
+        workers : int, optional
+            Number of worker processes. Defaults to the number of CPUs; 1 solves in this process.
+        chunk_size : int, optional
+            Number of grid points per task. Defaults to about four tasks per worker.
+        checkpoint : str or os.PathLike, optional
+            File to save the finished chunks to, and to resume from if it exists.
+
+        Returns
+        -------
+        SweepResult
+            The load factors (and modes) at every grid point, of the grid shape.
+        """
+        shape = self.shape
+        point_count = math.prod(shape)
+        workers = (os.cpu_count() or 1) if workers is None else max(int(workers), 1)
+        chunk_size = chunk_size or max(1, math.ceil(point_count / (4 * workers)))
+        chunks = [(start, min(start + chunk_size, point_count)) for start in range(0, point_count, chunk_size)]
+        load_factors = np.full((point_count, k), np.nan)
+        modes = None
+        completed = np.zeros(point_count, dtype=bool)
+        if checkpoint is not None and os.path.exists(checkpoint):
+            with np.load(os.fspath(checkpoint)) as saved:
+                if tuple(saved["shape"]) != shape or saved["load_factors"].shape[1] != k:
+                    raise ValueError("The checkpoint was saved for another sweep.")
+                load_factors, completed = saved["load_factors"], saved["completed"]
+                modes = saved["modes"] if return_modes and "modes" in saved.files else None
+                if return_modes and modes is None and completed.any():
+                    raise ValueError("The checkpoint was saved without modes.")
+        chunks = [chunk for chunk in chunks if not completed[chunk[0]:chunk[1]].all()]
+
+        task = _SweepTask(self.model, self.factory, self.method, self._values, self._targets, self._names, k,
+                          return_modes)
+        if workers == 1 or len(chunks) <= 1:
+            results = (task.solve(*chunk) for chunk in chunks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(min(workers, len(chunks)), initializer=_initialize_worker,
+                                           initargs=(task,))
+            results = executor.map(_solve_chunk, chunks)
+        try:
+            for (start, stop), (chunk_load_factors, chunk_modes) in zip(chunks, results):
+                load_factors[start:stop] = chunk_load_factors
+                if return_modes:
+                    if modes is None:
+                        modes = np.full((point_count,) + chunk_modes.shape[1:], np.nan)
+                    elif chunk_modes.shape[1:] != modes.shape[1:]:
+                        raise ValueError("Modes can only be returned if all grid points have the same free "
+                                         "degrees of freedom.")
+                    modes[start:stop] = chunk_modes
+                completed[start:stop] = True
+                if checkpoint is not None:
+                    _save_checkpoint(checkpoint, shape, load_factors, completed, modes)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        grids = np.meshgrid(*self._values, indexing="ij")
+        return SweepResult(dict(zip(self._names, grids)), load_factors.reshape(shape + (k,)),
+                           None if modes is None else modes.reshape(shape + modes.shape[1:]))
+
+
+class _SweepTask:
+    """The part of a sweep that the worker processes need to solve grid points."""
+    def __init__(self, model, factory, method, values, targets, names, k, return_modes):
+        self.model = model
+        self.factory = factory
+        self.method = method
+        self.values = values
+        self.targets = targets
+        self.names = names
+        self.k = k
+        self.return_modes = return_modes
+
+    def point_model(self, index: int):
+        point = [values[i] for values, i in zip(self.values, np.unravel_index(index, [len(v) for v in self.values]))]
+        if self.factory is not None:
+            return self.factory(**dict(zip(self.names, point)))
+        forces, properties = None, {}
+        for (kind, property_name, indices), value in zip(self.targets, point):
+            if kind == "forces":
+                forces = np.array(self.model.forces if forces is None else forces)
+                forces[indices] = value
+            else:
+                positions, values = properties.get(property_name, (np.zeros(0, dtype=np.intp), np.zeros(0)))
+                properties[property_name] = (np.concatenate([positions, indices]),
+                                             np.concatenate([values, np.full(len(indices), float(value))]))
+        return self.model.variant(forces, properties)
+
+    def solve(self, start: int, stop: int) -> tuple:
+        load_factors = np.full((stop - start, self.k), np.nan)
+        modes = []
+        for row, index in enumerate(range(start, stop)):
+            model = self.point_model(index)
+            mode_set = SOLVERS[self.method](model).solve_modes(self.k)
+            load_factors[row, :len(mode_set)] = mode_set.load_factors
+            if self.return_modes:
+                padded = np.full((mode_set.modes.shape[0], self.k), np.nan)
+                padded[:, :len(mode_set)] = mode_set.modes
+                modes.append(padded)
+        if not self.return_modes:
+            return load_factors, None
+        if len({mode.shape for mode in modes}) > 1:
+            raise ValueError("Modes can only be returned if all grid points have the same free degrees of freedom.")
+        return load_factors, np.stack(modes)
+
+
+_worker_task = None
+
+
+def _initialize_worker(task: _SweepTask):
+    global _worker_task
+    _worker_task = task
+
+
+def _solve_chunk(chunk: tuple) -> tuple:
+    return _worker_task.solve(*chunk)
+
+
+def _save_checkpoint(path, shape, load_factors, completed, modes):
+    """Saves the finished grid points of a sweep, replacing the previous checkpoint only once written."""
+    path = os.fspath(path)
+    arrays = {"shape": np.array(shape, dtype=np.intp), "load_factors": load_factors, "completed": completed}
+    if modes is not None:
+        arrays["modes"] = modes
+    temporary = f"{path}.tmp.npz"
+    np.savez(temporary, **arrays)
+    os.replace(temporary, path)
@@ -1,17 +1,98 @@
-from math import *
+"""
+Stability functions of a prismatic beam-column under a constant axial force.
+
+The functions evaluate elementwise over arrays, so the stiffness of thousands of members can be
+computed at once. They are written in terms of the load parameter
+
+    q = P·L²/EI
+
+with P compression positive, which covers compression (q > 0), tension (q < 0) and the unloaded
+member (q = 0) without branches in the calling code. Near q = 0 the closed forms are 0/0 and lose
+precision to cancellation, so a series expansion in q is used there; tension uses the hyperbolic
+forms. The legacy functions `c`, `s`, `sb` and `ss` take the stability parameter
+x = L·sqrt(P/EI), negative for tension.
+"""
+import numpy as np
+
+# Below this |q| the series expansions are used; their truncation error there is below 1e-15.
+_SERIES_LIMIT = 0.1
+# Above this stability parameter in tension the hyperbolic functions are replaced by their
+# asymptotic forms, which are exact to machine precision and do not overflow.
+_ASYMPTOTIC_LIMIT = 40.
+_S_SERIES = (4., -2 / 15, -11 / 6300, -1 / 27000, -509 / 582120000, -14617 / 681080400000)
+_SC_SERIES = (2., 1 / 30, 13 / 12600, 11 / 378000, 907 / 1164240000, 27641 / 1362160800000)
+
+
+def stiffness_coefficients(q):
+    """
+    Computes the rotational stiffness coefficients of a beam-column.
+
+    The moments at the ends of a member of flexural stiffness EI/L due to a unit rotation of
+    the near end are s·EI/L at the near end and s·c·EI/L at the far end.
+
+    Parameters
+    ----------
+    q : float or np.ndarray
+        Load parameter P·L²/EI, compression positive.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The stiffness coefficient s and the carry-over stiffness coefficient s·c. They are 4 and 2
+        for q = 0 and infinite at the clamped-clamped buckling loads q = (2nπ)².
+    """
+    q = np.asarray(q, dtype=float)
+    s = np.empty(q.shape)
+    sc = np.empty(q.shape)
+
+    small = np.abs(q) < _SERIES_LIMIT
+    s[small] = np.polynomial.polynomial.polyval(q[small], _S_SERIES)
+    sc[small] = np.polynomial.polynomial.polyval(q[small], _SC_SERIES)
+
+    compression = q >= _SERIES_LIMIT
+    x = np.sqrt(q[compression])
+    h = x / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominator = 4 * np.sin(h) * (np.sin(h) - h * np.cos(h))  # 2 - 2cos(x) - x sin(x) without cancellation
+        s[compression] = x * (np.sin(x) - x * np.cos(x)) / denominator
+        sc[compression] = x * (x - np.sin(x)) / denominator
+
+    tension = q <= -_SERIES_LIMIT
+    x = np.sqrt(-q[tension])
+    asymptotic = x > _ASYMPTOTIC_LIMIT
+    h = np.where(asymptotic, 1., x / 2)
+    denominator = 4 * np.sinh(h) * (h * np.cosh(h) - np.sinh(h))  # 2 - 2cosh(x) + x sinh(x)
+    x_bounded = 2 * h
+    x_large = np.where(asymptotic, x, 3.)
+    s[tension] = np.where(asymptotic, x_large * (x_large - 1) / (x_large - 2),
+                          x_bounded * (x_bounded * np.cosh(x_bounded) - np.sinh(x_bounded)) / denominator)
+    sc[tension] = np.where(asymptotic, x_large / (x_large - 2),
+                           x_bounded * (np.sinh(x_bounded) - x_bounded) / denominator)
+    return s[()], sc[()]
+
+
+def _load_parameter(x):
+    x = np.asarray(x, dtype=float)
+    return np.sign(x) * x ** 2
 
 
 def c(x):
-    return (x - sin(x))/(sin(x) - x*cos(x))
+    """Carry-over factor for the stability parameter x = L·sqrt(P/EI), negative for tension."""
+    s_function, sc_function = stiffness_coefficients(_load_parameter(x))
+    return sc_function / s_function
 
 
 def s(x):
-    return x*((sin(x) - x*cos(x))/(2-2*cos(x)-x*sin(x)))
+    """Stiffness coefficient for the stability parameter x = L·sqrt(P/EI), negative for tension."""
+    return stiffness_coefficients(_load_parameter(x))[0]
 
 
 def sb(x):
-    return s(x)(1+c(x))
+    """End moment due to a unit sway, s·(1 + c), for the stability parameter x, negative for tension."""
+    s_function, sc_function = stiffness_coefficients(_load_parameter(x))
+    return s_function + sc_function
 
 
 def ss(x):
-    return 2*s(x)*(1+c(x))
+    """Twice `sb`, the sway stiffness before the P-Δ term, for the stability parameter x, negative for tension."""
+    return 2 * sb(x)
@@ -1,4 +1,48 @@
+import numpy as np
+
+from .compiled_model import CompiledModel, CompiledElementGroup
+from .dof_map import DofMap
 from .elements.element import Element
+from .loads.load_case import LoadCase
+from .serialization import load_arrays, save_arrays, structure_arrays, structure_elements
+
+
+def _counted(method):
+    """Wraps a list method so that it increments the `version` of the list before changing it."""
+    def counted(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    counted.__name__ = method.__name__
+    counted.__doc__ = method.__doc__
+    return counted
+
+
+class ElementList(list):
+    """
+    List of the elements of a structure that counts its changes.
+
+    Every method that changes the list increments `version`, so the structure can tell whether
+    its degree of freedom numbering is stale without comparing the whole list.
+
+    Attributes
+    ----------
+    version : int
+        Number of changes since the list was created.
+    """
+    version = 0
+
+    __setitem__ = _counted(list.__setitem__)
+    __delitem__ = _counted(list.__delitem__)
+    __iadd__ = _counted(list.__iadd__)
+    __imul__ = _counted(list.__imul__)
+    append = _counted(list.append)
+    extend = _counted(list.extend)
+    insert = _counted(list.insert)
+    pop = _counted(list.pop)
+    remove = _counted(list.remove)
+    clear = _counted(list.clear)
+    sort = _counted(list.sort)
+    reverse = _counted(list.reverse)
 
 
 class Structure:
@@ -9,14 +53,71 @@ class Structure:
     ----------
     elements: list of Element
         Elements that define the structure.
+    dof_ordering : {'id', 'rcm'}, optional
+        Numbering of the free degrees of freedom, see `DofMap` (default is 'id').
 
     Attributes
     ----------
-    elements : list of Element
-        Elements that define the structure.
+    elements : ElementList
+        Elements that define the structure. An assigned list is copied into an `ElementList`.
+    dof_ordering : str
+        Numbering of the free degrees of freedom: 'id' in order of creation or 'rcm' by the
+        bandwidth reducing reverse Cuthill-McKee algorithm.
+
+    Methods
+    -------
+    compile() -> CompiledModel
+        Compiles the structure into an immutable array representation.
+    save(path)
+        Saves the structure to a binary model file.
+    load(path, mmap_mode) -> Structure
+        Loads a structure from a binary model file.
     """
-    def __init__(self, elements: list[Element]):
+    def __init__(self, elements: list[Element], dof_ordering: str = "id"):
         self.elements = elements
+        self.dof_ordering = dof_ordering
+
+    @property
+    def elements(self) -> list[Element]:
+        """Gets and sets the elements that define the structure."""
+        return self._elements
+
+    @elements.setter
+    def elements(self, value: list[Element]):
+        self._elements = ElementList(value)
+        self._dof_map = None
+        self._numbered_version = None
+
+    @property
+    def dof_ordering(self) -> str:
+        """Gets and sets the numbering of the free degrees of freedom, 'id' or 'rcm'."""
+        return self._dof_ordering
+
+    @dof_ordering.setter
+    def dof_ordering(self, value: str):
+        if value not in DofMap.orderings:
+            raise ValueError(f"Unknown degree of freedom ordering '{value}'. Available: {', '.join(DofMap.orderings)}.")
+        self._dof_ordering = value
+        self._dof_map = None
+
+    @property
+    def dof_map(self) -> DofMap:
+        """
+        Retrieve the cached numbering of the degrees of freedom.
+
+        The numbering is rebuilt only when the element list, a restraint, a degree of freedom
+        coupling or an element connectivity has changed since it was last built.
+
+        Returns
+        -------
+        DofMap
+            Degree of freedom numbering of the structure.
+        """
+        version = self._elements.version
+        if self._dof_map is None or not self._dof_map.is_current or self._numbered_version != version:
+            self._dof_map = DofMap(self.elements, self.dof_ordering)
+            self._numbered_version = version
+        return self._dof_map
 
     @property
     def nodes(self):
@@ -28,10 +129,7 @@ class Structure:
         set of Node
             Set of nodes across all elements in the structure.
         """
-        nodes = set()
-        for element in self.elements:
-            nodes = nodes.union(element.nodes)
-        return nodes
+        return set(self.dof_map.nodes)
 
     @property
     def degrees_of_freedom(self):
@@ -41,14 +139,9 @@ class Structure:
         Returns
         -------
         list of DegreeOfFreedom
-            Degrees of freedom sorted by restraint status and ID.
+            Degrees of freedom in equation order, free ones first.
         """
-        dofs = set()
-        for element in self.elements:
-            for dof in element.stiffness_matrix_dofs:
-                dofs.add(dof)
-
-        return sorted(dofs, key=lambda dof: (dof.restrained, dof.id))
+        return list(self.dof_map.degrees_of_freedom)
 
     @property
     def free_degrees_of_freedom(self):
@@ -58,9 +151,9 @@ class Structure:
         Returns
         -------
         list of DegreeOfFreedom
-            Unrestrained degrees of freedom sorted by ID.
+            Unrestrained degrees of freedom in equation order.
         """
-        return sorted({dof for dof in self.degrees_of_freedom if not dof.restrained}, key=lambda dof: dof.id)
+        return self.dof_map.free_degrees_of_freedom
 
     @property
     def restrained_degrees_of_freedom(self):
@@ -72,4 +165,106 @@ class Structure:
         list of DegreeOfFreedom
             Restrained degrees of freedom sorted by ID.
         """
-        return sorted({dof for dof in self.degrees_of_freedom if dof.restrained}, key=lambda dof: dof.id)
+        return self.dof_map.restrained_degrees_of_freedom
+
+    def load_matrix(self, load_cases: list[LoadCase]) -> np.ndarray:
+        """
+        Assembles the force vectors of several load cases side by side.
+
+        Parameters
+        ----------
+        load_cases : list of LoadCase
+            The load cases to assemble.
+
+        Returns
+        -------
+        np.ndarray
+            Forces in equation order, of shape (n_dofs, n_cases).
+        """
+        dof_map = self.dof_map
+        load_matrix = np.zeros((dof_map.count, len(load_cases)))
+        for column, load_case in enumerate(load_cases):
+            load_matrix[:, column] = load_case.force_vector(dof_map.index, dof_map.count)
+        return load_matrix
+
+    def compile(self) -> CompiledModel:
+        """
+        Compiles the structure into an immutable array representation.
+
+        The degree of freedom numbering is reused from the cached `dof_map`; coordinates, section
+        and material properties, restraints and loads are read from the model objects at the time
+        of the call, so the structure should be compiled again after they change.
+
+        Returns
+        -------
+        CompiledModel
+            Compact array representation of the structure.
+        """
+        dof_map = self.dof_map
+        nodes = sorted(dof_map.nodes, key=lambda node: node.id)
+        node_index = {node: i for i, node in enumerate(nodes)}
+        node_dofs = [[dof_map.index.get(dof, -1) for dof in (node.x_dof, node.y_dof, node.rz_dof)] for node in nodes]
+        dofs = dof_map.degrees_of_freedom
+        element_groups = []
+        for group in dof_map.element_groups:
+            elements = [self.elements[position] for position in group.positions]
+            connectivity = np.array([(node_index[element.start_node], node_index[element.end_node])
+                                     for element in elements], dtype=np.intp)
+            # Types without batch kernels, and elements with assigned stiffness matrices, use the default
+            # kernels of Element on the stacked matrices of the element objects.
+            element_type = Element if group.element_type.uses_element_matrices(elements) else group.element_type
+            element_groups.append(CompiledElementGroup(
+                element_type, group.positions, connectivity, group.dof_indices,
+                element_type.batch_properties(elements),
+                np.array([element.geometric_nonlinearity for element in elements], dtype=bool)))
+
+        return CompiledModel(coordinates=np.array([node.coordinates for node in nodes], dtype=float),
+                             node_dofs=np.array(node_dofs, dtype=np.intp),
+                             free_count=dof_map.free_count,
+                             forces=np.array([dof.force for dof in dofs], dtype=float),
+                             prescribed_displacements=np.array([dof.displacement for dof in
+                                                                dof_map.restrained_degrees_of_freedom], dtype=float),
+                             element_groups=element_groups,
+                             node_ids=np.array([node.id for node in nodes]),
+                             dof_ids=np.array([dof.id for dof in dofs]),
+                             scatter_plan=dof_map.scatter_plan)
+
+    def save(self, path):
+        """
+        Saves the structure to a binary model file.
+
+        The file is an uncompressed `.npz` archive of the nodes, degrees of freedom with their
+        restraints, forces and prescribed displacements, sections and elements, see
+        `stablex.serialization`. It can be loaded without running the script that built the
+        structure, for example by worker processes.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The model file. It is written as given, without appending an extension.
+        """
+        save_arrays(path, {**structure_arrays(self.elements), "dof_ordering": np.array(self.dof_ordering)})
+
+    @classmethod
+    def load(cls, path, mmap_mode: str = None) -> "Structure":
+        """
+        Loads a structure from a binary model file written by `save`.
+
+        New nodes, degrees of freedom, sections and elements are created, numbered in the order
+        in which they were saved, so the loaded structure compiles to the same equations.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The model file.
+        mmap_mode : {None, 'r', 'r+', 'c'}, optional
+            If given, the arrays of the file are memory-mapped with this mode instead of read,
+            as for `np.load`.
+
+        Returns
+        -------
+        Structure
+            The loaded structure.
+        """
+        arrays = load_arrays(path, mmap_mode)
+        return cls(structure_elements(arrays), str(arrays["dof_ordering"]) if "dof_ordering" in arrays else "id")
@@ -1,7 +1,33 @@
-from matplotlib import pyplot as plt
-from mpl_toolkits.axisartist import Subplot
+_figure = None
+_axes = None
 
-fig = plt.figure(facecolor='black')
-ax = Subplot(fig, 111, facecolor='black')
-ax.axis('equal')
-fig.add_subplot(ax)
+
+def axes():
+    """
+    Returns the axes that structures are plotted on, creating the figure on first use.
+
+    Importing matplotlib and creating the figure is deferred until something is plotted, so that
+    analyses never load a GUI backend.
+    """
+    global _figure, _axes
+    if _axes is None:
+        from matplotlib import pyplot as plt
+        from mpl_toolkits.axisartist import Subplot
+
+        _figure = plt.figure(facecolor='black')
+        _axes = Subplot(_figure, 111, facecolor='black')
+        _axes.axis('equal')
+        _figure.add_subplot(_axes)
+    return _axes
+
+
+def __getattr__(name):
+    if name == "ax":
+        return axes()
+    if name == "fig":
+        axes()
+        return _figure
+    if name == "plt":
+        from matplotlib import pyplot as plt
+        return plt
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,7 @@ from stablex.visualization.visual_element import VisualElement
 import matplotlib.pyplot as plt
 from PIL import Image
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-from stablex.visualization import ax
+from stablex.visualization import axes
 import pathlib
 
 
@@ -15,7 +15,7 @@ class VisualRotationalSpringElement(VisualElement):
     def plot_element(self):
         imagebox = OffsetImage(self.image, zoom=0.1)
         ab = AnnotationBbox(imagebox, self.element.start_node.coordinates, frameon=False)
-        ax.add_artist(ab)
+        axes().add_artist(ab)
         plt.draw()
 
     def plot_global_displacement(self, scale):
@@ -23,5 +23,5 @@ class VisualRotationalSpringElement(VisualElement):
         x_coord = self.element.start_node.x + self.element.start_node.x_dof.displacement*scale
         y_coord = self.element.start_node.y + self.element.start_node.y_dof.displacement*scale
         ab = AnnotationBbox(imagebox, (x_coord, y_coord), frameon=False)
-        ax.add_artist(ab)
+        axes().add_artist(ab)
         plt.draw()
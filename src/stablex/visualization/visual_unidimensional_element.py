@@ -1,6 +1,6 @@
 import numpy as np
 
-from stablex.visualization import ax
+from stablex.visualization import axes
 from stablex.visualization.visual_element import VisualElement
 
 
@@ -16,7 +16,7 @@ class VisualUniDimensionalElement(VisualElement):
     def plot_element(self):
         x_array = np.array([self.element.start_node.x, self.element.end_node.x])
         y_array = np.array([self.element.start_node.y, self.element.end_node.y])
-        ax.plot(x_array, y_array, 'yellow', linestyle="solid", marker='o')
+        axes().plot(x_array, y_array, 'yellow', linestyle="solid", marker='o')
 
     def _get_local_coordinates(self):
         return np.stack(np.array([[x/self.no_of_segments * self.element.length, 0]
@@ -34,4 +34,4 @@ class VisualUniDimensionalElement(VisualElement):
     def plot_global_displacement(self, scale):
         global_array = self.transformation_matrix().dot(scale * self._get_local_displacement()) + \
                        self._get_global_coordinates()
-        ax.plot(global_array[0].real, global_array[1].real, 'white', linestyle='--')
+        axes().plot(global_array[0].real, global_array[1].real, 'white', linestyle='--')
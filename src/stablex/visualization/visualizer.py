@@ -1,5 +1,7 @@
 from stablex import Structure
-from stablex.visualization import visual_element_factory, plt
+from matplotlib import pyplot as plt
+
+from stablex.visualization import visual_element_factory
 
 
 def plot_structure(structure: Structure, scale):
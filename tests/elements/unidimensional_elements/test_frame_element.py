@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from stablex import Node, FrameElement, UserDefinedSection
+
+
+class TestFrameElementBatchKernels(unittest.TestCase):
+
+    def setUp(self):
+        section = UserDefinedSection(area=2850, inertia=1943e4)
+        nodes = [Node(0, 0), Node(0, 3000), Node(4000, 4500), Node(-1000, 200)]
+        self.elements = [FrameElement(nodes[0], nodes[1], section),
+                         FrameElement(nodes[1], nodes[2], section, elasticity_modulus=70000),
+                         FrameElement(nodes[3], nodes[2], UserDefinedSection(500, 1e5))]
+        self.end_forces = np.array([[0, 0, 0, -1500, 0, 0], [0, 0, 0, 800, 0, 0], [0, 0, 0, -20, 0, 0]], dtype=float)
+
+    def test_batch_global_stiffness_matches_elements(self):
+        arrays = FrameElement.batch_arrays(self.elements)
+        axial_forces = FrameElement.batch_axial_forces(self.end_forces)
+        matrices = FrameElement.batch_global_stiffness_matrices(axial_forces=axial_forces, **arrays)
+        for element, end_forces, matrix in zip(self.elements, self.end_forces, matrices):
+            element.stiffness_matrix = (element.first_order_elastic_stiffness_matrix()
+                                        + element.geometric_stiffness_matrix(end_forces))
+            np.testing.assert_allclose(matrix, element.global_stiffness_matrix(), atol=1e-6)
+
+    def test_batch_geometric_only(self):
+        arrays = FrameElement.batch_arrays(self.elements)
+        matrices = FrameElement.batch_global_stiffness_matrices(axial_forces=np.zeros(3), include_elastic=False,
+                                                                **arrays)
+        np.testing.assert_array_equal(matrices, np.zeros((3, 6, 6)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+import numpy as np
+
+from stablex import Node, TrussElement, UserDefinedSection
+
+
+class TestTrussElementBatchKernels(unittest.TestCase):
+
+    def test_batch_global_stiffness_matches_elements(self):
+        nodes = [Node(0, 0), Node(3000, 4000), Node(6000, 0)]
+        elements = [TrussElement(nodes[0], nodes[1], UserDefinedSection(100, 0)),
+                    TrussElement(nodes[1], nodes[2], UserDefinedSection(300, 0))]
+        end_forces = np.array([[0, 0, -500, 0], [0, 0, 250, 0]], dtype=float)
+        matrices = TrussElement.batch_global_stiffness_matrices(
+            axial_forces=TrussElement.batch_axial_forces(end_forces), **TrussElement.batch_arrays(elements))
+        for element, forces, matrix in zip(elements, end_forces, matrices):
+            element.stiffness_matrix = (element.first_order_elastic_stiffness_matrix()
+                                        + element.geometric_stiffness_matrix(forces))
+            np.testing.assert_allclose(matrix, element.global_stiffness_matrix(), atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from stablex import EigenSolver, Solver
+from stablex.solver.batch_solver import BatchSolver
+from tests.solver.test_sweep import semi_rigid_frame
+
+
+class TestBatchSolver(unittest.TestCase):
+    stiffnesses = np.array([1e8, 1e9, 1e10, 1e11])
+    inertias = np.array([[1e7] * 8, [2e7] * 8, [4e7] * 8, [1e7] * 4 + [4e7] * 4])
+
+    def batch(self, **kwargs):
+        return BatchSolver(semi_rigid_frame(), properties={"rotational_stiffnesses": ([9, 10], self.stiffnesses),
+                                                           "inertias": (range(8), self.inertias)}, **kwargs)
+
+    def variants(self):
+        return [semi_rigid_frame().compile().variant(properties={"rotational_stiffnesses": ([9, 10], stiffness),
+                                                                 "inertias": (range(8), inertias)})
+                for stiffness, inertias in zip(self.stiffnesses, self.inertias)]
+
+    def test_stiffness_matrices_match_variants(self):
+        matrices = self.batch().stiffness_matrices()
+        for matrix, variant in zip(matrices, self.variants()):
+            np.testing.assert_allclose(matrix, variant.global_stiffness_matrix(), rtol=1e-12, atol=1e-6)
+
+    def test_first_order_analysis_matches_solver(self):
+        model = semi_rigid_frame().compile()
+        forces = np.tile(model.forces, (4, 1))
+        forces[:, 0] = [0., 1., 2., 5.]
+        displacements, reactions = self.batch(forces=forces).analyze()
+        for row, variant in enumerate(self.variants()):
+            result = Solver(variant.variant(forces=forces[row])).analyze()
+            np.testing.assert_allclose(displacements[row], result.displacements, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(reactions[row], result.reactions, rtol=1e-9, atol=1e-9)
+
+    def test_buckling_modes_match_eigen_solver(self):
+        load_factors, modes = self.batch().buckling_modes(k=3)
+        self.assertEqual(modes.shape, (4, semi_rigid_frame().compile().free_count, 3))
+        for row, variant in enumerate(self.variants()):
+            expected_load_factors, expected_modes = EigenSolver(variant).buckling_modes(3)
+            np.testing.assert_allclose(load_factors[row], expected_load_factors, rtol=1e-9)
+            # Symmetric modes have two largest components of equal size, so the sign may differ.
+            np.testing.assert_allclose(np.abs(np.sum(modes[row] * expected_modes, axis=0)), 1, rtol=1e-9)
+
+    def test_missing_modes_are_nan(self):
+        model = semi_rigid_frame().compile()
+        load_factors, modes = BatchSolver(model, forces=np.tile(model.forces, (2, 1))).buckling_modes(k=model.free_count)
+        self.assertTrue(np.isnan(load_factors[:, -1]).all())
+        self.assertTrue(np.isnan(modes[:, :, -1]).all())
+        np.testing.assert_allclose(load_factors[0, 0], EigenSolver(model).buckling_modes()[0][0])
+
+    def test_invalid_variants(self):
+        with self.assertRaises(ValueError):
+            BatchSolver(semi_rigid_frame())
+        with self.assertRaises(ValueError):
+            self.batch(forces=np.zeros((3, semi_rigid_frame().compile().dof_count)))
+        with self.assertRaises(ValueError):
+            BatchSolver(semi_rigid_frame(), properties={"inertias": ([9], [1., 2.])})
+
+
+if __name__ == '__main__':
+    unittest.main()
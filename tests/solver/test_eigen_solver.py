@@ -0,0 +1,116 @@
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from stablex import Node, FrameElement, Rectangle, Structure, EigenSolver, Solver
+from stablex.solver.linear_solvers import import_scipy_linalg
+
+
+def cantilever_column(segments):
+    section = Rectangle(100, 100)
+    nodes = [Node(0, 100 * i) for i in range(segments + 1)]
+    for dof in (nodes[0].x_dof, nodes[0].y_dof, nodes[0].rz_dof):
+        dof.restrained = True
+    nodes[-1].y_dof.force = -1
+    elements = [FrameElement(start, end, section, True) for start, end in zip(nodes[:-1], nodes[1:])]
+    return Structure(elements), elements[0]
+
+
+class TestEigenSolver(unittest.TestCase):
+    def test_euler_load(self):
+        structure, element = cantilever_column(20)
+        eigenvalue, eigenvector = EigenSolver(structure).solve(mode_shape=1)
+        euler_load = math.pi ** 2 * element.elasticity_modulus * element.section.inertia / (4 * 2000 ** 2)
+        self.assertAlmostEqual(eigenvalue / euler_load, 1, places=4)
+        self.assertEqual(eigenvector.shape, (len(structure.free_degrees_of_freedom),))
+        self.assertEqual(structure.free_degrees_of_freedom[0].displacement, eigenvector[0])
+
+    def test_one_assembly_and_factorization(self):
+        structure, _ = cantilever_column(20)
+        expected = EigenSolver(structure).buckling_modes(2)[0]
+        assemble, cholesky = Solver.global_stiffness_matrix, np.linalg.cholesky
+        with mock.patch.object(Solver, "global_stiffness_matrix", side_effect=assemble, autospec=True) as assembled, \
+                mock.patch("numpy.linalg.cholesky", side_effect=cholesky) as factorized:
+            load_factors, _ = EigenSolver(structure).buckling_modes(2)
+        np.testing.assert_allclose(load_factors, expected)
+        # The elastic matrix is assembled and factorized once, for the first-order analysis. Without
+        # SciPy that analysis solves with numpy, and the eigenvalue problem needs its own factorization.
+        elastic = [call for call in assembled.call_args_list if call.kwargs.get("include_elastic", True)]
+        self.assertEqual(len(elastic), 1)
+        self.assertEqual(factorized.call_count, 0 if import_scipy_linalg() is not None else 1)
+
+    def test_mode_set(self):
+        structure, _ = cantilever_column(20)
+        mode_set = EigenSolver(structure).solve_modes(4)
+        self.assertEqual(len(mode_set), 4)
+        self.assertEqual(mode_set.modes.shape, (len(structure.free_degrees_of_freedom), 4))
+        self.assertTrue(np.all(np.diff(mode_set.load_factors) > 0))
+        self.assertAlmostEqual(mode_set.load_factors[1] / mode_set.load_factors[0], 9, places=2)
+        node_displacements = mode_set.node_displacements(2)
+        self.assertEqual(node_displacements.shape, (21, 3))
+        np.testing.assert_array_equal(node_displacements[0], 0)
+        self.assertIs(mode_set.node_displacements(2), node_displacements)
+        with self.assertRaises(IndexError):
+            mode_set.mode(5)
+
+    def test_lanczos_matches_dense(self):
+        structure, _ = cantilever_column(200)
+        self.assertTrue(Solver(structure).sparse)
+        load_factors, modes = EigenSolver(structure).buckling_modes(3)
+        threshold = Solver.sparse_threshold
+        try:
+            Solver.sparse_threshold = 10 ** 6
+            dense_load_factors, dense_modes = EigenSolver(structure).buckling_modes(3)
+        finally:
+            Solver.sparse_threshold = threshold
+        np.testing.assert_allclose(load_factors, dense_load_factors, rtol=1e-6)
+        np.testing.assert_allclose(np.abs(modes), np.abs(dense_modes), atol=1e-6)
+        self.assertTrue(np.all(np.diff(load_factors) > 0))
+
+
+class TestSensitivities(unittest.TestCase):
+    def central_difference(self, model, name, position, step=1e-5):
+        group_indices, rows = model.element_locations([position])
+        value = model.element_groups[group_indices[0]].properties[name][rows[0]]
+        load_factors = [EigenSolver(model.variant(properties={name: ([position], value * (1 + sign * step))}))
+                        .buckling_modes(2)[0] for sign in (1, -1)]
+        return (load_factors[0] - load_factors[1]) / (2 * step * value)
+
+    def test_match_finite_differences(self):
+        from tests.solver.test_first_order_solver import portal_frame
+        from tests.solver.test_sweep import semi_rigid_frame
+        for structure, checks in ((portal_frame(), [("inertias", 0), ("areas", 3), ("rotational_stiffnesses", 4),
+                                                    ("elasticity_moduli", 2), ("areas", 1)]),
+                                  (semi_rigid_frame(1e8), [("inertias", 2), ("inertias", 8),
+                                                           ("rotational_stiffnesses", 9)])):
+            model = structure.compile()
+            load_factors, derivatives = EigenSolver(model).sensitivities(2)
+            np.testing.assert_array_equal(load_factors, EigenSolver(model).buckling_modes(2)[0])
+            self.assertTrue(np.isnan(derivatives["rotational_stiffnesses"][:, 0]).all())
+            for name, position in checks:
+                with self.subTest(name=name, position=position):
+                    np.testing.assert_allclose(derivatives[name][:, position],
+                                               self.central_difference(model, name, position), rtol=1e-4)
+
+    def test_euler_load_scales_with_inertia(self):
+        structure, element = cantilever_column(10)
+        load_factors, derivatives = EigenSolver(structure).sensitivities()
+        # λ is proportional to E·I, so the derivatives add up to λ/I and λ/E.
+        self.assertAlmostEqual(derivatives["inertias"].sum() * element.section.inertia / load_factors[0], 1)
+        self.assertAlmostEqual(derivatives["elasticity_moduli"].sum() * element.elasticity_modulus
+                               / load_factors[0], 1)
+        self.assertLess(np.abs(derivatives["areas"]).max() * element.section.area / load_factors[0], 1e-8)
+
+    def test_return_modes(self):
+        structure, _ = cantilever_column(10)
+        mode_set, derivatives = EigenSolver(structure).sensitivities(2, return_modes=True)
+        expected = EigenSolver(structure).solve_modes(2)
+        np.testing.assert_array_equal(mode_set.load_factors, expected.load_factors)
+        np.testing.assert_array_equal(mode_set.modes, expected.modes)
+        self.assertEqual(derivatives["inertias"].shape, (2, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
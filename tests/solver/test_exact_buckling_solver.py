@@ -0,0 +1,72 @@
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from stablex import Node, FrameElement, Rectangle, Structure, EigenSolver
+from stablex.solver.exact_buckling_solver import ExactBucklingSolver
+
+
+def column(segments, clamped_top=False):
+    nodes = [Node(0, 5000 * i / segments) for i in range(segments + 1)]
+    for dof in (nodes[0].x_dof, nodes[0].y_dof, nodes[0].rz_dof):
+        dof.restrained = True
+    if clamped_top:
+        nodes[-1].x_dof.restrained = True
+        nodes[-1].rz_dof.restrained = True
+    nodes[-1].y_dof.force = -1
+    elements = [FrameElement(start, end, Rectangle(100, 100), True) for start, end in zip(nodes[:-1], nodes[1:])]
+    element = elements[0]
+    return Structure(elements), element.elasticity_modulus * element.section.inertia / 5000 ** 2
+
+
+def portal_frame(segments):
+    def member(start, end):
+        nodes = [start] + [Node(start.x + (end.x - start.x) * i / segments, start.y + (end.y - start.y) * i / segments)
+                           for i in range(1, segments)] + [end]
+        return [FrameElement(a, b, Rectangle(100, 200), True) for a, b in zip(nodes[:-1], nodes[1:])]
+
+    n1, n2, n3, n4 = Node(0, 0), Node(0, 4000), Node(6000, 4000), Node(6000, 0)
+    for dof in (n1.x_dof, n1.y_dof, n1.rz_dof, n4.x_dof, n4.y_dof):
+        dof.restrained = True
+    n2.y_dof.force = -1
+    n3.y_dof.force = -1
+    return Structure(member(n1, n2) + member(n2, n3) + member(n3, n4))
+
+
+class TestExactBucklingSolver(unittest.TestCase):
+    def test_cantilever_with_one_element(self):
+        structure, ei_over_l2 = column(1)
+        mode_set = ExactBucklingSolver(structure).solve_modes(3)
+        np.testing.assert_allclose(mode_set.load_factors / (math.pi ** 2 / 4 * ei_over_l2), [1, 9, 25], rtol=1e-8)
+
+    def test_member_modes_are_counted(self):
+        structure, ei_over_l2 = column(1, clamped_top=True)
+        self.assertEqual(len(structure.free_degrees_of_freedom), 1)
+        mode_set = ExactBucklingSolver(structure).solve_modes(2)
+        np.testing.assert_allclose(mode_set.load_factors / ei_over_l2, [4 * math.pi ** 2, 8.986818916 ** 2],
+                                   rtol=1e-8)
+
+    def test_independent_of_subdivision(self):
+        exact = ExactBucklingSolver(portal_frame(1)).solve_modes(2).load_factors
+        subdivided = ExactBucklingSolver(portal_frame(3)).solve_modes(2).load_factors
+        np.testing.assert_allclose(subdivided, exact, rtol=1e-8)
+        approximate = EigenSolver(portal_frame(8)).solve_modes(2).load_factors
+        np.testing.assert_allclose(approximate, exact, rtol=1e-4)
+
+    def test_one_assembly_per_trial(self):
+        solver = ExactBucklingSolver(portal_frame(1))
+        single = solver.critical_load_factor(2)
+        with mock.patch.object(ExactBucklingSolver, 'stiffness_matrix', autospec=True,
+                               side_effect=ExactBucklingSolver.stiffness_matrix) as assemble, \
+                mock.patch.object(ExactBucklingSolver, 'eigenvalue_count', autospec=True,
+                                  side_effect=ExactBucklingSolver.eigenvalue_count) as count:
+            mode_set = solver.solve_modes(2)
+        self.assertEqual(assemble.call_count, count.call_count)
+        self.assertEqual(sum(call.args[1] == 0. for call in count.call_args_list), 1)
+        self.assertAlmostEqual(mode_set.load_factors[1] / single, 1, places=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
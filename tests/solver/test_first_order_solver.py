@@ -0,0 +1,178 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from stablex import Node, FrameElement, TrussElement, LinearRotationalSpringElement, Rectangle, UserDefinedSection, \
+    Structure, Solver, LoadCase, NodalLoad
+from stablex.elements.element import Element
+from stablex.solver.linear_solvers import LowRankUpdateSolver
+
+
+def portal_frame():
+    n1, n2, n3, n4 = Node(0, 0), Node(0, 3000), Node(4000, 3000), Node(4000, 0)
+    section = Rectangle(100, 200)
+    n5 = Node(4000, 3000)
+    n5.x_dof = n3.x_dof
+    n5.y_dof = n3.y_dof
+    elements = [FrameElement(n1, n2, section, True), FrameElement(n2, n5, section),
+                FrameElement(n3, n4, section, True), TrussElement(n1, n3, UserDefinedSection(500, 0)),
+                LinearRotationalSpringElement(n3, n5, 1e9)]
+    for dof in (n1.x_dof, n1.y_dof, n1.rz_dof, n4.x_dof, n4.y_dof):
+        dof.restrained = True
+    n2.x_dof.force = 1000
+    n2.y_dof.force = -50000
+    n3.y_dof.force = -50000
+    return Structure(elements)
+
+
+class AxialBar(Element):
+    """A bar that only implements the per-object methods of `Element`, with no batch kernels."""
+    __slots__ = ("axial_stiffness",)
+
+    def __init__(self, start_node, end_node, axial_stiffness):
+        super().__init__(start_node, end_node)
+        self.axial_stiffness = axial_stiffness
+
+    @property
+    def stiffness_matrix_dofs(self):
+        return [self.start_node.x_dof, self.start_node.y_dof, self.end_node.x_dof, self.end_node.y_dof]
+
+    def first_order_elastic_stiffness_matrix(self):
+        k = self.axial_stiffness
+        return np.array([[k, 0, -k, 0], [0, 0, 0, 0], [-k, 0, k, 0], [0, 0, 0, 0]])
+
+    def geometric_stiffness_matrix(self, end_forces):
+        return np.zeros((4, 4))
+
+    def transformation_matrix(self):
+        dx, dy = self.end_node.x - self.start_node.x, self.end_node.y - self.start_node.y
+        c, s = np.array([dx, dy]) / np.hypot(dx, dy)
+        return np.array([[c, s, 0, 0], [-s, c, 0, 0], [0, 0, c, s], [0, 0, -s, c]])
+
+
+class TestSparseAssembly(unittest.TestCase):
+    def setUp(self):
+        self.structure = portal_frame()
+
+    def test_sparse_matrix_matches_dense(self):
+        dense = Solver(self.structure, sparse=False)._global_stiffness_matrix
+        sparse = Solver(self.structure, sparse=True)._global_stiffness_matrix
+        np.testing.assert_allclose(sparse.toarray(), dense)
+
+    def test_sparse_solution_matches_dense(self):
+        dense = Solver(self.structure, sparse=False)
+        dense.solve_first_order_elastic()
+        sparse = Solver(self.structure, sparse=True)
+        sparse.solve_first_order_elastic()
+        np.testing.assert_allclose(sparse.displacement_vector, dense.displacement_vector)
+        np.testing.assert_allclose(sparse.reactions_vector, dense.reactions_vector)
+
+    def test_dense_default_without_scipy(self):
+        threshold = Solver.sparse_threshold
+        try:
+            Solver.sparse_threshold = 1
+            self.assertTrue(Solver(self.structure).sparse)
+            with mock.patch("stablex.solver.first_order_solver.scipy_sparse_available", return_value=False):
+                solver = Solver(self.structure)
+            self.assertFalse(solver.sparse)
+            self.assertEqual(solver.linear_solver.name, "cholesky")
+        finally:
+            Solver.sparse_threshold = threshold
+
+    def test_reactions_balance_loads(self):
+        solver = Solver(self.structure)
+        solver.solve_first_order_elastic()
+        self.assertAlmostEqual(solver.reactions_vector[1] + solver.reactions_vector[4], 100000)
+
+
+class TestElementMatrices(unittest.TestCase):
+    def test_elements_without_batch_kernels(self):
+        structure = portal_frame()
+        truss = structure.elements[3]
+        expected = Solver(structure).analyze()
+        bar = AxialBar(truss.start_node, truss.end_node, truss.section.area * truss.elasticity_modulus / truss.length)
+        structure.elements[3] = bar
+        self.assertIs(structure.compile().element_groups[1].element_type, Element)
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                result = Solver(structure, sparse=sparse).analyze()
+                np.testing.assert_allclose(result.displacements, expected.displacements, rtol=1e-9, atol=1e-12)
+                np.testing.assert_allclose(result.end_forces[1], expected.end_forces[1], rtol=1e-9)
+
+    def test_assigned_stiffness_matrix(self):
+        structure = portal_frame()
+        expected = Solver(structure).analyze()
+        for element in structure.elements:
+            element.stiffness_matrix = 2 * element.first_order_elastic_stiffness_matrix()
+        np.testing.assert_allclose(Solver(structure).analyze().displacements, expected.displacements / 2,
+                                   rtol=1e-9, atol=1e-12)
+
+
+class TestLoadCases(unittest.TestCase):
+    def setUp(self):
+        self.structure = portal_frame()
+        n2, n3 = self.structure.elements[1].start_node, self.structure.elements[2].start_node
+        self.dofs = (n2.x_dof, n2.y_dof, n3.y_dof)
+        self.forces = [dof.force for dof in self.dofs]
+        self.load_cases = [LoadCase("gravity", [NodalLoad(n2.y_dof, -50000), NodalLoad(n3.y_dof, -50000)]),
+                           LoadCase("lateral", [NodalLoad(n2.x_dof, 1000)])]
+
+    def test_superposition_matches_single_solve(self):
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                solver = Solver(self.structure, sparse=sparse)
+                displacements, reactions = solver.solve_load_cases(self.load_cases)
+                self.assertEqual(displacements.shape, (solver.model.free_count, 2))
+                solver.solve_first_order_elastic()
+                np.testing.assert_allclose(displacements.sum(axis=1), solver.displacement_vector)
+                np.testing.assert_allclose(reactions.sum(axis=1), solver.reactions_vector)
+
+    def test_degrees_of_freedom_are_not_modified(self):
+        Solver(self.structure).solve_load_cases(self.load_cases)
+        self.assertEqual([dof.force for dof in self.dofs], self.forces)
+        self.assertEqual([dof.displacement for dof in self.dofs], [0, 0, 0])
+
+
+class TestUpdate(unittest.TestCase):
+    def assert_matches_fresh_analysis(self, solver, result):
+        expected = Solver(solver.model, sparse=solver.sparse).analyze()
+        np.testing.assert_allclose(result.displacements, expected.displacements, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(result.reactions, expected.reactions, rtol=1e-9, atol=1e-6)
+
+    def test_property_changes_update_the_factorization(self):
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                solver = Solver(portal_frame(), sparse=sparse)
+                solver.analyze()
+                for stiffness in (1e6, 1e7, 1e12):
+                    solver.update({"rotational_stiffnesses": ([4], stiffness)})
+                    self.assert_matches_fresh_analysis(solver, solver.analyze())
+                # Changing the same spring again does not add to the rank.
+                self.assertEqual(solver.linear_solver.rank, 1)
+                solver.update({"inertias": ([0], 1e9), "areas": ([3], 1000.)})
+                self.assertLessEqual(solver.linear_solver.rank, 5)
+                self.assertEqual(solver.linear_solver.refactorization_count, 0)
+                self.assert_matches_fresh_analysis(solver, solver.analyze())
+
+    def test_forces_and_refactorization(self):
+        structure = portal_frame()
+        solver = Solver(structure, linear_solver=LowRankUpdateSolver(max_rank=2))
+        solver.analyze()
+        forces = np.array(solver.model.forces)
+        forces[0] = 5000.
+        solver.update({"inertias": ([0, 2], [1e9, 2e9])}, forces)
+        self.assertEqual(solver.linear_solver.refactorization_count, 1)
+        self.assertEqual(solver.linear_solver.rank, 0)
+        self.assert_matches_fresh_analysis(solver, solver.analyze())
+        self.assertEqual(structure.elements[0].section.inertia, Rectangle(100, 200).inertia)
+
+    def test_update_before_analysis(self):
+        solver = Solver(portal_frame())
+        solver.update({"rotational_stiffnesses": ([4], 1e6)})
+        self.assertNotIsInstance(solver.linear_solver, LowRankUpdateSolver)
+        self.assert_matches_fresh_analysis(solver, solver.analyze())
+
+
+if __name__ == '__main__':
+    unittest.main()
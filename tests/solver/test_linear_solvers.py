@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from stablex import Solver
+from stablex.solver.linear_solvers import LINEAR_SOLVERS, LowRankUpdateSolver, make_linear_solver
+from tests.solver.test_first_order_solver import portal_frame
+
+
+class TestLinearSolvers(unittest.TestCase):
+    def setUp(self):
+        self.structure = portal_frame()
+        self.reference = Solver(self.structure, sparse=False)
+        self.reference.solve_first_order_elastic()
+
+    def test_backends_match(self):
+        for name in LINEAR_SOLVERS:
+            with self.subTest(backend=name):
+                solver = Solver(self.structure, linear_solver=name)
+                solver.solve_first_order_elastic()
+                np.testing.assert_allclose(solver.displacement_vector, self.reference.displacement_vector,
+                                           rtol=1e-8, atol=1e-12)
+
+    def test_factorization_is_reused(self):
+        rhs = np.column_stack([self.reference.force_vector, 2 * self.reference.force_vector])
+        solution = self.reference.solve(rhs)
+        np.testing.assert_allclose(solution[:, 1], 2 * self.reference.displacement_vector)
+
+    def test_indefinite_matrix(self):
+        matrix = np.array([[1., 2., 0.], [2., 1., 0.], [0., 0., -3.]])
+        rhs = np.array([1., 2., 3.])
+        for name in ("cholesky", "ldl", "banded", "sparse_ldl"):
+            with self.subTest(backend=name):
+                linear_solver = make_linear_solver(name)
+                self.assertIsNone(linear_solver.factorization)
+                linear_solver.factorize(matrix)
+                factorization = linear_solver.factorization
+                np.testing.assert_allclose(matrix.dot(linear_solver.solve(rhs)), rhs)
+                linear_solver.factorize(matrix)
+                self.assertIsNot(linear_solver.factorization, factorization)
+                if hasattr(linear_solver, "negative_eigenvalue_count"):
+                    self.assertEqual(linear_solver.negative_eigenvalue_count(), 2)
+
+    def test_low_rank_updates(self):
+        rng = np.random.default_rng(0)
+        factor = rng.normal(size=(12, 12))
+        matrix = factor @ factor.T + 12 * np.eye(12)
+        rhs = rng.normal(size=(12, 2))
+        linear_solver = LowRankUpdateSolver(max_rank=3)
+        linear_solver.factorize(matrix.copy())
+        for indices in ([1, 4], [4, 7], [10]):
+            vector = rng.normal(size=len(indices))
+            linear_solver.update(indices, np.outer(vector, vector))
+            matrix[np.ix_(indices, indices)] += np.outer(vector, vector)
+            np.testing.assert_allclose(linear_solver.solve(rhs), np.linalg.solve(matrix, rhs), rtol=1e-10)
+        self.assertEqual((linear_solver.rank, linear_solver.refactorization_count), (3, 0))
+        linear_solver.update([0], [[5.]])
+        matrix[0, 0] += 5.
+        self.assertEqual((linear_solver.rank, linear_solver.refactorization_count), (0, 1))
+        np.testing.assert_allclose(linear_solver.solve(rhs), np.linalg.solve(matrix, rhs), rtol=1e-10)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            make_linear_solver("qr")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from stablex import Node, FrameElement, TrussElement, Rectangle, UserDefinedSection, Structure, Solver
+from stablex.solver.formulations import SecondOrderFormulation, CorotationalFormulation
+from stablex.solver.nonlinear_solver import NonlinearSolver
+from stablex.solver.recorder import Recorder
+from tests.solver.test_eigen_solver import cantilever_column
+from tests.solver.test_first_order_solver import portal_frame
+
+
+def beam_column(axial_ratio):
+    """Cantilever column under a compression of axial_ratio times its Euler load and a small lateral load."""
+    structure, element = cantilever_column(20)
+    flexural_rigidity = element.elasticity_modulus * element.section.inertia
+    axial_force = axial_ratio * math.pi ** 2 * flexural_rigidity / (4 * 2000 ** 2)
+    top = structure.elements[-1].end_node
+    top.y_dof.force = -axial_force
+    top.x_dof.force = 1e-3 * axial_force
+    k = math.sqrt(axial_force / flexural_rigidity)
+    deflection = 1e-3 * (math.tan(k * 2000) - k * 2000) / k
+    return structure, top, deflection
+
+
+def shallow_truss():
+    """Two-bar truss of span 2000 and rise 50 under a downward apex load, which snaps through."""
+    start, apex, end = Node(-1000, 0), Node(0, 50), Node(1000, 0)
+    for dof in (start.x_dof, start.y_dof, end.x_dof, end.y_dof):
+        dof.restrained = True
+    apex.y_dof.force = -1000
+    section = UserDefinedSection(100, 0)
+    return Structure([TrussElement(start, apex, section, True), TrussElement(apex, end, section, True)]), apex
+
+
+class TestSecondOrderFormulation(unittest.TestCase):
+    def test_tangent_matches_finite_differences(self):
+        structure = portal_frame()
+        for element in structure.elements:
+            element.geometric_nonlinearity = True
+        model = structure.compile()
+        formulation = SecondOrderFormulation(model)
+        displacements = np.zeros(model.dof_count)
+        displacements[:model.free_count] = np.random.default_rng(0).normal(size=model.free_count)
+        _, tangent, _ = formulation.evaluate(displacements)
+        step = 1e-6
+        finite_differences = np.column_stack([
+            (formulation.evaluate(displacements + step * unit, tangent=False)[0]
+             - formulation.evaluate(displacements - step * unit, tangent=False)[0]) / (2 * step)
+            for unit in np.eye(model.dof_count)])
+        np.testing.assert_allclose(tangent, finite_differences, atol=1e-7 * np.abs(tangent).max())
+        np.testing.assert_allclose(formulation.evaluate(np.zeros(model.dof_count))[1], model.global_stiffness_matrix())
+
+
+class TestCorotationalFormulation(unittest.TestCase):
+    def setUp(self):
+        structure = portal_frame()
+        for element in structure.elements:
+            element.geometric_nonlinearity = True
+        self.model = structure.compile()
+        self.formulation = CorotationalFormulation(self.model)
+
+    def test_tangent_matches_finite_differences(self):
+        model, formulation = self.model, self.formulation
+        displacements = np.zeros(model.dof_count)
+        scales = np.tile([300., 300., 1.], model.free_count)[:model.free_count]
+        displacements[:model.free_count] = np.random.default_rng(0).normal(size=model.free_count) * scales
+        _, tangent, _ = formulation.evaluate(displacements)
+        steps = 1e-6 * np.maximum(np.abs(displacements), 1)
+        finite_differences = np.column_stack([
+            (formulation.evaluate(displacements + step * unit, tangent=False)[0]
+             - formulation.evaluate(displacements - step * unit, tangent=False)[0]) / (2 * step)
+            for step, unit in zip(steps, np.eye(model.dof_count))])
+        np.testing.assert_allclose(tangent, finite_differences, atol=1e-6 * np.abs(tangent).max())
+        np.testing.assert_allclose(formulation.evaluate(np.zeros(model.dof_count))[1], model.global_stiffness_matrix(),
+                                   atol=1e-12 * np.abs(tangent).max())
+
+    def test_rigid_body_rotation_is_stress_free(self):
+        model = self.model
+        angle = 2.
+        rotation = np.array([[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]])
+        node_displacements = np.column_stack([model.coordinates @ rotation.T - model.coordinates,
+                                              np.full(model.node_count, angle)])
+        displacements = np.zeros(model.dof_count)
+        used = model.node_dofs >= 0
+        displacements[model.node_dofs[used]] = node_displacements[used]
+        internal_forces, _, end_forces = self.formulation.evaluate(displacements, tangent=False)
+        stiffness = np.abs(model.global_stiffness_matrix()).max()
+        self.assertLess(np.abs(internal_forces).max(), 1e-12 * stiffness)
+        self.assertLess(np.abs(self.formulation.deformations[0]).max(), 1e-9)
+        self.assertIsNot(end_forces[0], self.formulation.end_forces[0])
+
+    def test_cantilever_rolls_into_circle(self):
+        structure, element = cantilever_column(20)
+        top = structure.elements[-1].end_node
+        top.y_dof.force = 0
+        top.rz_dof.force = 2 * math.pi * element.elasticity_modulus * element.section.inertia / 2000
+        result = NonlinearSolver(structure, formulation="corotational").analyze_newton_raphson(top.rz_dof, top.x_dof)
+        index = structure.dof_map.index
+        self.assertAlmostEqual(result.displacements[index[top.x_dof]], 0, places=6)
+        self.assertAlmostEqual(result.displacements[index[top.y_dof]], -2000, places=6)
+        self.assertAlmostEqual(result.displacements[index[top.rz_dof]], 2 * math.pi)
+
+    def test_snap_through_path(self):
+        structure, apex = shallow_truss()
+        length = math.hypot(1000, 50)
+        result = NonlinearSolver(structure, formulation="corotational").analyze_arc_length(
+            apex.y_dof, apex.y_dof, max_displacement=110)
+        deflection = np.asarray(result.displacement)
+        current_length = np.hypot(1000, 50 - deflection)
+        expected = 2 * 200000 * 100 * (length - current_length) / length * (50 - deflection) / current_length
+        np.testing.assert_allclose(result.load, expected, atol=1e-8 * np.max(expected))
+
+
+class TestNewtonRaphson(unittest.TestCase):
+    def test_beam_column_deflection(self):
+        structure, top, deflection = beam_column(0.5)
+        solver = NonlinearSolver(structure)
+        result = solver.analyze_newton_raphson(top.y_dof, top.x_dof)
+        self.assertAlmostEqual(result.displacement[-1] / deflection, 1, places=3)
+        self.assertEqual(result.load[-1], abs(top.y_dof.force))
+        self.assertLess(solver.factorization_count, 50)
+        self.assertEqual(top.x_dof.displacement, 0)
+
+    def test_modified_newton_reuses_factorizations(self):
+        structure, top, _ = beam_column(0.5)
+        full = NonlinearSolver(structure).analyze_newton_raphson(top.y_dof, top.x_dof)
+        solver = NonlinearSolver(structure)
+        modified = solver.analyze_newton_raphson(top.y_dof, top.x_dof, modified=True)
+        np.testing.assert_allclose(modified.displacements, full.displacements, rtol=1e-6, atol=1e-9)
+        self.assertLess(solver.factorization_count, solver.iteration_count / 2)
+
+    def test_linear_structure(self):
+        structure = portal_frame()
+        for element in structure.elements:
+            element.geometric_nonlinearity = False
+        expected = Solver(structure).analyze()
+        node = structure.elements[0].end_node
+        result = NonlinearSolver(structure).solve_newton_raphson(node.x_dof, node.x_dof, initial_step=1.)
+        np.testing.assert_allclose(result.displacements, expected.displacements, atol=1e-10)
+        np.testing.assert_allclose(result.reactions, expected.reactions, atol=1e-8)
+        self.assertEqual(node.x_dof.displacement, result.displacements[structure.dof_map.index[node.x_dof]])
+
+
+
+class TestArcLength(unittest.TestCase):
+    def test_snap_through_path(self):
+        structure, apex = shallow_truss()
+        axial_rigidity, length = 200000 * 100, math.hypot(1000, 50)
+        for spherical in (False, True):
+            with self.subTest(spherical=spherical):
+                result = NonlinearSolver(structure).analyze_arc_length(apex.y_dof, apex.y_dof, max_displacement=110,
+                                                                       spherical=spherical)
+                deflection = np.asarray(result.displacement)
+                expected = axial_rigidity * (50 - deflection) * (50 ** 2 - (50 - deflection) ** 2) / length ** 3
+                np.testing.assert_allclose(result.load, expected, atol=1e-8 * np.max(expected))
+                self.assertGreaterEqual(deflection[-1], 110)
+                self.assertLess(np.min(result.load), 0)
+                self.assertTrue(np.all(np.diff(deflection) > 0))
+
+    def test_frame_passes_limit_point(self):
+        nodes = [Node(250 * i, 12.5 * min(i, 8 - i)) for i in range(9)]
+        for dof in (nodes[0].x_dof, nodes[0].y_dof, nodes[-1].x_dof, nodes[-1].y_dof):
+            dof.restrained = True
+        nodes[4].y_dof.force = -100
+        structure = Structure([FrameElement(start, end, Rectangle(20, 20), True)
+                               for start, end in zip(nodes[:-1], nodes[1:])])
+        solver = NonlinearSolver(structure)
+        result = solver.analyze_arc_length(nodes[4].y_dof, nodes[4].y_dof, max_steps=200, max_displacement=60)
+        peak = int(np.argmax(result.load))
+        self.assertTrue(0 < peak < len(result.load) - 1)
+        self.assertLess(result.load[-1], result.load[peak])
+        self.assertGreater(result.displacement[-1], result.displacement[peak])
+        self.assertLess(solver.iteration_count, 6 * len(result.load))
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingRecorder(Recorder):
+    """Recorder that stops the analysis before recording a given step, as if the process were killed."""
+    def __init__(self, path, interrupted_step):
+        super().__init__(path, chunk_size=4)
+        self.interrupted_step = interrupted_step
+
+    def record(self, *args):
+        if len(self) == self.interrupted_step:
+            raise Interrupted
+        super().record(*args)
+
+
+class TestCheckpoint(unittest.TestCase):
+    def test_arc_length_resumes_bit_identically(self):
+        structure, apex = shallow_truss()
+
+        def run(recorder, checkpoint=None):
+            recorder.add_displacements("apex", [apex.x_dof, apex.y_dof])
+            recorder.add_stability()
+            solver = NonlinearSolver(structure, formulation="corotational")
+            result = solver.analyze_arc_length(apex.y_dof, apex.y_dof, max_displacement=110, spherical=True,
+                                               recorder=recorder, checkpoint=checkpoint, checkpoint_interval=5)
+            return solver, result
+
+        with tempfile.TemporaryDirectory() as directory:
+            expected_solver, expected = run(Recorder(os.path.join(directory, "expected.npz"), chunk_size=4))
+            checkpoint, path = os.path.join(directory, "checkpoint.npz"), os.path.join(directory, "history.npz")
+            with self.assertRaises(Interrupted):
+                run(InterruptingRecorder(path, 12), checkpoint)
+            with np.load(checkpoint) as saved:
+                self.assertEqual(len(saved["load"]), 11)
+            recorder = Recorder(path, chunk_size=4)
+            solver, result = run(recorder, checkpoint)
+            np.testing.assert_array_equal(result.load, expected.load)
+            np.testing.assert_array_equal(result.displacement, expected.displacement)
+            np.testing.assert_array_equal(result.displacements, expected.displacements)
+            self.assertEqual(solver.iteration_count, expected_solver.iteration_count)
+            self.assertEqual(solver.factorization_count, expected_solver.factorization_count)
+            history, expected_history = Recorder.read(path), Recorder.read(os.path.join(directory, "expected.npz"))
+            for name in ("load_factor", "apex", "stability"):
+                np.testing.assert_array_equal(history[name], expected_history[name])
+            self.assertEqual(len(recorder), len(result.load))
+
+    def test_newton_raphson_resumes_bit_identically(self):
+        structure, top, _ = beam_column(0.9)
+        expected = NonlinearSolver(structure).analyze_newton_raphson(top.y_dof, top.x_dof, initial_step=0.01)
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "checkpoint")
+            with self.assertRaises(Interrupted):
+                NonlinearSolver(structure).analyze_newton_raphson(
+                    top.y_dof, top.x_dof, initial_step=0.01, recorder=InterruptingRecorder(None, 7),
+                    checkpoint=checkpoint, checkpoint_interval=3)
+            solver = NonlinearSolver(structure)
+            result = solver.analyze_newton_raphson(top.y_dof, top.x_dof, initial_step=0.01, checkpoint=checkpoint)
+            np.testing.assert_array_equal(result.load, expected.load)
+            np.testing.assert_array_equal(result.displacements, expected.displacements)
+            np.testing.assert_array_equal(result.end_forces[0], expected.end_forces[0])
+            with self.assertRaises(ValueError):
+                solver.analyze_arc_length(top.y_dof, top.x_dof, checkpoint=checkpoint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from stablex.solver.linear_solvers import DenseLDLSolver
+from stablex.solver.nonlinear_solver import NonlinearSolver
+from stablex.solver.recorder import Recorder
+from tests.solver.test_nonlinear_solver import shallow_truss
+
+
+def record_snap_through(recorder, sparse=None):
+    structure, apex = shallow_truss()
+    recorder.add_displacements("apex", [apex.x_dof, apex.y_dof])
+    recorder.add_reactions("reactions")
+    recorder.add_end_forces("bars", [0, 1])
+    recorder.add_stability()
+    solver = NonlinearSolver(structure, sparse=sparse)
+    solver.analyze_arc_length(apex.y_dof, apex.y_dof, max_displacement=110, recorder=recorder)
+    return solver
+
+
+class TestRecorder(unittest.TestCase):
+    def test_records_every_step(self):
+        recorder = Recorder(chunk_size=4)
+        solver = record_snap_through(recorder)
+        steps = len(solver.load)
+        self.assertEqual(len(recorder), steps)
+        self.assertEqual(recorder.names, ["load_factor", "apex", "reactions", "bars", "stability"])
+        self.assertEqual(recorder["apex"].shape, (steps, 2))
+        self.assertEqual(recorder["reactions"].shape, (steps, 4))
+        self.assertEqual(recorder["bars"].shape, (steps, 8))
+        np.testing.assert_allclose(np.abs(recorder["apex"][:, 1]), solver.displacement)
+        np.testing.assert_allclose(recorder.load_factors * 1000, solver.load)
+        # The vertical reactions balance the apex load.
+        np.testing.assert_allclose(recorder["reactions"][:, [1, 3]].sum(axis=1), recorder.load_factors * 1000,
+                                   atol=1e-6)
+        stiffness_parameter, negative_counts = recorder["stability"].T
+        self.assertEqual(stiffness_parameter[0], 1)
+        self.assertEqual(negative_counts[0], 0)
+        past_limit = negative_counts > 0
+        self.assertTrue(np.any(past_limit))
+        self.assertTrue(np.all(stiffness_parameter[past_limit] < 0))
+        with self.assertRaises(ValueError):
+            recorder.add_reactions("apex")
+
+    def test_sparse_stability(self):
+        dense = Recorder()
+        record_snap_through(dense, sparse=False)
+        recorder = Recorder()
+        with mock.patch.object(DenseLDLSolver, 'factorize', side_effect=AssertionError("dense factorization")):
+            record_snap_through(recorder, sparse=True)
+        np.testing.assert_array_equal(recorder["stability"][:, 1], dense["stability"][:, 1])
+        np.testing.assert_allclose(recorder["stability"][:, 0], dense["stability"][:, 0], rtol=1e-6)
+
+    def test_compiled_model(self):
+        structure, apex = shallow_truss()
+        recorder = Recorder()
+        recorder.add_displacements("apex", [apex.x_dof, apex.y_dof])
+        recorder.add_reactions("reactions", [structure.restrained_degrees_of_freedom[1]])
+        solver = NonlinearSolver(structure.compile())
+        solver.analyze_arc_length(apex.y_dof, apex.y_dof, max_displacement=110, recorder=recorder)
+        np.testing.assert_allclose(np.abs(recorder["apex"][:, 1]), solver.displacement)
+        self.assertEqual(recorder["reactions"].shape, (len(solver.load), 1))
+
+    def test_streams_chunks_to_archive(self):
+        in_memory = Recorder()
+        record_snap_through(in_memory)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.npz")
+            streamed = Recorder(path, chunk_size=3)
+            record_snap_through(streamed)
+            chunks = list(Recorder.iter_chunks(path))
+            self.assertEqual(sum(len(chunk["apex"]) for chunk in chunks), len(in_memory))
+            self.assertTrue(all(len(chunk["apex"]) <= 3 for chunk in chunks))
+            history = Recorder.read(path)
+            self.assertEqual(list(Recorder.read(path, ["apex"])), ["apex"])
+            for name in in_memory.names:
+                np.testing.assert_array_equal(history[name], in_memory[name])
+                np.testing.assert_array_equal(streamed[name], in_memory[name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from stablex import Solver, EigenSolver
+from tests.solver.test_first_order_solver import portal_frame
+
+
+class TestLinearResult(unittest.TestCase):
+    def setUp(self):
+        self.structure = portal_frame()
+
+    def test_analyze_leaves_structure_untouched(self):
+        dofs = self.structure.degrees_of_freedom
+        state = [(dof.displacement, dof.force) for dof in dofs]
+        result = Solver(self.structure).analyze()
+        EigenSolver(self.structure).solve_modes(2)
+        self.assertEqual([(dof.displacement, dof.force) for dof in dofs], state)
+        self.assertTrue(np.any(result.free_displacements))
+
+    def test_result_is_read_only(self):
+        result = Solver(self.structure).analyze()
+        with self.assertRaises(ValueError):
+            result.displacements[0] = 1.0
+        with self.assertRaises(ValueError):
+            result.end_forces[0][0, 0] = 1.0
+
+    def test_apply_matches_legacy_solve(self):
+        result = Solver(self.structure).analyze()
+        legacy = Solver(self.structure)
+        legacy.solve_first_order_elastic()
+        expected = [dof.displacement for dof in self.structure.degrees_of_freedom]
+        for dof in self.structure.degrees_of_freedom:
+            dof.displacement = 0
+        result.apply(self.structure)
+        np.testing.assert_allclose([dof.displacement for dof in self.structure.degrees_of_freedom], expected)
+        np.testing.assert_allclose(result.element_end_forces(0), self.structure.elements[0].local_end_forces())
+
+    def test_concurrent_analyses(self):
+        model = self.structure.compile()
+        expected = Solver(model).analyze().displacements
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: Solver(model).analyze(), range(8)))
+        for result in results:
+            np.testing.assert_allclose(result.displacements, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from stablex import (Node, FrameElement, LinearRotationalSpringElement, UserDefinedSection, Structure, EigenSolver,
+                     ExactBucklingSolver)
+from stablex.solver.sweep import Sweep
+
+
+def semi_rigid_frame(spring_stiffness=1e9, column_inertia=1943e4):
+    """Portal frame of two columns and a beam connected to them by rotational springs."""
+    columns = UserDefinedSection(2850, column_inertia)
+    left, right = [Node(0, 1500 * i) for i in range(5)], [Node(6000, 1500 * i) for i in range(5)]
+    beam_start, beam_end = Node(0, 6000), Node(6000, 6000)
+    for beam_node, column_node in ((beam_start, left[-1]), (beam_end, right[-1])):
+        beam_node.x_dof = column_node.x_dof
+        beam_node.y_dof = column_node.y_dof
+        column_node.y_dof.force = -1
+    for node in (left[0], right[0]):
+        for dof in (node.x_dof, node.y_dof, node.rz_dof):
+            dof.restrained = True
+    elements = [FrameElement(start, end, columns, True) for nodes in (left, right)
+                for start, end in zip(nodes[:-1], nodes[1:])]
+    elements.append(FrameElement(beam_start, beam_end, UserDefinedSection(2850, 1943e4)))
+    elements += [LinearRotationalSpringElement(left[-1], beam_start, spring_stiffness),
+                 LinearRotationalSpringElement(right[-1], beam_end, spring_stiffness)]
+    return Structure(elements)
+
+
+class TestSweep(unittest.TestCase):
+    stiffnesses = np.logspace(8, 12, 5)
+    inertias = np.array([1e7, 2e7, 4e7])
+
+    def expected(self, k=2, solver=EigenSolver):
+        return np.array([[solver(semi_rigid_frame(stiffness, inertia)).solve_modes(k).load_factors
+                          for inertia in self.inertias] for stiffness in self.stiffnesses])
+
+    def model_sweep(self, method="eigen"):
+        sweep = Sweep(semi_rigid_frame(), method)
+        sweep.add_property("ks", self.stiffnesses, "rotational_stiffnesses", [9, 10])
+        sweep.add_property("ic", self.inertias, "inertias", range(8))
+        return sweep
+
+    def test_process_pool_matches_serial_analyses(self):
+        result = self.model_sweep().run(k=2, return_modes=True, workers=2, chunk_size=4)
+        self.assertEqual(result.shape, (5, 3))
+        np.testing.assert_allclose(result.load_factors, self.expected(), rtol=1e-10)
+        np.testing.assert_array_equal(result.parameters["ks"][:, 0], self.stiffnesses)
+        self.assertEqual(result.modes.shape, (5, 3, semi_rigid_frame().compile().free_count, 2))
+        np.testing.assert_allclose(np.linalg.norm(result.modes, axis=-2), 1)
+        serial = self.model_sweep().run(k=2, workers=1)
+        np.testing.assert_array_equal(serial.load_factors, result.load_factors)
+        self.assertIsNone(serial.modes)
+
+    def test_model_factory(self):
+        sweep = Sweep(semi_rigid_frame, method="exact")
+        sweep.add_parameter("spring_stiffness", self.stiffnesses)
+        sweep.add_parameter("column_inertia", self.inertias)
+        result = sweep.run(k=1, workers=2)
+        np.testing.assert_allclose(result.load_factors, self.expected(1, ExactBucklingSolver), rtol=1e-8)
+        np.testing.assert_allclose(result.load_factors, self.model_sweep("exact").run(workers=1).load_factors,
+                                   rtol=1e-12)
+
+    def test_forces_and_checkpoint(self):
+        structure = semi_rigid_frame()
+        top = structure.elements[3].end_node
+        sweep = Sweep(structure)
+        sweep.add_forces("p", [-1., -2., -4.], [top.y_dof])
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "sweep.npz")
+            result = sweep.run(workers=1, chunk_size=1, checkpoint=checkpoint)
+            with np.load(checkpoint) as saved:
+                self.assertTrue(saved["completed"].all())
+            resumed = sweep.run(workers=1, checkpoint=checkpoint)
+        np.testing.assert_array_equal(resumed.load_factors, result.load_factors)
+        # More load on one column lowers the critical load factor of the frame.
+        self.assertTrue(np.all(np.diff(result.load_factors[:, 0]) < 0))
+
+    def test_forces_of_compiled_model(self):
+        structure = semi_rigid_frame()
+        top = structure.elements[3].end_node
+        expected = Sweep(structure)
+        expected.add_forces("p", [-1., -2.], [top.y_dof])
+        sweep = Sweep(structure.compile())
+        sweep.add_forces("p", [-1., -2.], [top.y_dof])
+        np.testing.assert_allclose(sweep.run(workers=1).load_factors, expected.run(workers=1).load_factors)
+        model = structure.compile()
+        model.dof_ids = None
+        with self.assertRaises(TypeError):
+            Sweep(model).add_forces("p", [-1.], [top.y_dof])
+
+    def test_invalid_parameters(self):
+        sweep = Sweep(semi_rigid_frame())
+        with self.assertRaises(ValueError):
+            sweep.add_property("ks", [1.], "inertias", [9])
+        with self.assertRaises(TypeError):
+            sweep.add_parameter("ks", [1.])
+        sweep.add_property("ks", [1.], "rotational_stiffnesses", [9])
+        with self.assertRaises(ValueError):
+            sweep.add_property("ks", [1.], "rotational_stiffnesses", [10])
+
+
+if __name__ == '__main__':
+    unittest.main()
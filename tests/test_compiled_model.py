@@ -0,0 +1,73 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from stablex import Node, FrameElement, LinearRotationalSpringElement, Rectangle, Structure
+from stablex.solver.first_order_solver import Solver
+
+
+class TestCompiledModel(unittest.TestCase):
+    def setUp(self):
+        self.n1 = Node(0, 0)
+        self.n2 = Node(0, 1000)
+        self.n3 = Node(1000, 1000)
+        self.n4 = Node(1000, 1000)
+        self.n1.x_dof.restrained = True
+        self.n1.y_dof.restrained = True
+        self.n1.rz_dof.restrained = True
+        self.n4.x_dof = self.n3.x_dof
+        self.n4.y_dof = self.n3.y_dof
+        self.n3.x_dof.force = 10
+        self.n3.y_dof.force = -20
+        section = Rectangle(100, 100)
+        self.structure = Structure([FrameElement(self.n1, self.n2, section),
+                                    FrameElement(self.n2, self.n3, section),
+                                    LinearRotationalSpringElement(self.n3, self.n4, 1e8)])
+        self.model = self.structure.compile()
+
+    def test_arrays(self):
+        dof_map = self.structure.dof_map
+        self.assertEqual(self.model.dof_count, dof_map.count)
+        self.assertEqual(self.model.free_count, dof_map.free_count)
+        self.assertEqual(self.model.node_count, 4)
+        self.assertEqual(self.model.element_count, 3)
+        self.assertEqual(list(self.model.node_dofs[3]), [dof_map.index[self.n3.x_dof], dof_map.index[self.n3.y_dof],
+                                                         dof_map.index[self.n4.rz_dof]])
+        self.assertEqual(self.model.forces[dof_map.index[self.n3.y_dof]], -20)
+
+    def test_arrays_are_read_only(self):
+        with self.assertRaises(ValueError):
+            self.model.coordinates[0, 0] = 1.0
+        with self.assertRaises(ValueError):
+            self.model.element_groups[0].properties["areas"][0] = 1.0
+
+    def test_pickle(self):
+        model = pickle.loads(pickle.dumps(self.model))
+        np.testing.assert_allclose(model.global_stiffness_matrix(), self.model.global_stiffness_matrix())
+
+    def test_solver_runs_on_model(self):
+        structure_solver = Solver(self.structure)
+        structure_solver.solve_first_order_elastic()
+        model_solver = Solver(self.model)
+        model_solver.solve_first_order_elastic()
+        self.assertIsNone(model_solver.structure)
+        np.testing.assert_allclose(model_solver.displacement_vector, structure_solver.displacement_vector)
+        np.testing.assert_allclose(model_solver.reactions_vector, structure_solver.reactions_vector)
+
+    def test_variant(self):
+        forces = self.model.forces * 2
+        variant = self.model.variant(forces, {"rotational_stiffnesses": ([2], 1e6), "inertias": ([1], [2e7])})
+        self.assertIs(variant.scatter_plan, self.model.scatter_plan)
+        self.assertIs(variant.coordinates, self.model.coordinates)
+        np.testing.assert_array_equal(variant.forces, forces)
+        self.assertEqual(variant.element_groups[1].properties["rotational_stiffnesses"][0], 1e6)
+        np.testing.assert_array_equal(variant.element_groups[0].properties["inertias"], [100 ** 4 / 12, 2e7])
+        self.assertEqual(self.model.element_groups[1].properties["rotational_stiffnesses"][0], 1e8)
+        self.assertEqual(self.model.element_groups[0].properties["inertias"][1], 100 ** 4 / 12)
+        with self.assertRaises(ValueError):
+            self.model.variant(properties={"inertias": ([2], 1.)})
+
+
+if __name__ == '__main__':
+    unittest.main()
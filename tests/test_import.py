@@ -0,0 +1,32 @@
+import os
+import pathlib
+import subprocess
+import sys
+import unittest
+
+SOURCE_DIRECTORY = pathlib.Path(__file__).resolve().parents[1] / "src"
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from stablex import Node, FrameElement, Rectangle, Structure, Solver
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(sorted(name for name in ("matplotlib", "mpl_toolkits", "PIL", "scipy") if name in sys.modules)))
+"""
+
+
+class TestImport(unittest.TestCase):
+    import_time_budget = 1.0
+
+    def test_core_imports_with_numpy_only(self):
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join([str(SOURCE_DIRECTORY),
+                                                                     os.environ.get("PYTHONPATH", "")]))
+        output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True,
+                                env=environment).stdout.split("\n")
+        self.assertEqual(output[1], "")
+        self.assertLess(float(output[0]), self.import_time_budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
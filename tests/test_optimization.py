@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from stablex import Node, FrameElement, Rectangle, Structure, EigenSolver
+from stablex.optimization import SectionSizing
+from tests.solver.test_eigen_solver import cantilever_column
+from tests.solver.test_sweep import semi_rigid_frame
+
+
+def twin_columns():
+    """Two equal, separate cantilever columns, so the lowest load factor is repeated."""
+    elements = []
+    for x in (0, 5000):
+        section = Rectangle(100, 100)
+        nodes = [Node(x, 500 * i) for i in range(5)]
+        for dof in (nodes[0].x_dof, nodes[0].y_dof, nodes[0].rz_dof):
+            dof.restrained = True
+        nodes[-1].y_dof.force = -1
+        elements += [FrameElement(start, end, section, True) for start, end in zip(nodes[:-1], nodes[1:])]
+    return Structure(elements)
+
+
+class TestSectionSizing(unittest.TestCase):
+    def test_single_group_reaches_target(self):
+        structure, element = cantilever_column(10)
+        target = 4 * EigenSolver(structure).buckling_modes()[0][0]
+        result = SectionSizing(structure, target).run()
+        self.assertTrue(result.converged)
+        self.assertLess(result.analysis_count, 15)
+        # λ grows with I = s²·I₀, so the area has to double.
+        np.testing.assert_allclose(result.scales, [2.], rtol=1e-3)
+        result.apply()
+        self.assertAlmostEqual(element.section.width, 100 * 2 ** 0.5, delta=0.2)
+        self.assertAlmostEqual(EigenSolver(structure).buckling_modes()[0][0] / target, 1, delta=1e-3)
+
+    def test_repeated_load_factors(self):
+        structure = twin_columns()
+        result = SectionSizing(structure, 2e5).run()
+        self.assertTrue(result.converged)
+        self.assertLess(result.analysis_count, 15)
+        self.assertAlmostEqual(result.scales[0], result.scales[1], places=6)
+        np.testing.assert_allclose(result.load_factors[:2], 2e5, rtol=1e-3)
+
+    def test_volume_is_minimized(self):
+        structure = semi_rigid_frame(1e10)
+        sizing = SectionSizing(structure, 2e5, exponent=3)
+        result = sizing.run()
+        self.assertTrue(result.converged)
+        self.assertLess(result.volume, sizing.volume(np.ones(2)))
+        # At the optimum every group raises the load factor equally per unit of volume.
+        efficiency = result.gradients[0] / result.volume_gradients
+        self.assertAlmostEqual(efficiency[0] / efficiency[1], 1, delta=0.02)
+        columns = structure.elements[0].section
+        result.apply()
+        self.assertEqual((columns.area, columns.inertia), (result.areas[0], result.inertias[0]))
+
+    def test_invalid_groups(self):
+        with self.assertRaises(ValueError):
+            SectionSizing(twin_columns(), 2e5, sections=[Rectangle(1, 1)])
+        with self.assertRaises(ValueError):
+            SectionSizing(twin_columns(), -1.)
+
+
+if __name__ == '__main__':
+    unittest.main()
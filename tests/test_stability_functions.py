@@ -0,0 +1,51 @@
+import math
+import unittest
+
+import numpy as np
+
+from stablex.stability_functions import stiffness_coefficients, c, s, sb, ss
+
+
+def closed_form(q):
+    if q > 0:
+        x = math.sqrt(q)
+        denominator = 2 - 2 * math.cos(x) - x * math.sin(x)
+        return x * (math.sin(x) - x * math.cos(x)) / denominator, x * (x - math.sin(x)) / denominator
+    x = math.sqrt(-q)
+    denominator = 2 - 2 * math.cosh(x) + x * math.sinh(x)
+    return x * (x * math.cosh(x) - math.sinh(x)) / denominator, x * (math.sinh(x) - x) / denominator
+
+
+class TestStabilityFunctions(unittest.TestCase):
+    def test_unloaded_member(self):
+        self.assertEqual(stiffness_coefficients(0.), (4., 2.))
+        self.assertEqual(c(0.), 0.5)
+        self.assertEqual(ss(0.), 12.)
+
+    def test_matches_closed_form(self):
+        q = np.array([-1000., -50., -1., -0.2, 0.2, 1., 9., 30.])
+        s_function, sc_function = stiffness_coefficients(q)
+        expected = np.array([closed_form(value) for value in q])
+        np.testing.assert_allclose(s_function, expected[:, 0], rtol=1e-12)
+        np.testing.assert_allclose(sc_function, expected[:, 1], rtol=1e-12)
+
+    def test_continuous_across_series_limit(self):
+        q = np.array([-0.1 - 1e-12, -0.1 + 1e-12, 0.1 - 1e-12, 0.1 + 1e-12])
+        s_function, sc_function = stiffness_coefficients(q)
+        np.testing.assert_allclose(s_function[::2], s_function[1::2], rtol=1e-13)
+        np.testing.assert_allclose(sc_function[::2], sc_function[1::2], rtol=1e-13)
+
+    def test_large_tension_does_not_overflow(self):
+        s_function, sc_function = stiffness_coefficients(np.array([-1e6, -1e12]))
+        self.assertTrue(np.all(np.isfinite(s_function)))
+        np.testing.assert_allclose(s_function / np.sqrt([1e6, 1e12]), 1, rtol=1e-2)
+
+    def test_legacy_parameter(self):
+        x = 2.0
+        self.assertAlmostEqual(s(x), closed_form(x ** 2)[0])
+        self.assertAlmostEqual(sb(-x), sum(closed_form(-x ** 2)))
+        self.assertAlmostEqual(sb(x), s(x) * (1 + c(x)))
+
+
+if __name__ == '__main__':
+    unittest.main()
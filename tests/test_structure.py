@@ -0,0 +1,195 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from stablex import (Node, FrameElement, TrussElement, LinearRotationalSpringElement, Rectangle, UserDefinedSection,
+                     Structure, Solver, model_scope)
+
+
+class TestStructureDofMap(unittest.TestCase):
+    def setUp(self):
+        self.n1 = Node(0, 0)
+        self.n2 = Node(0, 1000)
+        self.n3 = Node(1000, 1000)
+        self.section = Rectangle(100, 100)
+        self.e1 = FrameElement(self.n1, self.n2, self.section)
+        self.e2 = FrameElement(self.n2, self.n3, self.section)
+        self.structure = Structure([self.e1, self.e2])
+
+    def test_free_dofs_are_numbered_first(self):
+        self.n1.x_dof.restrained = True
+        dof_map = self.structure.dof_map
+        self.assertEqual(dof_map.count, 9)
+        self.assertEqual(dof_map.free_count, 8)
+        self.assertEqual(dof_map.index[self.n1.x_dof], 8)
+        self.assertEqual(list(dof_map.element_indices[1]), [dof_map.index[dof] for dof in self.e2.stiffness_matrix_dofs])
+
+    def test_map_is_cached(self):
+        self.assertIs(self.structure.dof_map, self.structure.dof_map)
+
+    def test_restraint_invalidates_map(self):
+        dof_map = self.structure.dof_map
+        self.n3.y_dof.restrained = True
+        self.assertIsNot(self.structure.dof_map, dof_map)
+        self.assertEqual(self.structure.restrained_degrees_of_freedom, [self.n3.y_dof])
+
+    def test_coupling_invalidates_map(self):
+        n4 = Node(1000, 1000)
+        self.structure.elements.append(LinearRotationalSpringElement(self.n3, n4, 1e6))
+        self.assertEqual(self.structure.dof_map.count, 10)
+        n4.rz_dof = self.n3.rz_dof
+        self.assertEqual(self.structure.dof_map.count, 9)
+        self.assertEqual(len(self.structure.nodes), 4)
+
+    def test_element_list_changes_invalidate_map(self):
+        dof_map = self.structure.dof_map
+        self.structure.elements[1] = FrameElement(self.n2, Node(2000, 1000), self.section)
+        self.assertIsNot(self.structure.dof_map, dof_map)
+        self.structure.elements.pop()
+        self.assertEqual(self.structure.dof_map.count, 6)
+
+    def test_other_scopes_keep_map(self):
+        dof_map = self.structure.dof_map
+        with model_scope():
+            Node(0, 0).x_dof.restrained = True
+        self.assertIs(self.structure.dof_map, dof_map)
+
+    def test_model_objects_use_slots(self):
+        spring = LinearRotationalSpringElement(self.n2, Node(0, 1000), 1e6)
+        for model_object in (self.n1, self.n1.x_dof, self.e1, spring, TrussElement(self.n1, self.n3, self.section)):
+            self.assertFalse(hasattr(model_object, "__dict__"), type(model_object).__name__)
+        self.n2.x_dof.force = 5.
+        self.n2.x_dof.displacement = 0.5
+        self.assertEqual((self.n2.x_dof.force, self.n2.x_dof.displacement), (5., 0.5))
+        with self.assertRaises(AttributeError):
+            self.n1.label = "support"
+
+
+def grid_frame(columns, storeys, node_order=None):
+    """Frame of columns x storeys bays whose nodes are created in the given order of grid positions."""
+    positions = [(i, j) for j in range(storeys + 1) for i in range(columns + 1)]
+    nodes = {position: None for position in positions}
+    for position in node_order or positions:
+        nodes[position] = Node(4000 * position[0], 3000 * position[1])
+    section = Rectangle(200, 300)
+    elements = [FrameElement(nodes[i, j], nodes[i, j + 1], section) for i in range(columns + 1) for j in range(storeys)]
+    elements += [FrameElement(nodes[i, j], nodes[i + 1, j], section) for j in range(1, storeys + 1)
+                 for i in range(columns)]
+    for i in range(columns + 1):
+        for dof in (nodes[i, 0].x_dof, nodes[i, 0].y_dof, nodes[i, 0].rz_dof):
+            dof.restrained = True
+    nodes[0, storeys].x_dof.force = 1000.
+    return Structure(elements)
+
+
+def half_bandwidth(structure):
+    free_count = structure.dof_map.free_count
+    return max(int(np.ptp(indices[indices < free_count])) for indices in structure.dof_map.element_indices)
+
+
+class TestModelScope(unittest.TestCase):
+    def test_concurrent_models_are_numbered_alike(self):
+        numberings = [None] * 4
+        barrier = threading.Barrier(len(numberings))
+
+        def build(index):
+            barrier.wait()
+            with model_scope():
+                structure = grid_frame(3, 5)
+            numberings[index] = ([dof.id for dof in structure.degrees_of_freedom],
+                                 [element.id for element in structure.elements])
+
+        threads = [threading.Thread(target=build, args=(index,)) for index in range(len(numberings))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(numbering == numberings[0] for numbering in numberings))
+        self.assertEqual(numberings[0][1], list(range(1, 36)))
+        self.assertEqual(min(numberings[0][0]), 1)
+
+    def test_scope_is_restored(self):
+        before = Node(0, 0)
+        with model_scope() as ids:
+            self.assertEqual(Node(0, 0).id, 1)
+            self.assertEqual(ids.nodes.next_id, 2)
+        self.assertEqual(Node(0, 0).id, before.id + 1)
+
+    def test_rcm_ordering_reduces_bandwidth(self):
+        positions = [(i, j) for i in range(9) for j in range(3)]
+        scrambled = positions[::2] + positions[1::2]
+        structure = grid_frame(8, 2, scrambled)
+        expected = Solver(structure).analyze()
+        id_bandwidth = half_bandwidth(structure)
+        structure.dof_ordering = "rcm"
+        self.assertLess(half_bandwidth(structure), id_bandwidth / 3)
+        self.assertEqual(structure.dof_map.free_count, 3 * 9 * 2)
+        self.assertTrue(all(dof.restrained for dof in structure.restrained_degrees_of_freedom))
+        result = Solver(structure).analyze()
+        for dof in structure.degrees_of_freedom:
+            self.assertAlmostEqual(result.displacements[structure.dof_map.index[dof]],
+                                   expected.displacements[expected.model.dof_ids.tolist().index(dof.id)])
+        with self.assertRaises(ValueError):
+            structure.dof_ordering = "amd"
+
+
+class TestStructureFile(unittest.TestCase):
+    def setUp(self):
+        n1, n2, n3, n4, n5 = Node(0, 0), Node(0, 3000), Node(4000, 3000), Node(4000, 3000), Node(4000, 0)
+        # The coupled node owns degrees of freedom numbered after those of a later node.
+        n3.x_dof = n4.x_dof
+        n3.y_dof = n4.y_dof
+        for dof in (n1.x_dof, n1.y_dof, n1.rz_dof, n5.x_dof, n5.y_dof):
+            dof.restrained = True
+        n5.y_dof.displacement = -2.
+        n2.x_dof.force = 10.
+        n3.y_dof.force = -20.
+        column = Rectangle(200, 300)
+        self.structure = Structure([FrameElement(n1, n2, column, True), FrameElement(n2, n3, column),
+                                    LinearRotationalSpringElement(n3, n4, 1e9),
+                                    FrameElement(n4, n5, UserDefinedSection(5000, 4e7), True, 210000),
+                                    TrussElement(n1, n3, UserDefinedSection(800, 0))])
+
+    def assert_same_model(self, loaded):
+        model, loaded_model = self.structure.compile(), loaded.compile()
+        for name in ("coordinates", "node_dofs", "forces", "prescribed_displacements"):
+            np.testing.assert_array_equal(getattr(loaded_model, name), getattr(model, name))
+        self.assertEqual(len(loaded_model.element_groups), len(model.element_groups))
+        for group, loaded_group in zip(model.element_groups, loaded_model.element_groups):
+            self.assertIs(loaded_group.element_type, group.element_type)
+            np.testing.assert_array_equal(loaded_group.dof_indices, group.dof_indices)
+            np.testing.assert_array_equal(loaded_group.geometric_nonlinearity, group.geometric_nonlinearity)
+            for name, values in group.properties.items():
+                np.testing.assert_array_equal(loaded_group.properties[name], values)
+        np.testing.assert_array_equal(Solver(loaded).analyze().displacements,
+                                      Solver(self.structure).analyze().displacements)
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frame.npz")
+            self.structure.save(path)
+            for mmap_mode in (None, "r"):
+                with self.subTest(mmap_mode=mmap_mode):
+                    loaded = Structure.load(path, mmap_mode)
+                    self.assert_same_model(loaded)
+                    self.assertIs(loaded.elements[0].section, loaded.elements[1].section)
+                    self.assertIsInstance(loaded.elements[0].section, Rectangle)
+                    self.assertEqual(loaded.elements[2].rotational_stiffness, 1e9)
+                    self.assertIs(loaded.elements[2].end_node.x_dof, loaded.elements[1].end_node.x_dof)
+
+    def test_memory_mapped_arrays(self):
+        from stablex.serialization import load_arrays
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frame.npz")
+            self.structure.save(path)
+            arrays = load_arrays(path, "r")
+            self.assertIsInstance(arrays["node_coordinates"], np.memmap)
+            np.testing.assert_array_equal(arrays["element_types"], load_arrays(path)["element_types"])
+            del arrays
+
+
+if __name__ == '__main__':
+    unittest.main()